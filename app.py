@@ -9,6 +9,10 @@ Author: GramaVoice Team
 Version: 4.0.0 (Premium UI/UX)
 """
 
+import os
+import time
+from pathlib import Path
+from urllib.parse import urlparse
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -19,11 +23,24 @@ import json
 import requests
 from streamlit_lottie import st_lottie
 
+from nlu import intent_engine, get_response
+
 # ==================== CONFIGURATION ====================
 
 APP_NAME = "GramaVoice"
 APP_VERSION = "4.0.0"
 
+# Backend API for live Village Pulse data; demo data is shown when unset
+API_BASE_URL = os.getenv("GRAMAVOICE_API_URL", "").rstrip("/")
+
+# Downloaded Lottie animations are kept here; a URL is only fetched when its
+# file is missing
+LOTTIE_CACHE_DIR = Path(
+    os.getenv("LOTTIE_CACHE_DIR", Path(__file__).resolve().parent / "cache" / "lottie")
+)
+LOTTIE_FETCH_TIMEOUT = float(os.getenv("LOTTIE_FETCH_TIMEOUT", 3))
+LOTTIE_RETRY_SECONDS = 300  # after a failed download, try the network again this late
+
 # Supported languages
 SUPPORTED_LANGUAGES = [
     {"code": "hi", "name": "Hindi", "display": "हिन्दी"},
@@ -630,14 +647,123 @@ st.markdown(
 
 # ==================== LOTTIE ANIMATION HELPER ====================
 
+def _lottie_filename(url: str) -> str:
+    """File name of an animation on disk, e.g. lf20_eroqjb7w.json"""
+    name = os.path.basename(urlparse(url).path) or "animation"
+    return name if name.endswith(".json") else f"{name}.json"
+
+def _read_lottie_file(url: str):
+    """Animation from the download cache, or None"""
+    try:
+        with open(LOTTIE_CACHE_DIR / _lottie_filename(url), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+@st.cache_resource(show_spinner=False)
+def _lottie_failures() -> dict:
+    """URL -> monotonic time of its last failed download, shared by all sessions"""
+    return {}
+
+@st.cache_data(show_spinner=False)
+def _load_lottie(url: str):
+    """Animation from disk, downloading it into the cache first if needed; raises when unavailable"""
+    animation = _read_lottie_file(url)
+    if animation is not None:
+        return animation
+
+    r = requests.get(url, timeout=LOTTIE_FETCH_TIMEOUT)
+    r.raise_for_status()
+    animation = r.json()
+    try:
+        LOTTIE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = LOTTIE_CACHE_DIR / _lottie_filename(url)
+        partial = path.with_suffix(".part")
+        partial.write_text(json.dumps(animation), encoding="utf-8")
+        os.replace(partial, path)
+    except OSError:
+        # Read-only deployments still keep the animation in memory
+        pass
+    return animation
+
 def load_lottie_url(url: str):
-    """Load Lottie animation from URL"""
+    """
+    Load a Lottie animation without blocking reruns on the network
+
+    After the first load the animation is served from memory. The network is
+    skipped in offline mode and for LOTTIE_RETRY_SECONDS after a failed
+    download; only the download cache is used then. Returns None when the
+    animation is unavailable.
+    """
+    failed_at = _lottie_failures().get(url)
+    if st.session_state.get("offline_mode") or (
+        failed_at is not None and time.monotonic() - failed_at < LOTTIE_RETRY_SECONDS
+    ):
+        return _read_lottie_file(url)
+    try:
+        return _load_lottie(url)
+    except (requests.RequestException, ValueError):
+        _lottie_failures()[url] = time.monotonic()
+        return None
+
+# ==================== VILLAGE PULSE DATA ====================
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_trending_topics(limit: int = 5):
+    """Trending topics of the last 24h from the backend, or None when unavailable"""
+    if not API_BASE_URL:
+        return None
+    try:
+        r = requests.post(
+            f"{API_BASE_URL}/api/village-pulse/trending",
+            json={"window": "24h", "limit": limit},
+            timeout=3,
+        )
+        r.raise_for_status()
+        return r.json().get("topics") or None
+    except (requests.RequestException, ValueError):
+        return None
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_active_users(days: int = 30):
+    """Estimated distinct users of the last `days` days from the backend, or None"""
+    if not API_BASE_URL:
+        return None
+    try:
+        r = requests.post(
+            f"{API_BASE_URL}/api/dashboard-data", json={"days": days}, timeout=3
+        )
+        r.raise_for_status()
+        return r.json()["data"]["active_users"]
+    except (requests.RequestException, ValueError, KeyError):
+        return None
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_sentiment_series(days: int = 14):
+    """Daily average sentiment (-1 to 1) of all villages from the backend, or None"""
+    if not API_BASE_URL:
+        return None
     try:
-        r = requests.get(url)
-        if r.status_code != 200:
-            return None
-        return r.json()
-    except:
+        r = requests.post(
+            f"{API_BASE_URL}/api/village-pulse/sentiment", json={"days": days}, timeout=3
+        )
+        r.raise_for_status()
+        return r.json().get("series")
+    except (requests.RequestException, ValueError):
+        return None
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_spike_alerts(limit: int = 3):
+    """Recent complaint spike alerts from the backend, or None when unavailable"""
+    if not API_BASE_URL:
+        return None
+    try:
+        r = requests.post(
+            f"{API_BASE_URL}/api/alerts", json={"limit": limit}, timeout=3
+        )
+        r.raise_for_status()
+        return r.json().get("alerts")
+    except (requests.RequestException, ValueError):
         return None
 
 # ==================== AI SERVICE (SIMULATED) ====================
@@ -662,39 +788,8 @@ class AIService:
         Returns:
             dict: Intent, category, and confidence
         """
-        text_lower = text.lower()
-
-        # Intent mapping based on keywords
-        if any(word in text_lower for word in ["पेंशन", "pension", "পেনশন", "పెన్షన్"]):
-            category = "pension"
-            intent = "check_status"
-        elif any(word in text_lower for word in ["राशन", "ration", "রেশন", "రేషన్"]):
-            category = "ration"
-            intent = "information"
-        elif any(
-            word in text_lower for word in ["बिजली", "electricity", "বিদ্যুত", "విద్యుత్"]
-        ):
-            category = "electricity"
-            intent = "complaint"
-        elif any(
-            word in text_lower for word in ["किसान", "kisan", "farmer", "কৃষক", "రైతు"]
-        ):
-            category = "pmkisan"
-            intent = "check_status"
-        elif any(
-            word in text_lower for word in ["पानी", "water", "জল", "నీరు", "paani"]
-        ):
-            category = "water"
-            intent = "complaint"
-        elif any(
-            word in text_lower
-            for word in ["स्वास्थ्य", "health", "স্বাস্থ্য", "ఆరోగ్యం", "शिविर", "camp"]
-        ):
-            category = "health"
-            intent = "information"
-        else:
-            category = "general"
-            intent = "information"
+        result = intent_engine.classify(text)
+        category, intent = result.category, result.intent
 
         # Simulate confidence score
         confidence = random.uniform(0.82, 0.96)
@@ -719,43 +814,8 @@ class AIService:
         Returns:
             dict: AI response and metadata
         """
-        # Demo responses for each category
-        responses = {
-            "pension": {
-                "hi": "आपकी पेंशन इस महीने की 5 तारीख को आ गई है। ₹1000 की राशि आपके खाते में जमा हो गई है। अगली पेंशन अगले महीने की 5 तारीख को आएगी।",
-                "en": "Your pension was credited on the 5th of this month. ₹1000 has been deposited to your account. Next pension will arrive on 5th of next month.",
-            },
-            "ration": {
-                "hi": "आपका राशन कार्ड सक्रिय है। आप अपने नजदीकी राशन की दुकान से राशन ले सकते हैं। इस महीने का कोटा: 5 किलो चावल, 2 किलो गेहूं, 1 किलो चीनी।",
-                "en": "Your ration card is active. You can collect ration from your nearest shop. This month's quota: 5kg rice, 2kg wheat, 1kg sugar.",
-            },
-            "electricity": {
-                "hi": "आपकी शिकायत दर्ज कर ली गई है। शिकायत संख्या: ELC-2024-00457. बिजली विभाग को सूचित किया गया है। 24 घंटे में समस्या हल हो जाएगी। कॉल करें: 1800-POWER-HELP",
-                "en": "Your complaint has been registered. Complaint ID: ELC-2024-00457. Electricity department has been notified. Issue will be resolved within 24 hours. Call: 1800-POWER-HELP",
-            },
-            "pmkisan": {
-                "hi": "PM-Kisan की अगली किस्त 15 फरवरी 2024 को आएगी। ₹2000 सीधे आपके खाते में जमा होंगे। आपकी किस्त का स्टेटस: स्वीकृत। अधिक जानकारी: pmkisan.gov.in",
-                "en": "Next PM-Kisan installment will be released on February 15, 2024. ₹2000 will be directly deposited to your account. Installment status: Approved. More info: pmkisan.gov.in",
-            },
-            "water": {
-                "hi": "पानी की सप्लाई की शिकायत दर्ज की गई है। शिकायत संख्या: WTR-2024-00823. जल विभाग को तुरंत सूचित किया गया है। 48 घंटे में समाधान होगा। हेल्पलाइन: 1800-JAL-HELP",
-                "en": "Water supply complaint registered. Complaint ID: WTR-2024-00823. Water department immediately notified. Resolution within 48 hours. Helpline: 1800-JAL-HELP",
-            },
-            "health": {
-                "hi": "अगला स्वास्थ्य शिविर 15 फरवरी 2024 को आपके गाँव के प्राथमिक स्वास्थ्य केंद्र में लगेगा। समय: सुबह 10 बजे से शाम 4 बजे तक। मुफ्त जांच, दवाई और टीकाकरण उपलब्ध है।",
-                "en": "Next health camp will be on February 15, 2024 at your village Primary Health Center. Time: 10 AM to 4 PM. Free checkup, medicines, and vaccination available.",
-            },
-            "general": {
-                "hi": "आपका प्रश्न दर्ज किया गया है। हमारी टीम जल्द ही आपसे संपर्क करेगी। अधिक जानकारी के लिए 1800-GRAMA-HELP पर कॉल करें या नजदीकी ग्राम सेवा केंद्र पर जाएं।",
-                "en": "Your query has been recorded. Our team will contact you soon. For more information, call 1800-GRAMA-HELP or visit your nearest Gram Seva Kendra.",
-            },
-        }
-
-        # Get response for category and language
-        category_responses = responses.get(category, responses["general"])
-        response_text = category_responses.get(
-            language, category_responses.get("hi", category_responses["en"])
-        )
+        # Shared response table, loaded once per process
+        response_text = get_response(category, language)
 
         return {
             "response": response_text,
@@ -794,7 +854,8 @@ if "village_pulse_data" not in st.session_state:
     # Initialize Village Pulse Analytics data
     st.session_state.village_pulse_data = {
         "sentiment_score": 7.8,
-        "trending_topics": ["Pension Delay", "Water Supply", "Road Repair"],
+        # (topic, mentions) shown when no backend is configured
+        "trending_topics": [("Pension Delay", 48), ("Water Supply", 35), ("Road Repair", 22)],
         "urgent_issues": 12,
         "satisfaction_trend": "increasing",
     }
@@ -810,6 +871,11 @@ with col_offline2:
         st.caption("📵 Offline Mode")
 
 # Header with Lottie animation
+# Static icon shown in place of an animation that is unavailable offline
+LOTTIE_FALLBACK_HTML = (
+    '<div style="height: 100px; display: flex; align-items: center; '
+    'justify-content: center; font-size: 3.5rem;">{icon}</div>'
+)
 col1, col2, col3 = st.columns([1, 3, 1])
 
 with col1:
@@ -817,6 +883,8 @@ with col1:
     lottie_voice = load_lottie_url("https://assets5.lottiefiles.com/packages/lf20_eroqjb7w.json")
     if lottie_voice:
         st_lottie(lottie_voice, height=100, key="voice_animation")
+    else:
+        st.markdown(LOTTIE_FALLBACK_HTML.format(icon="🎙️"), unsafe_allow_html=True)
 
 with col2:
     st.markdown(
@@ -834,6 +902,8 @@ with col3:
     lottie_ai = load_lottie_url("https://assets9.lottiefiles.com/packages/lf20_fittoow1.json")
     if lottie_ai:
         st_lottie(lottie_ai, height=100, key="ai_animation")
+    else:
+        st.markdown(LOTTIE_FALLBACK_HTML.format(icon="🤖"), unsafe_allow_html=True)
 
 # ==================== SIDEBAR ====================
 
@@ -1072,8 +1142,6 @@ elif page == "💬 Voice Demo":
                 # Show loading spinner
                 with st.spinner("🤔 AI is analyzing your query..."):
                     # Simulate processing time
-                    import time
-
                     time.sleep(1.5)
 
                     # Detect intent
@@ -1375,7 +1443,11 @@ elif page == "📊 Dashboard":
 
     with col1:
         st.markdown("### 👥 Active Users")
-        st.metric("Total Users", f"{stats['active_users']:,}", "+23 this week")
+        live_users = None if st.session_state.offline_mode else fetch_active_users()
+        if live_users is not None:
+            st.metric("Users (30 days)", f"{live_users:,}")
+        else:
+            st.metric("Total Users", f"{stats['active_users']:,}", "+23 this week")
 
     with col2:
         st.markdown("### ⭐ Satisfaction Score")
@@ -1394,6 +1466,23 @@ elif page == "🧠 Village Pulse AI":
     
     # Pulse Overview Card
     pulse_data = st.session_state.village_pulse_data
+    live_topics = None if st.session_state.offline_mode else fetch_trending_topics()
+    if live_topics:
+        trending_topics = [
+            (f"{topic['keyword']} · {topic['village']}", topic["count"])
+            for topic in live_topics
+        ]
+    else:
+        trending_topics = pulse_data['trending_topics']
+
+    # Backend scores run from -1 to 1; the dashboard shows 0-10
+    live_sentiment = None if st.session_state.offline_mode else fetch_sentiment_series()
+    scored_days = [point for point in live_sentiment or [] if point["score"] is not None]
+    if scored_days:
+        sentiment_score = round(5 * (scored_days[-1]["score"] + 1), 1)
+    else:
+        live_sentiment = None
+        sentiment_score = pulse_data['sentiment_score']
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -1401,7 +1490,7 @@ elif page == "🧠 Village Pulse AI":
         st.markdown(
             f"""
         <div class="pulse-card">
-            <h3 style="color: #10b981; margin: 0;">😊 {pulse_data['sentiment_score']}/10</h3>
+            <h3 style="color: #10b981; margin: 0;">😊 {sentiment_score}/10</h3>
             <p style="margin: 0.5rem 0 0 0; color: #64748b;">Village Sentiment</p>
         </div>
         """,
@@ -1435,7 +1524,7 @@ elif page == "🧠 Village Pulse AI":
         st.markdown(
             f"""
         <div class="pulse-card">
-            <h3 style="color: #8b5cf6; margin: 0;">🔥 {len(pulse_data['trending_topics'])}</h3>
+            <h3 style="color: #8b5cf6; margin: 0;">🔥 {len(trending_topics)}</h3>
             <p style="margin: 0.5rem 0 0 0; color: #64748b;">Trending Topics</p>
         </div>
         """,
@@ -1458,11 +1547,12 @@ elif page == "🧠 Village Pulse AI":
             unsafe_allow_html=True,
         )
         
-        for idx, topic in enumerate(pulse_data['trending_topics'], 1):
-            importance = random.randint(60, 95)
+        top_count = max((count for _, count in trending_topics), default=0) or 1
+        for idx, (topic, count) in enumerate(trending_topics, 1):
+            importance = round(100 * count / top_count)
             st.markdown(f"**{idx}. {topic}**")
             st.progress(importance / 100)
-            st.caption(f"Discussion intensity: {importance}%")
+            st.caption(f"Discussion intensity: {importance}% ({count} mentions)")
             st.markdown("")
     
     with col2:
@@ -1483,10 +1573,18 @@ elif page == "🧠 Village Pulse AI":
     # Sentiment Analysis
     st.markdown("### 📊 Sentiment Analysis Over Time")
     
-    # Generate demo sentiment data
-    dates = [datetime.now() - timedelta(days=x) for x in range(14)]
-    dates.reverse()
-    sentiment_scores = [random.uniform(6.5, 8.5) for _ in range(14)]
+    if live_sentiment:
+        dates = [datetime.strptime(point["date"], "%Y-%m-%d") for point in live_sentiment]
+        # Days without queries are left as gaps
+        sentiment_scores = [
+            5 * (point["score"] + 1) if point["score"] is not None else float("nan")
+            for point in live_sentiment
+        ]
+    else:
+        # Generate demo sentiment data
+        dates = [datetime.now() - timedelta(days=x) for x in range(14)]
+        dates.reverse()
+        sentiment_scores = [random.uniform(6.5, 8.5) for _ in range(14)]
     
     fig, ax = plt.subplots(figsize=(12, 4))
     ax.plot(dates, sentiment_scores, marker="o", linewidth=2, color="#10b981", label="Sentiment Score")
@@ -1538,9 +1636,21 @@ elif page == "🧠 Village Pulse AI":
     
     # Predictive Alerts
     st.markdown("### 🔮 Predictive Alerts")
-    
-    st.warning("⚠️ **Model predicts**: 30% increase in pension queries next week (Government payment cycle)")
-    st.info("💡 **Recommendation**: Prepare automated responses and increase helpline capacity")
+
+    spike_alerts = None if st.session_state.offline_mode else fetch_spike_alerts()
+    if spike_alerts:
+        for alert in spike_alerts:
+            st.error(
+                f"🚨 **{alert['category'].title()} spike in {alert['village']}**: "
+                f"{alert['count']} complaints since {alert['window_start'][11:16]} UTC "
+                f"(usually {alert['expected']})"
+            )
+        st.info("💡 **Recommendation**: Check for an outage and notify the responsible department")
+    elif spike_alerts is not None:
+        st.success("✅ No unusual complaint activity right now")
+    else:
+        st.warning("⚠️ **Model predicts**: 30% increase in pension queries next week (Government payment cycle)")
+        st.info("💡 **Recommendation**: Prepare automated responses and increase helpline capacity")
 
 # History Page
 elif page == "📜 History":
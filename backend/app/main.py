@@ -7,19 +7,55 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File
+from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+import asyncio
+import json
+import re
 import uvicorn
 from loguru import logger
 
-from config.settings import APP_NAME, APP_VERSION, API_HOST, API_PORT, API_RELOAD
-from backend.app.models import init_db, get_db
+from config.settings import (
+    APP_NAME,
+    APP_VERSION,
+    API_HOST,
+    API_PORT,
+    API_RELOAD,
+    ANALYZE_BATCH_MAX_SIZE,
+    ALERT_STREAM_KEEPALIVE,
+    HISTORY_MAX_PAGE_SIZE,
+)
+from backend.app.models import init_db
+from backend.app.models.async_session import (
+    AsyncSessionLocal,
+    async_engine,
+    get_async_db,
+)
+from backend.app.services.active_users import active_users
 from backend.app.services.ai_service import ai_service
-from backend.app.services.data_service import data_service
+from backend.app.services.async_data_service import async_data_service
+from backend.app.services.complaint_alerts import complaint_alerts
+from backend.app.services.dashboard_cache import dashboard_cache
+from backend.app.services.pipeline import SpeechRecognitionError, voice_pipeline
+from backend.app.services.job_service import QueueFullError, job_queue
+from backend.app.services.rollups import rollup_compactor
+from backend.app.services.sentiment_series import village_sentiment
+from backend.app.services.tts_cache import tts_cache
+from backend.app.services.village_pulse import village_pulse
+from backend.app.services.write_behind import query_write_buffer
+from backend.app.utils.audio_stream import (
+    DuplexStreamingResponse,
+    iter_upload,
+    spool_chunks,
+)
+from backend.app.utils.db_executor import shutdown_executor
+from backend.app.utils.file_serving import serve_immutable_file
+from backend.app.utils.pagination import decode_cursor
 
 # Configure logger
 logger.add(
@@ -43,27 +79,85 @@ app.add_middleware(
 )
 
 
+# Cached TTS files are named <sha256>.<extension>
+AUDIO_FILENAME_PATTERN = re.compile(r"^[0-9a-f]{64}\.(wav|mp3|ogg)$")
+
+
 # Pydantic models for request/response
 class VoiceInputRequest(BaseModel):
     language: str = "hi"
     user_id: str = "demo_user"
+    village: Optional[str] = None
+    district: Optional[str] = None
 
 
 class AnalyzeRequest(BaseModel):
     text: str
     language: str = "hi"
     user_id: str = "demo_user"
+    village: Optional[str] = None
+    district: Optional[str] = None
+
+
+class AnalyzeBatchRequest(BaseModel):
+    items: List[AnalyzeRequest]
 
 
 class HistoryRequest(BaseModel):
     user_id: str = "demo_user"
     limit: int = 50
+    cursor: Optional[str] = None
+
+
+class HistoryStreamRequest(BaseModel):
+    user_id: str = "demo_user"
+    cursor: Optional[str] = None
+    limit: Optional[int] = None
 
 
 class DashboardRequest(BaseModel):
     days: int = 7
 
 
+class OpenComplaintsRequest(BaseModel):
+    category: Optional[str] = None
+    limit: int = 50
+
+
+class ComplaintClustersRequest(BaseModel):
+    category: Optional[str] = None
+    location: Optional[str] = None
+    min_size: int = 1  # e.g. 2 to list only incidents reported more than once
+    limit: int = 50
+
+
+class TrendingRequest(BaseModel):
+    window: str = "24h"  # 1h or 24h
+    limit: int = 10
+    village: Optional[str] = None
+    category: Optional[str] = None
+
+
+class SentimentRequest(BaseModel):
+    village: Optional[str] = None  # all villages when omitted
+    days: int = 14
+
+
+class AlertsRequest(BaseModel):
+    village: Optional[str] = None
+    category: Optional[str] = None
+    after_id: int = 0  # last alert_id already seen
+    limit: int = 50
+
+
+class SearchRequest(BaseModel):
+    text: str
+    kind: str = "complaints"  # complaints or queries
+    category: Optional[str] = None
+    limit: int = 20
+    offset: int = 0
+
+
 # API Endpoints
 
 
@@ -73,6 +167,28 @@ async def startup_event():
     logger.info(f"Starting {APP_NAME} v{APP_VERSION}")
     init_db()
     logger.info("Database initialized")
+    rollup_compactor.start()
+    active_users.start()
+    village_pulse.start()
+    village_sentiment.start()
+    complaint_alerts.start()
+    dashboard_cache.start()
+    if query_write_buffer is not None:
+        query_write_buffer.start()
+    await job_queue.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop job workers and drain background DB work on shutdown"""
+    await job_queue.stop()
+    shutdown_executor()
+    if query_write_buffer is not None:
+        query_write_buffer.stop()
+    active_users.stop()
+    rollup_compactor.stop()
+    await async_engine.dispose()
+    logger.info(f"{APP_NAME} stopped")
 
 
 @app.get("/")
@@ -96,92 +212,148 @@ async def voice_input(
     audio_file: UploadFile = File(...),
     language: str = "hi",
     user_id: str = "demo_user",
-    db: Session = Depends(get_db),
+    village: Optional[str] = None,
+    district: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Process voice input
     1. Convert speech to text
     2. Detect intent
     3. Generate response
-    4. Store in database
+    4. Synthesize audio and store in database (concurrently)
     """
     try:
         logger.info(f"Receiving voice input from user {user_id} in language {language}")
 
-        # Read audio data
-        audio_data = await audio_file.read()
+        # Read the upload in chunks, feeding STT as they arrive
+        result = await voice_pipeline.process_stream(
+            iter_upload(audio_file), language, user_id, db, village, district
+        )
 
-        # Convert speech to text
-        stt_result = await ai_service.speech_to_text(audio_data, language)
+        logger.info(f"Voice input processed successfully for user {user_id}")
 
-        if stt_result.get("error"):
-            raise HTTPException(status_code=400, detail="Speech recognition failed")
+        return result
 
-        query_text = stt_result["text"]
-        stt_confidence = stt_result["confidence"]
+    except SpeechRecognitionError as e:
+        logger.error(f"Speech recognition failed: {e}")
+        raise HTTPException(status_code=400, detail="Speech recognition failed")
+    except Exception as e:
+        logger.error(f"Error processing voice input: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Detect intent
-        intent_result = await ai_service.detect_intent(query_text, language)
-        intent = intent_result["intent"]
-        category = intent_result["category"]
-        intent_confidence = intent_result["confidence"]
 
-        # Generate response
-        response_result = await ai_service.generate_response(
-            query_text, intent, category, language
-        )
-        ai_response = response_result["response"]
+@app.post("/api/voice-input/stream")
+async def voice_input_stream(
+    request: Request,
+    language: str = "hi",
+    user_id: str = "demo_user",
+    village: Optional[str] = None,
+    district: Optional[str] = None,
+):
+    """
+    Process voice input sent as a raw (chunked) request body
+    Responds with NDJSON: "partial" transcript events while the audio is still
+    uploading, then one "result" event (or an "error" event)
+    """
+    logger.info(f"Streaming voice input from user {user_id} in language {language}")
+
+    async def events():
+        # The session is owned by the stream because the response body
+        # outlives the request handler
+        db = AsyncSessionLocal()
+        try:
+            async for event in voice_pipeline.stream_events(
+                request.stream(), language, user_id, db, village, district
+            ):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+            logger.info(f"Streamed voice input processed for user {user_id}")
+        except SpeechRecognitionError as e:
+            logger.error(f"Speech recognition failed: {e}")
+            yield json.dumps(
+                {"type": "error", "detail": "Speech recognition failed"}
+            ) + "\n"
+        except Exception as e:
+            logger.error(f"Error processing streamed voice input: {e}")
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+        finally:
+            await db.close()
+
+    return DuplexStreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@app.post("/api/voice-input/async", status_code=202)
+async def voice_input_async(
+    audio_file: UploadFile = File(...),
+    language: str = "hi",
+    user_id: str = "demo_user",
+    village: Optional[str] = None,
+    district: Optional[str] = None,
+    callback_url: Optional[str] = None,
+):
+    """
+    Queue voice input for background processing
+    Returns a job ID immediately; poll /api/jobs/{job_id} or pass callback_url
+    to receive the result by POST
+    """
+    if callback_url and not callback_url.startswith(("http://", "https://")):
+        raise HTTPException(status_code=400, detail="callback_url must be http(s)")
 
-        # Generate audio response
-        tts_result = await ai_service.text_to_speech(ai_response, language)
+    audio_spool = await spool_chunks(iter_upload(audio_file))
 
-        # Store in database
-        query = data_service.create_query(
-            db=db,
-            user_id=user_id,
-            query_text=query_text,
-            language=language,
-            intent=intent,
-            category=category,
-            ai_response=ai_response,
-            confidence=(stt_confidence + intent_confidence) / 2,
+    try:
+        job = job_queue.submit(
+            audio_spool, language, user_id, callback_url, village, district
+        )
+    except QueueFullError as e:
+        audio_spool.close()
+        logger.warning(f"Rejecting voice job from user {user_id}: {e}")
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": "5"}
         )
 
-        # If it's a complaint, create complaint record
-        if intent == "complaint":
-            complaint = data_service.create_complaint(
-                db=db,
-                user_id=user_id,
-                category=category,
-                description=query_text,
-                location="Demo Location",
-                severity="medium",
-            )
-            complaint_id = complaint.complaint_id
-        else:
-            complaint_id = None
+    return {
+        "success": True,
+        "job_id": job.job_id,
+        "status": job.status,
+        "status_url": f"/api/jobs/{job.job_id}",
+    }
 
-        logger.info(f"Voice input processed successfully for user {user_id}")
 
-        return {
-            "success": True,
-            "query_id": query.id,
-            "query_text": query_text,
-            "detected_intent": intent,
-            "service_category": category,
-            "ai_response": ai_response,
-            "audio_response_url": tts_result.get("audio_url"),
-            "confidence": query.confidence_score,
-            "complaint_id": complaint_id,
-        }
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the status (and result, once finished) of a queued voice job
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
 
-    except Exception as e:
-        logger.error(f"Error processing voice input: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"success": True, "job": job.to_dict()}
+
+
+@app.api_route("/api/audio/{filename}", methods=["GET", "HEAD"])
+async def get_audio(filename: str, request: Request):
+    """
+    Serve synthesized response audio from the TTS cache
+    Supports Range requests for resumable downloads and ETag revalidation;
+    files are content-addressed, so they are cached by clients indefinitely
+    """
+    if not AUDIO_FILENAME_PATTERN.match(filename):
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    path = tts_cache.path_for(filename)
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    etag = '"' + filename.split(".", 1)[0] + '"'
+    return serve_immutable_file(path, etag, request.headers, request.method)
 
 
 @app.post("/api/analyze")
-async def analyze_text(request: AnalyzeRequest, db: Session = Depends(get_db)):
+async def analyze_text(
+    request: AnalyzeRequest, db: AsyncSession = Depends(get_async_db)
+):
     """
     Analyze text input (for testing without voice)
     """
@@ -203,7 +375,7 @@ async def analyze_text(request: AnalyzeRequest, db: Session = Depends(get_db)):
         ai_response = response_result["response"]
 
         # Store in database
-        query = data_service.create_query(
+        query = await async_data_service.create_query(
             db=db,
             user_id=request.user_id,
             query_text=request.text,
@@ -212,6 +384,8 @@ async def analyze_text(request: AnalyzeRequest, db: Session = Depends(get_db)):
             category=category,
             ai_response=ai_response,
             confidence=confidence,
+            village=request.village,
+            district=request.district,
         )
 
         logger.info(f"Text analysis completed for user {request.user_id}")
@@ -230,15 +404,103 @@ async def analyze_text(request: AnalyzeRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/analyze/batch")
+async def analyze_text_batch(
+    request: AnalyzeBatchRequest, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Analyze many texts at once (IVR / SMS backlog replay)
+    All valid items are classified in one pass and stored in one transaction;
+    results are returned in input order with per-item errors
+    """
+    if len(request.items) > ANALYZE_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: at most {ANALYZE_BATCH_MAX_SIZE} items",
+        )
+
+    try:
+        logger.info(f"Analyzing batch of {len(request.items)} texts")
+
+        results: List[Dict[str, Any]] = [
+            {"index": index, "success": False, "error": "Empty text"}
+            for index in range(len(request.items))
+        ]
+        valid = [
+            index for index, item in enumerate(request.items) if item.text.strip()
+        ]
+
+        # Detect intents for every valid text in a single pass
+        intent_results = await ai_service.detect_intent_batch(
+            [request.items[index].text for index in valid]
+        )
+
+        rows = []
+        for index, intent_result in zip(valid, intent_results):
+            item = request.items[index]
+            if intent_result.get("error"):
+                results[index]["error"] = intent_result["error"]
+                continue
+
+            response_result = await ai_service.generate_response(
+                item.text,
+                intent_result["intent"],
+                intent_result["category"],
+                item.language,
+            )
+            if response_result.get("error"):
+                results[index]["error"] = response_result["error"]
+                continue
+
+            rows.append(
+                {
+                    "index": index,
+                    "user_id": item.user_id,
+                    "village": item.village,
+                    "district": item.district,
+                    "query_text": item.text,
+                    "language": item.language,
+                    "intent": intent_result["intent"],
+                    "category": intent_result["category"],
+                    "ai_response": response_result["response"],
+                    "confidence": intent_result["confidence"],
+                }
+            )
+
+        # Store all rows in one transaction
+        query_ids = await async_data_service.create_queries_bulk(db, rows)
+
+        for row, query_id in zip(rows, query_ids):
+            results[row["index"]] = {
+                "index": row["index"],
+                "success": True,
+                "query_id": query_id,
+                "detected_intent": row["intent"],
+                "service_category": row["category"],
+                "confidence": row["confidence"],
+                "ai_response": row["ai_response"],
+            }
+
+        logger.info(f"Batch analysis stored {len(query_ids)} of {len(results)} texts")
+
+        return {"success": True, "count": len(results), "results": results}
+
+    except Exception as e:
+        logger.error(f"Error analyzing batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/api/dashboard-data")
-async def dashboard_data(request: DashboardRequest, db: Session = Depends(get_db)):
+async def dashboard_data(request: DashboardRequest):
     """
     Get analytics data for dashboard
+    Served from the dashboard cache; may be up to DASHBOARD_CACHE_TTL seconds
+    old, or briefly stale while a refresh runs after new data
     """
     try:
         logger.info(f"Fetching dashboard data for last {request.days} days")
 
-        data = data_service.get_dashboard_data(db, request.days)
+        data = await dashboard_cache.get(request.days)
 
         return {"success": True, "data": data}
 
@@ -248,31 +510,243 @@ async def dashboard_data(request: DashboardRequest, db: Session = Depends(get_db
 
 
 @app.post("/api/history")
-async def get_history(request: HistoryRequest, db: Session = Depends(get_db)):
+async def get_history(
+    request: HistoryRequest, db: AsyncSession = Depends(get_async_db)
+):
     """
-    Get user query history
+    Get user query history, newest first
+    Pass the returned next_cursor as cursor to fetch the following page
     """
     try:
         logger.info(f"Fetching history for user {request.user_id}")
 
-        history = data_service.get_user_history(db, request.user_id, request.limit)
+        limit = max(1, min(request.limit, HISTORY_MAX_PAGE_SIZE))
+        history, next_cursor = await async_data_service.get_user_history_page(
+            db, request.user_id, limit, request.cursor
+        )
 
-        return {"success": True, "history": history}
+        return {"success": True, "history": history, "next_cursor": next_cursor}
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting history: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/history/stream")
+async def stream_history(request: HistoryStreamRequest):
+    """
+    Stream user query history as NDJSON, newest first
+    Every line carries a cursor that resumes the stream right after it
+    """
+    if request.cursor:
+        try:
+            decode_cursor(request.cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    logger.info(f"Streaming history for user {request.user_id}")
+
+    async def lines():
+        # The session is owned by the stream because the response body
+        # outlives the request handler
+        async with AsyncSessionLocal() as db:
+            try:
+                async for item in async_data_service.iter_user_history(
+                    db, request.user_id, request.cursor, request.limit
+                ):
+                    yield json.dumps(item, ensure_ascii=False) + "\n"
+            except Exception as e:
+                logger.error(f"Error streaming history: {e}")
+                yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/api/complaints/open")
+async def open_complaints(
+    request: OpenComplaintsRequest, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get complaints that are still open or in progress, newest first
+    """
+    try:
+        limit = max(1, min(request.limit, HISTORY_MAX_PAGE_SIZE))
+        complaints = await async_data_service.get_open_complaints(
+            db, request.category, limit
+        )
+
+        return {"success": True, "complaints": complaints}
+
+    except Exception as e:
+        logger.error(f"Error getting open complaints: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/complaints/clusters")
+async def complaint_clusters(
+    request: ComplaintClustersRequest, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get clusters of near-duplicate complaints (one per incident), most recently active first
+    """
+    try:
+        limit = max(1, min(request.limit, HISTORY_MAX_PAGE_SIZE))
+        clusters = await async_data_service.get_complaint_clusters(
+            db, request.category, request.location, request.min_size, limit
+        )
+
+        return {"success": True, "clusters": clusters}
+
+    except Exception as e:
+        logger.error(f"Error getting complaint clusters: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/complaints/clusters/{cluster_id}")
+async def complaint_cluster(cluster_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get one complaint cluster with the complaints it groups
+    """
+    try:
+        cluster = await async_data_service.get_complaint_cluster(
+            db, cluster_id, HISTORY_MAX_PAGE_SIZE
+        )
+    except Exception as e:
+        logger.error(f"Error getting complaint cluster {cluster_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if cluster is None:
+        raise HTTPException(status_code=404, detail="Cluster not found")
+    return {"success": True, "cluster": cluster}
+
+
+@app.post("/api/village-pulse/trending")
+async def trending_topics(request: TrendingRequest):
+    """
+    Get the most frequent (category, keyword, village) topics of recent queries
+    """
+    try:
+        limit = max(1, min(request.limit, HISTORY_MAX_PAGE_SIZE))
+        trending = village_pulse.trending(
+            request.window, limit, request.village, request.category
+        )
+
+        return {"success": True, **trending}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting trending topics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/village-pulse/sentiment")
+async def sentiment_series(request: SentimentRequest):
+    """
+    Get the daily average query sentiment (-1 to 1) of a village, oldest day first
+    """
+    try:
+        series = village_sentiment.series(request.village, request.days)
+
+        return {"success": True, **series}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting sentiment series: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/alerts")
+async def alerts(request: AlertsRequest):
+    """
+    Get recent complaint spike alerts, newest first
+    """
+    try:
+        limit = max(1, min(request.limit, HISTORY_MAX_PAGE_SIZE))
+        recent = complaint_alerts.recent(
+            request.village, request.category, request.after_id, limit
+        )
+
+        return {"success": True, "alerts": recent}
+
+    except Exception as e:
+        logger.error(f"Error getting alerts: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/alerts/stream")
+async def stream_alerts(request: Request, village: Optional[str] = None):
+    """
+    Push complaint spike alerts as server-sent events
+    A reconnecting client sends Last-Event-ID and first receives the alerts it
+    missed that are still in the history
+    """
+    try:
+        after_id = int(request.headers.get("last-event-id") or 0)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+
+    def message(alert: Dict[str, Any]) -> str:
+        data = json.dumps(alert, ensure_ascii=False)
+        return f"id: {alert['alert_id']}\nevent: alert\ndata: {data}\n\n"
+
+    async def events():
+        queue = complaint_alerts.subscribe()
+        try:
+            for alert in reversed(complaint_alerts.recent(village, after_id=after_id)):
+                yield message(alert)
+            while True:
+                try:
+                    alert = await asyncio.wait_for(queue.get(), ALERT_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    # Comment line keeping proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                if village is None or alert["village"] == village:
+                    yield message(alert)
+        finally:
+            complaint_alerts.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/search")
+async def search(request: SearchRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Full-text search over complaint descriptions or query text, best match first
+    Every word must match; pass the returned next_offset as offset for the next page
+    """
+    try:
+        limit = max(1, min(request.limit, HISTORY_MAX_PAGE_SIZE))
+        results, next_offset = await async_data_service.search(
+            db, request.text, request.kind, request.category, limit, max(request.offset, 0)
+        )
+
+        return {"success": True, "results": results, "next_offset": next_offset}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/api/seed-demo")
-async def seed_demo_data(db: Session = Depends(get_db)):
+async def seed_demo_data(db: AsyncSession = Depends(get_async_db)):
     """
     Seed database with demo data (for testing)
     """
     try:
         logger.info("Seeding demo data")
 
-        data_service.seed_demo_data(db)
+        await async_data_service.seed_demo_data(db)
 
         return {"success": True, "message": "Demo data seeded successfully"}
 
@@ -7,23 +7,93 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 
-from sqlalchemy import create_engine
+from typing import List
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.exc import DatabaseError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateColumn
 from config.settings import DATABASE_URL
 from backend.app.models.database import Base
+from backend.app.models.engine_config import configure_engine, engine_options
+from backend.app.models.search_index import ensure_search_index
 
 # Create engine
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+engine = configure_engine(create_engine(DATABASE_URL, **engine_options(DATABASE_URL)))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def ensure_columns(bind=engine) -> List[str]:
+    """
+    Add columns declared on the models that existing tables lack
+
+    Like ensure_indexes, this migrates tables created before a column was
+    added. Only nullable columns can be added this way.
+
+    Returns:
+        Names of the columns created, as table.column
+    """
+    created = []
+    preparer = bind.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspect(bind).get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable:
+                raise RuntimeError(
+                    f"Cannot add NOT NULL column {table.name}.{column.name} to an existing table"
+                )
+            definition = CreateColumn(column).compile(dialect=bind.dialect)
+            try:
+                with bind.begin() as connection:
+                    connection.exec_driver_sql(
+                        f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {definition}"
+                    )
+                created.append(f"{table.name}.{column.name}")
+            except DatabaseError:
+                # Another worker added it in the meantime
+                names = {found["name"] for found in inspect(bind).get_columns(table.name)}
+                if column.name not in names:
+                    raise
+    return created
+
+
+def ensure_indexes(bind=engine) -> List[str]:
+    """
+    Create indexes declared on the models that existing tables lack
+
+    create_all only creates indexes together with a new table, so this is the
+    migration step for indexes added later.
+
+    Returns:
+        Names of the indexes created
+    """
+    created = []
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspect(bind).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            try:
+                index.create(bind=bind)
+                created.append(index.name)
+            except DatabaseError:
+                # Another worker created it in the meantime
+                names = {found["name"] for found in inspect(bind).get_indexes(table.name)}
+                if index.name not in names:
+                    raise
+    return created
+
+
 def init_db():
-    """Initialize database tables"""
+    """Initialize database tables and indexes"""
     Base.metadata.create_all(bind=engine)
+    ensure_columns()
+    ensure_indexes()
+    ensure_search_index(engine)
 
 
 def get_db():
@@ -0,0 +1,47 @@
+"""
+Async database engine and session management
+Used by the FastAPI endpoints so queries are awaited instead of blocking the
+event loop. Needs sqlalchemy[asyncio] plus aiosqlite (SQLite) or asyncpg
+(Postgres); scripts and worker threads keep using the sync engine in
+backend.app.models
+"""
+from typing import AsyncIterator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from config.settings import ASYNC_DATABASE_URL, DATABASE_URL
+from backend.app.models.engine_config import configure_engine, engine_options
+
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its asyncio counterpart"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(
+            f"No async driver known for {backend}; set ASYNC_DATABASE_URL"
+        )
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+# Create async engine
+_url = ASYNC_DATABASE_URL or async_url(DATABASE_URL)
+async_engine = create_async_engine(_url, **engine_options(_url, is_async=True))
+# Connect events fire on the sync engine the async one wraps
+configure_engine(async_engine.sync_engine)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
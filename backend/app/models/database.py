@@ -2,19 +2,48 @@
 Database models for GramaVoice
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
+# Complaint statuses that still need action. Queries must filter with this
+# exact literal clause (not bound parameters) for the planner to prove they
+# match the partial index
+OPEN_COMPLAINT_STATUSES = ("open", "in_progress")
+OPEN_COMPLAINT_FILTER = text(
+    "status IN (%s)" % ", ".join(f"'{status}'" for status in OPEN_COMPLAINT_STATUSES)
+)
+
 
 class Query(Base):
     """User query/interaction model"""
 
     __tablename__ = "queries"
+    __table_args__ = (
+        # Keyset pagination of a user's history, newest first; also serves
+        # any (user_id, created_at) lookup as a prefix
+        Index("ix_queries_user_created_id", "user_id", "created_at", "id"),
+        # Date-range scans grouped by service (dashboard aggregates)
+        Index("ix_queries_created_category", "created_at", "service_category"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String, index=True)
+    village = Column(String, nullable=True)
+    district = Column(String, nullable=True)
     query_text = Column(Text)
     query_audio_path = Column(String, nullable=True)
     language = Column(String)
@@ -23,6 +52,7 @@ class Query(Base):
     status = Column(String, default="pending")
     ai_response = Column(Text)
     confidence_score = Column(Float, default=0.0)
+    sentiment_score = Column(Float, nullable=True)  # -1 (negative) to 1
     resolution_time = Column(Integer, nullable=True)  # in hours
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -33,6 +63,18 @@ class Complaint(Base):
     """Complaint/Grievance model"""
 
     __tablename__ = "complaints"
+    __table_args__ = (
+        # Date-range scans with resolution counts (dashboard aggregates)
+        Index("ix_complaints_created_status", "created_at", "status"),
+        # Partial index over the small set of complaints still open, for
+        # officer work queues; a plain index where partial ones are unsupported
+        Index(
+            "ix_complaints_open_created",
+            "created_at",
+            sqlite_where=OPEN_COMPLAINT_FILTER,
+            postgresql_where=OPEN_COMPLAINT_FILTER,
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     complaint_id = Column(String, unique=True, index=True)
@@ -46,6 +88,28 @@ class Complaint(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     resolved_at = Column(DateTime, nullable=True)
+    cluster_id = Column(Integer, nullable=True, index=True)  # complaint_clusters.id
+
+
+class ComplaintCluster(Base):
+    """Near-duplicate complaints about one incident, triaged as one ticket"""
+
+    __tablename__ = "complaint_clusters"
+    __table_args__ = (
+        # Candidate clusters for a new complaint
+        Index("ix_complaint_clusters_match", "category", "location", "last_seen_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    category = Column(String)
+    location = Column(String)
+    # First complaint of the cluster, whose text new complaints are compared to
+    representative_id = Column(String)
+    description = Column(Text)
+    signature = Column(Text)  # JSON MinHash signature of description
+    size = Column(Integer, default=1)
+    first_seen_at = Column(DateTime, default=datetime.utcnow)
+    last_seen_at = Column(DateTime, default=datetime.utcnow)
 
 
 class User(Base):
@@ -78,3 +142,33 @@ class Analytics(Base):
     avg_resolution_time = Column(Float, default=0.0)
     most_common_category = Column(String, nullable=True)
     user_satisfaction = Column(Float, default=0.0)
+
+
+class IdSequence(Base):
+    """Named ID sequence; workers reserve blocks of IDs from it"""
+
+    __tablename__ = "id_sequences"
+
+    name = Column(String, primary_key=True)
+    next_value = Column(Integer, nullable=False)
+
+
+class DailyRollup(Base):
+    """Per-day, per-category counter kept up to date as rows are inserted"""
+
+    __tablename__ = "daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    metric = Column(String, primary_key=True)  # queries, complaints, resolved_complaints
+    category = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class DailyUserSketch(Base):
+    """HyperLogLog of the users active on a day, overall and per district"""
+
+    __tablename__ = "daily_user_sketches"
+
+    day = Column(Date, primary_key=True)
+    district = Column(String, primary_key=True)  # "all" for every district
+    registers = Column(LargeBinary, nullable=False)  # zlib-compressed
@@ -0,0 +1,95 @@
+"""
+Database engine configuration
+Builds create_engine options from settings: connection pool sizing for server
+databases, and WAL journaling plus cache/mmap pragmas applied to every new
+SQLite connection so readers stop blocking the (single) writer
+"""
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+from config.settings import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_SYNCHRONOUS,
+)
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Keyword arguments for create_engine / create_async_engine
+
+    Args:
+        url: Database URL
+        is_async: Options for an asyncio engine
+
+    Returns:
+        Engine options
+    """
+    if is_sqlite(url):
+        # Connections are shared with worker threads; the async driver runs
+        # its own thread anyway
+        return {} if is_async else {"connect_args": {"check_same_thread": False}}
+
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def sqlite_pragmas(url: str) -> Dict[str, Any]:
+    """PRAGMA name -> value applied to each new SQLite connection"""
+    pragmas = {
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+        "synchronous": SQLITE_SYNCHRONOUS,
+        # Negative cache_size is in KiB rather than pages
+        "cache_size": -SQLITE_CACHE_SIZE_KB,
+        "mmap_size": SQLITE_MMAP_SIZE,
+    }
+    if make_url(url).database not in (None, "", ":memory:"):
+        # journal_mode is persistent and meaningless for in-memory databases;
+        # set it first so synchronous=NORMAL applies to WAL
+        pragmas = {"journal_mode": SQLITE_JOURNAL_MODE, **pragmas}
+    return pragmas
+
+
+def configure_engine(engine: Engine) -> Engine:
+    """
+    Install per-connection setup on an engine
+
+    Pass async_engine.sync_engine for asyncio engines.
+
+    Returns:
+        The same engine
+    """
+    url = engine.url.render_as_string(hide_password=False)
+    if not is_sqlite(url):
+        return engine
+
+    pragmas = sqlite_pragmas(url)
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return engine
@@ -0,0 +1,120 @@
+"""
+Full-text search indexes over query and complaint text
+SQLite gets FTS5 external-content tables kept in sync by triggers, Postgres
+gets GIN indexes over a tsvector expression. Words are split on whitespace
+and punctuation only, so Devanagari, Bengali and Telugu words keep their
+vowel signs and viramas instead of being cut apart at them
+"""
+from typing import List
+
+from sqlalchemy.engine import Connection, Engine
+
+# Postgres' text search parser has no rules for Indic scripts, so lexemes are
+# made by splitting on SEPARATOR_PATTERN there, the same way search_terms
+# splits search strings
+from backend.app.utils.text import SEPARATOR_PATTERN
+
+# Table -> text column indexed for search
+SEARCH_COLUMNS = {"queries": "query_text", "complaints": "description"}
+
+# unicode61 treats combining marks (category M, e.g. matras and viramas) as
+# separators unless told otherwise
+FTS5_TOKENIZE = "unicode61 remove_diacritics 0 categories 'L* M* N* Co'"
+
+
+def fts_table(table: str) -> str:
+    return f"{table}_fts"
+
+
+def fts5_match(terms: List[str]) -> str:
+    """FTS5 MATCH expression requiring every term"""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def tsquery(terms: List[str]) -> str:
+    """tsquery literal requiring every term, without re-parsing the terms"""
+    quoted = (term.replace("\\", "\\\\").replace("'", "''") for term in terms)
+    return " & ".join(f"'{term}'" for term in quoted)
+
+
+def tsvector_sql(column: str) -> str:
+    """
+    tsvector expression over a text column
+
+    Queries must use this exact expression for Postgres to pick the index.
+    """
+    return (
+        "array_to_tsvector(array_remove(regexp_split_to_array("
+        f"lower(coalesce({column}, '')), '{SEPARATOR_PATTERN}'), ''))"
+    )
+
+
+def _ensure_fts5(connection: Connection, table: str, column: str) -> bool:
+    fts = fts_table(table)
+    required = {fts, f"{fts}_ai", f"{fts}_ad", f"{fts}_au"}
+    existing = {
+        row[0]
+        for row in connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE name LIKE ?", (f"{fts}%",)
+        )
+    }
+    if required <= existing:
+        return False
+
+    connection.exec_driver_sql(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column}, content='{table}', content_rowid='id', "
+        f'tokenize="{FTS5_TOKENIZE}")'
+    )
+    connection.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END"
+    )
+    connection.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}) "
+        f"VALUES ('delete', old.id, old.{column}); END"
+    )
+    connection.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}) "
+        f"VALUES ('delete', old.id, old.{column}); "
+        f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END"
+    )
+    # Index the rows that were written while the triggers were missing
+    connection.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+    return True
+
+
+def _ensure_tsvector(connection: Connection, table: str, column: str) -> bool:
+    name = f"ix_{table}_text_search"
+    found = connection.exec_driver_sql(
+        "SELECT 1 FROM pg_indexes WHERE indexname = %(name)s", {"name": name}
+    ).first()
+    if found:
+        return False
+    connection.exec_driver_sql(
+        f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (({tsvector_sql(column)}))"
+    )
+    return True
+
+
+def ensure_search_index(bind: Engine) -> List[str]:
+    """
+    Create the search index of every searchable table that lacks one
+
+    Other databases are left alone and searched with LIKE.
+
+    Returns:
+        Tables whose index was created
+    """
+    ensure = {"sqlite": _ensure_fts5, "postgresql": _ensure_tsvector}.get(bind.dialect.name)
+    if ensure is None:
+        return []
+
+    created = []
+    with bind.begin() as connection:
+        for table, column in SEARCH_COLUMNS.items():
+            if ensure(connection, table, column):
+                created.append(table)
+    return created
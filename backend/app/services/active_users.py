@@ -0,0 +1,229 @@
+"""
+Active-user counts from HyperLogLog sketches
+Every committed query adds its user_id to a sketch for its day, both overall
+and for its district. Sketches collect in memory and are merged into the
+daily_user_sketches table every ACTIVE_USERS_FLUSH_INTERVAL seconds; merging
+is idempotent, so a retried or repeated flush never counts a user twice.
+Distinct users over any range of days is the union of that range's sketches,
+within about 1% of the exact count
+"""
+import threading
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config.settings import ACTIVE_USERS_FLUSH_INTERVAL
+from backend.app.models import SessionLocal
+from backend.app.models.database import DailyUserSketch, Query
+from backend.app.services import events
+from backend.app.utils.sketches import HyperLogLog
+
+# District key of the sketch counting every user of a day
+ALL_DISTRICTS = "all"
+
+# Register count is 2^PRECISION; stored sketches only merge with equal precision
+PRECISION = 14
+
+SketchKey = Tuple[date, str]
+
+
+class ActiveUserCounter:
+    """Per-day, per-district distinct-user sketches"""
+
+    def __init__(
+        self,
+        interval: float = ACTIVE_USERS_FLUSH_INTERVAL,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.interval = interval
+        self.session_factory = session_factory
+        self._pending: Dict[SketchKey, HyperLogLog] = {}
+        # Sketches being written; still counted until the write commits
+        self._flushing: Dict[SketchKey, HyperLogLog] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def observe(self, rows: List[Dict[str, Any]]):
+        """Event listener: add the users of newly created queries"""
+        with self._lock:
+            for row in rows:
+                user_id = row.get("user_id")
+                if not user_id:
+                    continue
+                day = (row.get("created_at") or datetime.utcnow()).date()
+                keys = [(day, ALL_DISTRICTS)]
+                district = (row.get("district") or "").strip()
+                if district:
+                    keys.append((day, district))
+                for key in keys:
+                    sketch = self._pending.get(key)
+                    if sketch is None:
+                        sketch = self._pending[key] = HyperLogLog(PRECISION)
+                    sketch.add(user_id)
+
+    def flush(self) -> int:
+        """
+        Merge the pending sketches into the database
+
+        On failure they are kept and retried by the next flush.
+
+        Returns:
+            Number of sketch rows written
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            self._flushing, self._pending = self._pending, {}
+            flushing = self._flushing
+
+        db = self.session_factory()
+        try:
+            for (day, district), sketch in flushing.items():
+                stored = db.execute(
+                    select(DailyUserSketch)
+                    .where(DailyUserSketch.day == day)
+                    .where(DailyUserSketch.district == district)
+                    .with_for_update()
+                ).scalar_one_or_none()
+                if stored is None:
+                    db.add(
+                        DailyUserSketch(
+                            day=day, district=district, registers=sketch.to_bytes()
+                        )
+                    )
+                else:
+                    merged = HyperLogLog.from_bytes(stored.registers)
+                    merged.merge(sketch)
+                    stored.registers = merged.to_bytes()
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._lock:
+                for key, sketch in self._flushing.items():
+                    if key in self._pending:
+                        sketch.merge(self._pending[key])
+                    self._pending[key] = sketch
+                self._flushing = {}
+            raise
+        finally:
+            db.close()
+
+        with self._lock:
+            self._flushing = {}
+        return len(flushing)
+
+    def counts(
+        self, db: Session, since: date, until: Optional[date] = None
+    ) -> Dict[str, int]:
+        """
+        Distinct users active between two days
+
+        Args:
+            db: Database session
+            since: First day (inclusive)
+            until: Last day (inclusive); defaults to no limit
+
+        Returns:
+            District -> distinct users, with ALL_DISTRICTS for the overall count
+        """
+        statement = select(
+            DailyUserSketch.district, DailyUserSketch.registers
+        ).where(DailyUserSketch.day >= since)
+        if until is not None:
+            statement = statement.where(DailyUserSketch.day <= until)
+
+        merged: Dict[str, HyperLogLog] = {}
+
+        def include(district: str, sketch: HyperLogLog):
+            if district in merged:
+                merged[district].merge(sketch)
+            else:
+                merged[district] = HyperLogLog(PRECISION, sketch.registers.copy())
+
+        for district, registers in db.execute(statement):
+            include(district, HyperLogLog.from_bytes(registers))
+
+        with self._lock:
+            for (day, district), sketch in [
+                *self._flushing.items(),
+                *self._pending.items(),
+            ]:
+                if day >= since and (until is None or day <= until):
+                    include(district, sketch)
+
+        return {district: sketch.count() for district, sketch in merged.items()}
+
+    def backfill(self, batch_size: int = 1000) -> int:
+        """
+        Sketch every stored query, then flush
+
+        Only rows created before the call are read; later ones arrive through
+        events. Running it again (or in several workers) changes no count.
+
+        Returns:
+            Number of queries read
+        """
+        statement = (
+            select(Query.user_id, Query.district, Query.created_at)
+            .where(Query.created_at < datetime.utcnow())
+            .execution_options(yield_per=batch_size)
+        )
+        read = 0
+        db = self.session_factory()
+        try:
+            for rows in db.execute(statement).partitions():
+                self.observe([row._asdict() for row in rows])
+                read += len(rows)
+        finally:
+            db.close()
+        self.flush()
+        return read
+
+    def start(self):
+        """Start the thread, which backfills an empty table before flushing"""
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="active-users-flush", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and write what is still pending"""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Final active-user sketch flush failed: {e}")
+
+    def _run(self):
+        # The backfill scans every stored query, so it runs here rather than
+        # holding up application startup. Queries committed meanwhile are
+        # observed twice, which a HyperLogLog absorbs
+        try:
+            db = self.session_factory()
+            try:
+                empty = db.query(DailyUserSketch.day).first() is None
+            finally:
+                db.close()
+            if empty:
+                read = self.backfill()
+                logger.info(f"Backfilled active-user sketches from {read} queries")
+        except Exception as e:
+            logger.error(f"Active-user backfill failed: {e}")
+
+        while not self._stopped.wait(self.interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Active-user sketch flush failed: {e}")
+
+
+# Singleton instance, fed by every committed query
+active_users = ActiveUserCounter()
+events.subscribe(events.QUERIES_CREATED, active_users.observe)
@@ -8,10 +8,119 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 
+import asyncio
+import io
 import random
-from typing import Dict, Any, Optional
+import wave
+from typing import Dict, Any, BinaryIO, List, Optional, Tuple
 from loguru import logger
-from config.settings import DEMO_MODE, SERVICE_CATEGORIES
+from config.settings import DEMO_MODE, TTS_VOICE, AUDIO_URL_PREFIX
+from nlu import intent_engine, render_response, ERROR_RESPONSE
+from backend.app.services.tts_cache import tts_cache
+
+DEMO_TTS_SECONDS_PER_CHAR = 0.06
+
+# Simulated transcripts for demo
+DEMO_QUERIES = [
+    "मेरी पेंशन कब आएगी?",  # When will my pension come?
+    "मुझे राशन कार्ड के बारे में जानकारी चाहिए",  # Need ration card info
+    "हमारे गाँव में बिजली नहीं है",  # No electricity in our village
+    "PM-Kisan की अगली किस्त कब मिलेगी?",  # When is next PM-Kisan installment?
+    "पानी की सप्लाई बंद है",  # Water supply is stopped
+    "स्वास्थ्य शिविर कब होगा?",  # When is health camp?
+]
+
+
+class SpeechRecognitionError(Exception):
+    """Raised when the STT stage cannot produce a transcript"""
+
+
+class SpeechStream:
+    """
+    Incremental speech-to-text session
+
+    Audio is fed chunk by chunk as it arrives; feed() returns a partial
+    transcript whenever it changes, finish() returns the final result in the
+    same shape as AIService.speech_to_text.
+    """
+
+    def __init__(self, demo_mode: bool, language: str):
+        self.demo_mode = demo_mode
+        self.language = language
+        self.chunks_received = 0
+        self.bytes_received = 0
+        self.partial_text = ""
+        self._words: List[str] = []
+        if demo_mode:
+            self._words = random.choice(DEMO_QUERIES).split()
+
+    async def feed(self, chunk: bytes) -> Optional[str]:
+        """
+        Add an audio chunk
+
+        Args:
+            chunk: Next piece of audio
+
+        Returns:
+            Updated partial transcript, or None if it did not change
+
+        Raises:
+            SpeechRecognitionError: If the recognizer rejects the audio
+        """
+        self.chunks_received += 1
+        self.bytes_received += len(chunk)
+
+        if self.demo_mode:
+            # Reveal one more word of the simulated transcript per chunk
+            partial = " ".join(self._words[: self.chunks_received])
+        else:
+            # Real implementation would push the chunk to a streaming
+            # recognizer (e.g. Amazon Transcribe streaming) and read back
+            # its partial hypothesis
+            raise SpeechRecognitionError("Real AI integration not implemented in demo")
+
+        if partial == self.partial_text:
+            return None
+        self.partial_text = partial
+        return partial
+
+    async def finish(self, audio_file: Optional[BinaryIO] = None) -> Dict[str, Any]:
+        """
+        Close the stream and return the final transcript
+
+        Args:
+            audio_file: The spooled recording, for backends that can only
+                transcribe a complete file
+
+        Returns:
+            Dict with text and confidence
+        """
+        try:
+            if self.demo_mode:
+                if not self.bytes_received:
+                    raise ValueError("No audio received")
+                text = " ".join(self._words)
+                confidence = random.uniform(0.85, 0.98)
+
+                logger.info(
+                    f"STT Demo (streamed {self.chunks_received} chunks): "
+                    f"{text} (confidence: {confidence:.2f})"
+                )
+
+                return {"text": text, "confidence": confidence, "language": self.language}
+            else:
+                # Real implementation would finalize the streaming session or
+                # send audio_file to OpenAI Whisper
+                raise NotImplementedError("Real AI integration not implemented in demo")
+
+        except Exception as e:
+            logger.error(f"Speech-to-text error: {e}")
+            return {
+                "text": "",
+                "confidence": 0.0,
+                "language": self.language,
+                "error": str(e),
+            }
 
 
 class AIService:
@@ -36,15 +145,7 @@ class AIService:
         try:
             if self.demo_mode:
                 # Simulated responses for demo
-                demo_queries = [
-                    "मेरी पेंशन कब आएगी?",  # When will my pension come?
-                    "मुझे राशन कार्ड के बारे में जानकारी चाहिए",  # Need ration card info
-                    "हमारे गाँव में बिजली नहीं है",  # No electricity in our village
-                    "PM-Kisan की अगली किस्त कब मिलेगी?",  # When is next PM-Kisan installment?
-                    "पानी की सप्लाई बंद है",  # Water supply is stopped
-                    "स्वास्थ्य शिविर कब होगा?",  # When is health camp?
-                ]
-                text = random.choice(demo_queries)
+                text = random.choice(DEMO_QUERIES)
                 confidence = random.uniform(0.85, 0.98)
 
                 logger.info(f"STT Demo: {text} (confidence: {confidence:.2f})")
@@ -60,6 +161,18 @@ class AIService:
             logger.error(f"Speech-to-text error: {e}")
             return {"text": "", "confidence": 0.0, "language": language, "error": str(e)}
 
+    def open_speech_stream(self, language: str = "en") -> SpeechStream:
+        """
+        Start an incremental speech-to-text session
+
+        Args:
+            language: Language code
+
+        Returns:
+            SpeechStream to feed audio chunks into
+        """
+        return SpeechStream(self.demo_mode, language)
+
     async def detect_intent(self, text: str, language: str = "en") -> Dict[str, Any]:
         """
         Detect intent and extract entities using Amazon Bedrock (simulated in demo mode)
@@ -73,49 +186,10 @@ class AIService:
         """
         try:
             if self.demo_mode:
-                # Simple keyword-based intent detection for demo
-                text_lower = text.lower()
-
-                # Intent mapping
-                if any(
-                    word in text_lower
-                    for word in ["पेंशन", "pension", "পেনশন", "పెన్షన్"]
-                ):
-                    category = "pension"
-                    intent = "check_status"
-                elif any(
-                    word in text_lower
-                    for word in ["राशन", "ration", "রেশন", "రేషన్"]
-                ):
-                    category = "ration"
-                    intent = "information"
-                elif any(
-                    word in text_lower
-                    for word in ["बिजली", "electricity", "বিদ্যুত", "విద్యుత్"]
-                ):
-                    category = "electricity"
-                    intent = "complaint"
-                elif any(
-                    word in text_lower
-                    for word in ["किसान", "kisan", "farmer", "কৃষক", "రైతు"]
-                ):
-                    category = "pmkisan"
-                    intent = "check_status"
-                elif any(
-                    word in text_lower
-                    for word in ["पानी", "water", "জল", "నీరు", "paani"]
-                ):
-                    category = "water"
-                    intent = "complaint"
-                elif any(
-                    word in text_lower
-                    for word in ["स्वास्थ्य", "health", "স্বাস্থ্য", "ఆరోగ్యం", "शिविर", "camp"]
-                ):
-                    category = "health"
-                    intent = "information"
-                else:
-                    category = "general"
-                    intent = "information"
+                # Keyword-based intent detection for demo: one pass over
+                # the text finds hits for every category at once
+                result = intent_engine.classify(text)
+                category, intent = result.category, result.intent
 
                 confidence = random.uniform(0.80, 0.95)
 
@@ -128,6 +202,7 @@ class AIService:
                     "category": category,
                     "confidence": confidence,
                     "entities": {"service_type": category},
+                    "matches": result.matches_as_dicts(),
                 }
             else:
                 # Real implementation would use Amazon Bedrock
@@ -145,8 +220,57 @@ class AIService:
                 "error": str(e),
             }
 
+    async def detect_intent_batch(
+        self, texts: List[str], language: str = "en"
+    ) -> List[Dict[str, Any]]:
+        """
+        Detect intents for many texts in one pass (simulated in demo mode)
+
+        Args:
+            texts: Input texts
+            language: Language code
+
+        Returns:
+            One intent dict per text, in input order
+        """
+        try:
+            if self.demo_mode:
+                results = intent_engine.classify_batch(texts)
+
+                logger.info(f"Batch Intent Detection: {len(results)} texts")
+
+                return [
+                    {
+                        "intent": result.intent,
+                        "category": result.category,
+                        "confidence": random.uniform(0.80, 0.95),
+                        "entities": {"service_type": result.category},
+                        "matches": result.matches_as_dicts(),
+                    }
+                    for result in results
+                ]
+            else:
+                raise NotImplementedError("Real AI integration not implemented in demo")
+
+        except Exception as e:
+            logger.error(f"Batch intent detection error: {e}")
+            return [
+                {
+                    "intent": "unknown",
+                    "category": "general",
+                    "confidence": 0.0,
+                    "error": str(e),
+                }
+                for _ in texts
+            ]
+
     async def generate_response(
-        self, query: str, intent: str, category: str, language: str = "en"
+        self,
+        query: str,
+        intent: str,
+        category: str,
+        language: str = "en",
+        slots: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Generate AI response using LLM (simulated in demo mode)
@@ -156,49 +280,15 @@ class AIService:
             intent: Detected intent
             category: Service category
             language: Language code
+            slots: Template values such as complaint_id, date or amount
             
         Returns:
             Dict with response text and additional info
         """
         try:
             if self.demo_mode:
-                # Demo responses based on category
-                responses = {
-                    "pension": {
-                        "hi": "आपकी पेंशन इस महीने की 5 तारीख को आ गई है। ₹1000 की राशि आपके खाते में जमा हो गई है।",
-                        "en": "Your pension was credited on the 5th of this month. ₹1000 has been deposited to your account.",
-                    },
-                    "ration": {
-                        "hi": "आपका राशन कार्ड सक्रिय है। आप अपने नजदीकी राशन की दुकान से राशन ले सकते हैं। इस महीने का कोटा: 5 किलो चावल, 2 किलो गेहूं।",
-                        "en": "Your ration card is active. You can collect ration from your nearest shop. This month's quota: 5kg rice, 2kg wheat.",
-                    },
-                    "electricity": {
-                        "hi": "आपकी शिकायत दर्ज कर ली गई है। शिकायत संख्या: ELC-2024-001. बिजली विभाग को सूचित किया गया है। 24 घंटे में समस्या हल हो जाएगी।",
-                        "en": "Your complaint has been registered. Complaint ID: ELC-2024-001. Electricity department has been notified. Issue will be resolved within 24 hours.",
-                    },
-                    "pmkisan": {
-                        "hi": "PM-Kisan की अगली किस्त फरवरी के पहले सप्ताह में आएगी। ₹2000 सीधे आपके खाते में जमा होंगे।",
-                        "en": "Next PM-Kisan installment will come in the first week of February. ₹2000 will be directly deposited to your account.",
-                    },
-                    "water": {
-                        "hi": "पानी की सप्लाई की शिकायत दर्ज की गई है। शिकायत संख्या: WTR-2024-002. जल विभाग को तुरंत सूचित किया गया है। 48 घंटे में समाधान होगा।",
-                        "en": "Water supply complaint registered. Complaint ID: WTR-2024-002. Water department immediately notified. Resolution within 48 hours.",
-                    },
-                    "health": {
-                        "hi": "अगला स्वास्थ्य शिविर 15 फरवरी को आपके गाँव में लगेगा। सुबह 10 बजे से शाम 4 बजे तक। मुफ्त जांच और दवाई मिलेगी।",
-                        "en": "Next health camp will be on February 15 in your village. 10 AM to 4 PM. Free checkup and medicines available.",
-                    },
-                    "general": {
-                        "hi": "आपका प्रश्न दर्ज किया गया है। हमारी टीम जल्द ही आपसे संपर्क करेगी। अधिक जानकारी के लिए 1800-GRAMA-HELP पर कॉल करें।",
-                        "en": "Your query has been recorded. Our team will contact you soon. For more information, call 1800-GRAMA-HELP.",
-                    },
-                }
-
-                # Get response for category and language (fallback to Hindi)
-                category_responses = responses.get(category, responses["general"])
-                response_text = category_responses.get(
-                    language, category_responses.get("hi", category_responses["en"])
-                )
+                # Demo responses based on category (fallback to Hindi)
+                response_text = render_response(category, language, **(slots or {}))
 
                 logger.info(f"Generated response for {category} in {language}")
 
@@ -215,38 +305,71 @@ class AIService:
         except Exception as e:
             logger.error(f"Response generation error: {e}")
             return {
-                "response": "क्षमा करें, कुछ गड़बड़ हो गई। कृपया दोबारा कोशिश करें।",
+                "response": ERROR_RESPONSE,
                 "error": str(e),
             }
 
+    def _synthesize(self, text: str, language: str, voice: str) -> Tuple[bytes, str]:
+        """
+        Synthesize audio for text (simulated in demo mode)
+
+        Returns:
+            Audio bytes and their file extension
+        """
+        if self.demo_mode:
+            # Silent 8 kHz mono WAV, roughly as long as the text would take to read
+            frames = int(len(text) * DEMO_TTS_SECONDS_PER_CHAR * 8000)
+            buffer = io.BytesIO()
+            with wave.open(buffer, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(1)
+                wav.setframerate(8000)
+                wav.writeframes(b"\x80" * frames)
+            return buffer.getvalue(), "wav"
+        else:
+            # Real implementation would use Amazon Polly
+            # import boto3
+            # polly = boto3.client('polly')
+            # response = polly.synthesize_speech(Text=text, VoiceId=voice, ...)
+            raise NotImplementedError("Real AI integration not implemented in demo")
+
     async def text_to_speech(
-        self, text: str, language: str = "en"
+        self, text: str, language: str = "en", voice: str = TTS_VOICE
     ) -> Dict[str, Any]:
         """
         Convert text to speech using Amazon Polly (simulated in demo mode)
+        Results are served from the content-addressed TTS cache when the same
+        text, language and voice were synthesized before
         
         Args:
             text: Text to convert
             language: Language code
+            voice: Voice identifier
             
         Returns:
-            Dict with audio data or URL
+            Dict with audio URL
         """
         try:
-            if self.demo_mode:
-                # In demo mode, return a placeholder
-                logger.info(f"TTS Demo: Converting text to speech in {language}")
-                return {
-                    "audio_url": "demo_audio.mp3",
-                    "text": text,
-                    "language": language,
-                }
-            else:
-                # Real implementation would use Amazon Polly
-                # import boto3
-                # polly = boto3.client('polly')
-                # response = polly.synthesize_speech(...)
-                raise NotImplementedError("Real AI integration not implemented in demo")
+            key = tts_cache.make_key(text, language, voice)
+            filename = tts_cache.get(key)
+            cached = filename is not None
+
+            if not cached:
+                logger.info(f"TTS: Converting text to speech in {language}")
+                loop = asyncio.get_running_loop()
+                audio, extension = await loop.run_in_executor(
+                    None, self._synthesize, text, language, voice
+                )
+                filename = await loop.run_in_executor(
+                    None, tts_cache.put, key, audio, extension
+                )
+
+            return {
+                "audio_url": f"{AUDIO_URL_PREFIX}/{filename}",
+                "text": text,
+                "language": language,
+                "cached": cached,
+            }
 
         except Exception as e:
             logger.error(f"Text-to-speech error: {e}")
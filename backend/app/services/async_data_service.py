@@ -0,0 +1,132 @@
+"""
+Async data service for the FastAPI endpoints
+Writes and small reads run the DataService implementation through
+AsyncSession.run_sync, so the SQL, rollups and change events live in one
+place while the database I/O is awaited on the event loop. IDs are
+allocated on the DB thread pool first, since reserving a new block takes a
+blocking session and lock. History streams use a server-side cursor via
+AsyncSession.stream
+"""
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.models.database import Complaint, Query
+from backend.app.services.data_service import DataService
+from backend.app.services.id_allocator import (
+    complaint_id_allocator,
+    query_id_allocator,
+)
+from backend.app.utils.db_executor import run_blocking
+
+
+class AsyncDataService:
+    """Awaitable counterparts of the DataService methods"""
+
+    @staticmethod
+    async def create_query(db: AsyncSession, **kwargs: Any) -> Query:
+        """Create a new query record (see DataService.create_query)"""
+        if kwargs.get("query_id") is None:
+            kwargs["query_id"] = await run_blocking(query_id_allocator.next_id)
+        return await db.run_sync(DataService.create_query, **kwargs)
+
+    @staticmethod
+    async def create_queries_bulk(
+        db: AsyncSession, rows: List[Dict[str, Any]]
+    ) -> List[int]:
+        """Insert many query records in one transaction"""
+        query_ids = await run_blocking(query_id_allocator.allocate, len(rows))
+        return await db.run_sync(DataService.create_queries_bulk, rows, query_ids)
+
+    @staticmethod
+    async def create_complaint(db: AsyncSession, **kwargs: Any) -> Complaint:
+        """Create a new complaint (see DataService.create_complaint)"""
+        if kwargs.get("complaint_id") is None:
+            kwargs["complaint_id"] = await run_blocking(
+                complaint_id_allocator.next_id, kwargs["category"]
+            )
+        return await db.run_sync(DataService.create_complaint, **kwargs)
+
+    @staticmethod
+    async def get_user_history_page(
+        db: AsyncSession, user_id: str, limit: int = 50, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of user query history and the next cursor"""
+        return await db.run_sync(
+            DataService.get_user_history_page, user_id, limit, cursor
+        )
+
+    @staticmethod
+    async def iter_user_history(
+        db: AsyncSession,
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield user query history as rows are fetched
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        statement = DataService.history_stream_statement(user_id, cursor, limit)
+        result = await db.stream(statement)
+        async for row in result:
+            yield DataService.history_stream_item(row)
+
+    @staticmethod
+    async def get_open_complaints(
+        db: AsyncSession, category: Optional[str] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Get open and in-progress complaints, newest first"""
+        statement = DataService.open_complaints_statement(category).limit(limit)
+        result = await db.execute(statement)
+        return [DataService._complaint_item(row) for row in result]
+
+    @staticmethod
+    async def get_complaint_clusters(
+        db: AsyncSession,
+        category: Optional[str] = None,
+        location: Optional[str] = None,
+        min_size: int = 1,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """Get near-duplicate complaint clusters, most recently active first"""
+        return await db.run_sync(
+            DataService.get_complaint_clusters, category, location, min_size, limit
+        )
+
+    @staticmethod
+    async def get_complaint_cluster(
+        db: AsyncSession, cluster_id: int, limit: int = 200
+    ) -> Optional[Dict[str, Any]]:
+        """Get one complaint cluster with its complaints"""
+        return await db.run_sync(DataService.get_complaint_cluster, cluster_id, limit)
+
+    @staticmethod
+    async def search(
+        db: AsyncSession,
+        text: str,
+        kind: str = "complaints",
+        category: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Full-text search over query or complaint text, best match first"""
+        return await db.run_sync(
+            DataService.search, text, kind, category, limit, offset
+        )
+
+    @staticmethod
+    async def compute_dashboard_data(db: AsyncSession, days: int = 7) -> Dict[str, Any]:
+        """Compute analytics data for dashboard; errors propagate"""
+        return await db.run_sync(DataService.compute_dashboard_data, days)
+
+    @staticmethod
+    async def seed_demo_data(db: AsyncSession):
+        """Seed database with demo data for testing"""
+        await db.run_sync(DataService.seed_demo_data)
+
+
+# Singleton instance
+async_data_service = AsyncDataService()
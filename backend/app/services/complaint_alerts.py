@@ -0,0 +1,330 @@
+"""
+Complaint spike alerts
+Complaints are counted per (village, category) in ALERT_BUCKET_SECONDS
+buckets. Each key keeps an exponentially weighted mean and variance of its
+past bucket counts; when the current bucket's count rises ALERT_THRESHOLD
+standard deviations above the mean (and reaches ALERT_MIN_COUNT), an alert
+is raised once for that bucket. State is a few numbers per key, updated on
+every created complaint, so outages surface within one bucket without
+scanning the complaints table. Alerts cover the complaints written by this
+worker process
+"""
+import asyncio
+import itertools
+import math
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config.settings import (
+    ALERT_BUCKET_SECONDS,
+    ALERT_EWMA_ALPHA,
+    ALERT_HISTORY_SIZE,
+    ALERT_MIN_COUNT,
+    ALERT_THRESHOLD,
+)
+from backend.app.models import SessionLocal
+from backend.app.models.database import Complaint
+from backend.app.services import events
+
+UNKNOWN_VILLAGE = "unknown"
+EPOCH = datetime(1970, 1, 1)
+
+# Buckets a key may stay idle before its state is dropped; by then the
+# weights of its past counts have decayed below 1%
+_IDLE_WEIGHT = 0.01
+# Updates between sweeps for idle keys
+_PRUNE_EVERY = 10000
+
+AlertKey = Tuple[str, str]
+
+
+class _Rate:
+    """Exponentially weighted complaint rate of one key"""
+
+    __slots__ = ("bucket", "count", "mean", "variance", "alerted")
+
+    def __init__(self, bucket: int):
+        self.bucket = bucket
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.alerted = False
+
+
+class SpikeDetector:
+    """Online EWMA spike detection over complaint counts"""
+
+    def __init__(
+        self,
+        bucket_seconds: float = ALERT_BUCKET_SECONDS,
+        alpha: float = ALERT_EWMA_ALPHA,
+        threshold: float = ALERT_THRESHOLD,
+        min_count: int = ALERT_MIN_COUNT,
+        history_size: int = ALERT_HISTORY_SIZE,
+    ):
+        """
+        Args:
+            bucket_seconds: Length of one counting bucket
+            alpha: Weight of the newest bucket in the mean and variance
+            threshold: Standard deviations above the mean that raise an alert
+            min_count: Complaints a bucket needs before it can raise an alert
+            history_size: Recent alerts kept for the API and reconnecting streams
+        """
+        self.bucket_seconds = bucket_seconds
+        self.alpha = alpha
+        self.threshold = threshold
+        self.min_count = min_count
+        self.idle_buckets = int(math.ceil(math.log(_IDLE_WEIGHT) / math.log(1 - alpha)))
+        self.alerts: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self._rates: Dict[AlertKey, _Rate] = {}
+        self._ids = itertools.count(1)
+        self._updates = 0
+        self._lock = threading.Lock()
+        self._subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        # Live complaints held back while warm() replays older ones, so the
+        # replay is not discarded as late arrivals
+        self._warming = False
+        self._held: List[Dict[str, Any]] = []
+
+    def _advance(self, rate: _Rate, bucket: int):
+        """Fold the finished buckets up to `bucket` into the mean and variance"""
+        closed = [rate.count] + [0] * min(bucket - rate.bucket - 1, self.idle_buckets)
+        for count in closed:
+            # Incremental EWMA variance (West, 1979)
+            difference = count - rate.mean
+            increment = self.alpha * difference
+            rate.mean += increment
+            rate.variance = (1 - self.alpha) * (rate.variance + difference * increment)
+        rate.bucket = bucket
+        rate.count = 0
+        rate.alerted = False
+
+    def update(
+        self, village: str, category: str, timestamp: float, notify: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Count one complaint
+
+        Args:
+            village: Complaint location
+            category: Complaint category
+            timestamp: Seconds since the epoch (UTC)
+            notify: Whether an alert is recorded and pushed; warm-up replays
+                only train the baseline
+
+        Returns:
+            The alert raised by this complaint, if any
+        """
+        key = ((village or "").strip() or UNKNOWN_VILLAGE, category or "general")
+        bucket = int(timestamp // self.bucket_seconds)
+        with self._lock:
+            rate = self._rates.get(key)
+            if rate is None:
+                rate = self._rates[key] = _Rate(bucket)
+            elif bucket > rate.bucket:
+                self._advance(rate, bucket)
+            elif bucket < rate.bucket:
+                # Late arrival for a bucket already folded in
+                return None
+            rate.count += 1
+
+            self._updates += 1
+            if self._updates % _PRUNE_EVERY == 0:
+                self._prune(bucket)
+
+            # Counts are at least Poisson-noisy, so the spread never falls
+            # below sqrt(mean) (or 1 for a key with no history)
+            spread = math.sqrt(max(rate.variance, rate.mean, 1.0))
+            score = (rate.count - rate.mean) / spread
+            if (
+                not notify
+                or rate.alerted
+                or rate.count < self.min_count
+                or score < self.threshold
+            ):
+                return None
+            rate.alerted = True
+
+            alert = {
+                "alert_id": next(self._ids),
+                "village": key[0],
+                "category": key[1],
+                "count": rate.count,
+                "expected": round(rate.mean, 2),
+                "score": round(score, 2),
+                "rate_per_hour": round(rate.count * 3600 / self.bucket_seconds, 1),
+                "window_start": str(
+                    EPOCH + timedelta(seconds=bucket * self.bucket_seconds)
+                ),
+                "created_at": str(datetime.utcnow().replace(microsecond=0)),
+            }
+            self.alerts.append(alert)
+            subscribers = list(self._subscribers)
+
+        logger.warning(
+            f"Complaint spike: {alert['count']} {key[1]} complaints in {key[0]} "
+            f"(expected {alert['expected']})"
+        )
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, alert)
+            except RuntimeError:
+                # The subscriber's event loop is closed
+                self.unsubscribe(queue)
+        return alert
+
+    def _prune(self, bucket: int):
+        """Drop keys idle long enough that their state has decayed away"""
+        oldest = bucket - self.idle_buckets
+        for key in [key for key, rate in self._rates.items() if rate.bucket < oldest]:
+            del self._rates[key]
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, alert: Dict[str, Any]):
+        try:
+            queue.put_nowait(alert)
+        except asyncio.QueueFull:
+            # A subscriber this far behind has stopped reading
+            pass
+
+    def observe(self, rows: List[Dict[str, Any]]):
+        """Event listener: count newly created complaints"""
+        with self._lock:
+            if self._warming:
+                self._held.extend(rows)
+                return
+        self._count(rows)
+
+    def _count(self, rows: List[Dict[str, Any]]):
+        for row in rows:
+            created_at = row.get("created_at") or datetime.utcnow()
+            self.update(
+                row.get("location"),
+                row.get("category"),
+                (created_at - EPOCH).total_seconds(),
+            )
+
+    def recent(
+        self,
+        village: Optional[str] = None,
+        category: Optional[str] = None,
+        after_id: int = 0,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """
+        Alerts still in the history, newest first
+
+        Args:
+            village: Only this village, if given
+            category: Only this category, if given
+            after_id: Only alerts with a larger alert_id
+            limit: Maximum number of alerts
+
+        Returns:
+            Alert dicts
+        """
+        with self._lock:
+            alerts = list(self.alerts)
+        matching = [
+            alert
+            for alert in reversed(alerts)
+            if alert["alert_id"] > after_id
+            and (village is None or alert["village"] == village)
+            and (category is None or alert["category"] == category)
+        ]
+        return matching[:limit]
+
+    def subscribe(self, max_pending: int = 100) -> asyncio.Queue:
+        """Queue receiving every new alert; call from the event loop"""
+        queue: asyncio.Queue = asyncio.Queue(max_pending)
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Stop delivering alerts to a queue"""
+        with self._lock:
+            self._subscribers = {
+                item for item in self._subscribers if item[1] is not queue
+            }
+
+    def warm(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Train the baselines on complaints already stored
+
+        Reads the complaints of the last idle_buckets buckets in time order
+        without raising alerts. Only rows created before the call are read;
+        later ones arrive through events and are held until the replay is
+        done, then counted (and alerted on) in order.
+
+        Returns:
+            Number of complaints read
+        """
+        with self._lock:
+            self._warming = True
+        try:
+            return self._replay(session_factory, batch_size)
+        finally:
+            while True:
+                with self._lock:
+                    held, self._held = self._held, []
+                    if not held:
+                        self._warming = False
+                        break
+                self._count(held)
+
+    def _replay(self, session_factory: Callable[[], Session], batch_size: int) -> int:
+        """Train the baselines on stored complaints without raising alerts"""
+        until = datetime.utcnow()
+        since = until - timedelta(seconds=self.bucket_seconds * self.idle_buckets)
+        statement = (
+            select(Complaint.location, Complaint.category, Complaint.created_at)
+            .where(Complaint.created_at >= since)
+            .where(Complaint.created_at < until)
+            .order_by(Complaint.created_at)
+            .execution_options(yield_per=batch_size)
+        )
+        read = 0
+        db = session_factory()
+        try:
+            for rows in db.execute(statement).partitions():
+                for row in rows:
+                    self.update(
+                        row.location,
+                        row.category,
+                        (row.created_at - EPOCH).total_seconds(),
+                        notify=False,
+                    )
+                read += len(rows)
+        finally:
+            db.close()
+        return read
+
+    def start(self):
+        """Warm the baselines from the database in a background thread"""
+        # Hold live complaints from now on, not only once the thread runs
+        with self._lock:
+            self._warming = True
+
+        def run():
+            try:
+                logger.info(f"Spike detector warmed with {self.warm()} recent complaints")
+            except Exception as e:
+                logger.error(f"Spike detector warm-up failed: {e}")
+
+        threading.Thread(target=run, name="spike-detector-warm", daemon=True).start()
+
+
+# Singleton instance, fed by every committed complaint
+complaint_alerts = SpikeDetector()
+events.subscribe(events.COMPLAINTS_CREATED, complaint_alerts.observe)
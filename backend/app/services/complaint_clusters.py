@@ -0,0 +1,100 @@
+"""
+Near-duplicate complaint clustering
+When one incident (a burnt transformer, a broken hand pump) makes many
+villagers complain, their complaints are attached to one cluster as they are
+created. A complaint joins the most similar cluster of the same category and
+location seen within COMPLAINT_CLUSTER_WINDOW, comparing MinHash signatures
+of character shingles; otherwise it starts a new cluster
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from config.settings import (
+    COMPLAINT_CLUSTER_SIMILARITY,
+    COMPLAINT_CLUSTER_WINDOW,
+    COMPLAINT_CLUSTERING,
+)
+from backend.app.models.database import ComplaintCluster
+from backend.app.utils.sketches import MinHash, shingles
+
+
+class ComplaintClusterer:
+    """Assigns complaints to incident clusters"""
+
+    def __init__(
+        self,
+        window: float = COMPLAINT_CLUSTER_WINDOW,
+        threshold: float = COMPLAINT_CLUSTER_SIMILARITY,
+        minhash: Optional[MinHash] = None,
+    ):
+        """
+        Args:
+            window: Seconds since a cluster's last complaint during which it
+                still accepts new ones
+            threshold: Minimum estimated Jaccard similarity to join a cluster
+            minhash: Signature function; must stay the same while clusters
+                signed with it are in the window
+        """
+        self.window = timedelta(seconds=window)
+        self.threshold = threshold
+        self.minhash = minhash or MinHash()
+
+    def assign(self, db: Session, complaint: Dict[str, Any]) -> int:
+        """
+        Attach a new complaint to a cluster; the caller commits
+
+        Args:
+            db: Database session
+            complaint: Complaint row values (complaint_id, category, location,
+                description, created_at)
+
+        Returns:
+            ID of the cluster the complaint now belongs to
+        """
+        now = complaint.get("created_at") or datetime.utcnow()
+        signature = self.minhash.signature(shingles(complaint["description"]))
+
+        candidates = db.execute(
+            select(ComplaintCluster.id, ComplaintCluster.signature).where(
+                ComplaintCluster.category == complaint["category"],
+                ComplaintCluster.location == complaint["location"],
+                ComplaintCluster.last_seen_at >= now - self.window,
+            )
+        ).all()
+        best_id, best_similarity = None, self.threshold
+        for candidate in candidates:
+            similarity = MinHash.similarity(signature, json.loads(candidate.signature))
+            if similarity >= best_similarity:
+                best_id, best_similarity = candidate.id, similarity
+
+        if best_id is not None:
+            db.execute(
+                update(ComplaintCluster)
+                .where(ComplaintCluster.id == best_id)
+                .values(size=ComplaintCluster.size + 1, last_seen_at=now)
+            )
+            return best_id
+
+        # Two workers may both start a cluster for the same incident at the
+        # same moment; later complaints then join whichever is more similar
+        cluster = ComplaintCluster(
+            category=complaint["category"],
+            location=complaint["location"],
+            representative_id=complaint["complaint_id"],
+            description=complaint["description"],
+            signature=json.dumps(signature),
+            size=1,
+            first_seen_at=now,
+            last_seen_at=now,
+        )
+        db.add(cluster)
+        db.flush()
+        return cluster.id
+
+
+# Singleton instance (None when clustering is disabled)
+complaint_clusterer = ComplaintClusterer() if COMPLAINT_CLUSTERING else None
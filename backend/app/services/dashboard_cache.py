@@ -0,0 +1,239 @@
+"""
+Response cache for dashboard data
+Results are cached per `days` window for DASHBOARD_CACHE_TTL seconds and
+invalidated whenever queries or complaints are created. Expired or
+invalidated entries keep being served (stale-while-revalidate) while a single
+background refresh per window recomputes them, so viewers never wait on the
+database unless nothing usable is cached
+"""
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from loguru import logger
+
+from config.settings import (
+    DASHBOARD_CACHE_BACKEND,
+    DASHBOARD_CACHE_MAX_ENTRIES,
+    DASHBOARD_CACHE_STALE_TTL,
+    DASHBOARD_CACHE_TTL,
+    REDIS_URL,
+)
+from backend.app.models.async_session import AsyncSessionLocal
+from backend.app.services import events
+from backend.app.services.async_data_service import async_data_service
+
+
+class CacheEntry(NamedTuple):
+    """A cached dashboard payload"""
+
+    value: Dict[str, Any]
+    created_at: float
+    # Invalidation generation the value was computed under
+    generation: int
+
+
+class CacheBackend:
+    """Storage for cache entries; subclass to share them between workers"""
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    async def set(self, key: str, entry: CacheEntry, ttl: float):
+        raise NotImplementedError
+
+    async def generation(self) -> int:
+        """Current invalidation generation"""
+        raise NotImplementedError
+
+    async def invalidate(self):
+        """Mark every entry stale by moving to a new generation"""
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process LRU backend"""
+
+    def __init__(self, max_entries: int = DASHBOARD_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._generation = 0
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    async def set(self, key: str, entry: CacheEntry, ttl: float):
+        # Entries past their stale TTL are ignored on read and age out of LRU
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    async def invalidate(self):
+        with self._lock:
+            self._generation = next(self._counter)
+
+
+class RedisBackend(CacheBackend):
+    """
+    Backend shared by every worker through Redis
+
+    Uses the asyncio client of the redis package (4.2 or later), so cache
+    reads never block the event loop.
+    """
+
+    def __init__(self, url: str = REDIS_URL, prefix: str = "gramavoice:dashboard:"):
+        from redis import asyncio as aioredis
+
+        self._client = aioredis.Redis.from_url(url, socket_timeout=0.5)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        raw = await self._client.get(self.prefix + key)
+        if raw is None:
+            return None
+        return CacheEntry(**json.loads(raw))
+
+    async def set(self, key: str, entry: CacheEntry, ttl: float):
+        await self._client.set(
+            self.prefix + key, json.dumps(entry._asdict()), ex=max(int(ttl), 1)
+        )
+
+    async def generation(self) -> int:
+        return int(await self._client.get(self.prefix + "generation") or 0)
+
+    async def invalidate(self):
+        await self._client.incr(self.prefix + "generation")
+
+
+class DashboardCache:
+    """TTL cache with stale-while-revalidate for compute_dashboard_data"""
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: float = DASHBOARD_CACHE_TTL,
+        stale_ttl: float = DASHBOARD_CACHE_STALE_TTL,
+    ):
+        """
+        Args:
+            backend: Entry storage
+            ttl: Seconds an entry is fresh
+            stale_ttl: Seconds an entry may still be served while it refreshes
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        # One in-flight recomputation per key on this worker
+        self._refreshing: Dict[str, asyncio.Future] = {}
+        # Loop the backend is used from; set by start()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self):
+        """Bind invalidation to the running event loop; call at start-up"""
+        self._loop = asyncio.get_running_loop()
+
+    @staticmethod
+    def _key(days: int) -> str:
+        return f"days:{days}"
+
+    async def get(self, days: int) -> Dict[str, Any]:
+        """
+        Dashboard data for the last `days` days
+
+        Fresh entries are returned as is; stale ones are returned at once
+        and refreshed in the background; otherwise the caller waits for the
+        (shared) recomputation.
+        """
+        key = self._key(days)
+        entry = await self.backend.get(key)
+        if entry is not None:
+            age = time.time() - entry.created_at
+            current = entry.generation == await self.backend.generation()
+            if age < self.ttl and current:
+                return entry.value
+            if age < self.stale_ttl:
+                self._refresh(days)
+                return entry.value
+        return await asyncio.shield(self._refresh(days))
+
+    def invalidate(self, rows: Optional[List[Dict[str, Any]]] = None):
+        """
+        Event listener: new rows make every cached window stale
+
+        Rows are committed on worker threads as well as on the event loop, so
+        the backend update is handed to the loop bound by start(). Rows
+        written by processes that never call start() (e.g. scripts) leave the
+        cache to expire after DASHBOARD_CACHE_TTL.
+        """
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._invalidate_backend)
+        except RuntimeError:
+            # The loop was closed at shutdown
+            pass
+
+    def _invalidate_backend(self):
+        future = asyncio.ensure_future(self.backend.invalidate())
+        future.add_done_callback(self._invalidated)
+
+    @staticmethod
+    def _invalidated(future: asyncio.Future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Dashboard cache invalidation failed: {future.exception()}")
+
+    def _refresh(self, days: int) -> asyncio.Future:
+        """Start recomputing a window unless that is already under way"""
+        key = self._key(days)
+        future = self._refreshing.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._compute(days))
+            self._refreshing[key] = future
+            future.add_done_callback(lambda done: self._finished(key, done))
+        return future
+
+    def _finished(self, key: str, future: asyncio.Future):
+        self._refreshing.pop(key, None)
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Dashboard cache refresh failed: {future.exception()}")
+
+    async def _compute(self, days: int) -> Dict[str, Any]:
+        # Read the generation first so rows created while computing leave the
+        # new entry stale. Errors reach the waiting callers and nothing is
+        # cached, so a failed read is retried on the next request
+        generation = await self.backend.generation()
+        async with AsyncSessionLocal() as db:
+            value = await async_data_service.compute_dashboard_data(db, days)
+        await self.backend.set(
+            self._key(days), CacheEntry(value, time.time(), generation), self.stale_ttl
+        )
+        return value
+
+
+def _create_backend() -> CacheBackend:
+    if DASHBOARD_CACHE_BACKEND == "redis":
+        return RedisBackend()
+    return MemoryBackend()
+
+
+# Singleton instance, invalidated by new queries and complaints
+dashboard_cache = DashboardCache(_create_backend())
+events.subscribe(events.QUERIES_CREATED, dashboard_cache.invalidate)
+events.subscribe(events.COMPLAINTS_CREATED, dashboard_cache.invalidate)
@@ -1,13 +1,40 @@
 """
 Data service for managing queries, complaints, and analytics
 """
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from backend.app.models.database import Query, Complaint, User, Analytics
+from sqlalchemy import cast, column, func, desc, literal, literal_column, select, table, tuple_
+from sqlalchemy.dialects.postgresql import TSQUERY
+from config.settings import HISTORY_STREAM_BATCH_SIZE
+from backend.app.models.database import (
+    OPEN_COMPLAINT_FILTER,
+    Query,
+    Complaint,
+    ComplaintCluster,
+    User,
+    Analytics,
+)
+from backend.app.models.search_index import (
+    SEARCH_COLUMNS,
+    fts5_match,
+    fts_table,
+    tsquery,
+    tsvector_sql,
+)
+from backend.app.services import events, rollups
+from backend.app.services.active_users import ALL_DISTRICTS, active_users
+from backend.app.services.complaint_clusters import complaint_clusterer
+from backend.app.services.id_allocator import (
+    complaint_id_allocator,
+    query_id_allocator,
+)
+from backend.app.services.write_behind import query_write_buffer
+from backend.app.utils.pagination import decode_cursor, encode_cursor
+from backend.app.utils.text import search_terms
 from loguru import logger
-import random
+from nlu import sentiment_scorer
 
 
 class DataService:
@@ -23,29 +50,109 @@ class DataService:
         category: str,
         ai_response: str,
         confidence: float = 0.0,
+        village: Optional[str] = None,
+        district: Optional[str] = None,
+        query_id: Optional[int] = None,
     ) -> Query:
-        """Create a new query record"""
+        """
+        Create a new query record
+
+        Pass query_id when it was allocated earlier (e.g. off the event loop);
+        otherwise it is allocated here, up front. With QUERY_WRITE_BEHIND
+        enabled and the buffer running, the row is journaled and buffered for
+        a later bulk insert, and the returned Query is not attached to the
+        session.
+        """
         try:
-            query = Query(
-                user_id=user_id,
-                query_text=query_text,
-                language=language,
-                detected_intent=intent,
-                service_category=category,
-                ai_response=ai_response,
-                confidence_score=confidence,
-                status="completed",
-            )
+            now = datetime.utcnow()
+            row = {
+                "id": query_id or query_id_allocator.next_id(),
+                "user_id": user_id,
+                "village": village,
+                "district": district,
+                "query_text": query_text,
+                "language": language,
+                "detected_intent": intent,
+                "service_category": category,
+                "ai_response": ai_response,
+                "confidence_score": confidence,
+                "sentiment_score": sentiment_scorer.score(query_text),
+                "status": "completed",
+                "resolved": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+
+            if query_write_buffer is not None and query_write_buffer.running:
+                query_write_buffer.append(row)
+                logger.info(f"Buffered query {row['id']} for user {user_id}")
+                return Query(**row)
+
+            query = Query(**row)
             db.add(query)
+            rollups.record(db, rollups.METRIC_QUERIES, [(now, category)])
             db.commit()
             db.refresh(query)
             logger.info(f"Created query {query.id} for user {user_id}")
+            events.publish(events.QUERIES_CREATED, [row])
             return query
         except Exception as e:
             logger.error(f"Error creating query: {e}")
             db.rollback()
             raise
 
+    @staticmethod
+    def create_queries_bulk(
+        db: Session, rows: List[Dict[str, Any]], query_ids: Optional[List[int]] = None
+    ) -> List[int]:
+        """
+        Insert many query records in a single transaction
+
+        Args:
+            db: Database session
+            rows: Dicts with the same keys as create_query's arguments
+            query_ids: IDs allocated earlier, one per row; allocated here if omitted
+
+        Returns:
+            New query IDs, in the same order as rows
+        """
+        try:
+            if query_ids is None:
+                query_ids = query_id_allocator.allocate(len(rows))
+            now = datetime.utcnow()
+            values = [
+                {
+                    "id": query_id,
+                    "user_id": row["user_id"],
+                    "village": row.get("village"),
+                    "district": row.get("district"),
+                    "query_text": row["query_text"],
+                    "language": row["language"],
+                    "detected_intent": row["intent"],
+                    "service_category": row["category"],
+                    "ai_response": row["ai_response"],
+                    "confidence_score": row.get("confidence", 0.0),
+                    "sentiment_score": sentiment_scorer.score(row["query_text"]),
+                    "status": "completed",
+                    "resolved": False,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for query_id, row in zip(query_ids, rows)
+            ]
+            db.add_all([Query(**value) for value in values])
+            rollups.record(
+                db, rollups.METRIC_QUERIES, ((now, row["category"]) for row in rows)
+            )
+            db.commit()
+            logger.info(f"Created {len(query_ids)} queries in bulk")
+            events.publish(events.QUERIES_CREATED, values)
+            return query_ids
+        except Exception as e:
+            logger.error(f"Error creating queries in bulk: {e}")
+            db.rollback()
+            raise
+
     @staticmethod
     def create_complaint(
         db: Session,
@@ -54,140 +161,494 @@ class DataService:
         description: str,
         location: str,
         severity: str = "medium",
+        complaint_id: Optional[str] = None,
     ) -> Complaint:
-        """Create a new complaint"""
+        """
+        Create a new complaint
+
+        Pass complaint_id when it was allocated earlier (e.g. to quote it in
+        the spoken response); otherwise one is allocated here. The complaint
+        is attached to a near-duplicate cluster in the same transaction.
+        """
         try:
-            # Generate complaint ID
-            complaint_id = f"{category[:3].upper()}-{datetime.now().year}-{random.randint(1000, 9999)}"
-
-            complaint = Complaint(
-                complaint_id=complaint_id,
-                user_id=user_id,
-                category=category,
-                description=description,
-                location=location,
-                severity=severity,
-                status="open",
-            )
+            if complaint_id is None:
+                complaint_id = complaint_id_allocator.next_id(category)
+
+            now = datetime.utcnow()
+            row = {
+                "complaint_id": complaint_id,
+                "user_id": user_id,
+                "category": category,
+                "description": description,
+                "location": location,
+                "severity": severity,
+                "status": "open",
+                "created_at": now,
+                "updated_at": now,
+            }
+            if complaint_clusterer is not None:
+                row["cluster_id"] = complaint_clusterer.assign(db, row)
+            complaint = Complaint(**row)
             db.add(complaint)
+            rollups.record(db, rollups.METRIC_COMPLAINTS, [(now, category)])
             db.commit()
             db.refresh(complaint)
             logger.info(f"Created complaint {complaint_id} for user {user_id}")
+            events.publish(events.COMPLAINTS_CREATED, [{**row, "id": complaint.id}])
             return complaint
         except Exception as e:
             logger.error(f"Error creating complaint: {e}")
             db.rollback()
             raise
 
+    @staticmethod
+    def open_complaints_statement(category: Optional[str] = None):
+        """Open complaints, newest first (served by ix_complaints_open_created)"""
+        statement = select(
+            Complaint.complaint_id,
+            Complaint.category,
+            Complaint.description,
+            Complaint.location,
+            Complaint.severity,
+            Complaint.status,
+            Complaint.created_at,
+            Complaint.cluster_id,
+        ).where(OPEN_COMPLAINT_FILTER)
+        if category:
+            statement = statement.where(Complaint.category == category)
+        return statement.order_by(desc(Complaint.created_at))
+
+    @staticmethod
+    def _complaint_item(row) -> Dict[str, Any]:
+        return {
+            "complaint_id": row.complaint_id,
+            "category": row.category,
+            "description": row.description,
+            "location": row.location,
+            "severity": row.severity,
+            "status": row.status,
+            "date": row.created_at.strftime("%Y-%m-%d %H:%M"),
+            "cluster_id": row.cluster_id,
+        }
+
+    @staticmethod
+    def get_open_complaints(
+        db: Session, category: Optional[str] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Get complaints that still need action
+
+        Args:
+            db: Database session
+            category: Only this category, if given
+            limit: Maximum number of complaints
+
+        Returns:
+            Open and in-progress complaints, newest first
+        """
+        statement = DataService.open_complaints_statement(category).limit(limit)
+        return [DataService._complaint_item(row) for row in db.execute(statement)]
+
+    @staticmethod
+    def complaint_clusters_statement(
+        category: Optional[str] = None,
+        location: Optional[str] = None,
+        min_size: int = 1,
+    ):
+        """Complaint clusters, most recently active first"""
+        statement = select(ComplaintCluster)
+        if category:
+            statement = statement.where(ComplaintCluster.category == category)
+        if location:
+            statement = statement.where(ComplaintCluster.location == location)
+        if min_size > 1:
+            statement = statement.where(ComplaintCluster.size >= min_size)
+        return statement.order_by(
+            desc(ComplaintCluster.last_seen_at), desc(ComplaintCluster.id)
+        )
+
+    @staticmethod
+    def _cluster_item(cluster: ComplaintCluster) -> Dict[str, Any]:
+        return {
+            "cluster_id": cluster.id,
+            "category": cluster.category,
+            "location": cluster.location,
+            "description": cluster.description,
+            "representative_id": cluster.representative_id,
+            "size": cluster.size,
+            "first_seen": cluster.first_seen_at.strftime("%Y-%m-%d %H:%M"),
+            "last_seen": cluster.last_seen_at.strftime("%Y-%m-%d %H:%M"),
+        }
+
+    @staticmethod
+    def get_complaint_clusters(
+        db: Session,
+        category: Optional[str] = None,
+        location: Optional[str] = None,
+        min_size: int = 1,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get near-duplicate complaint clusters
+
+        Args:
+            db: Database session
+            category: Only this category, if given
+            location: Only this location, if given
+            min_size: Only clusters with at least this many complaints
+            limit: Maximum number of clusters
+
+        Returns:
+            Clusters, most recently active first
+        """
+        statement = DataService.complaint_clusters_statement(
+            category, location, min_size
+        ).limit(limit)
+        return [DataService._cluster_item(cluster) for cluster in db.scalars(statement)]
+
+    @staticmethod
+    def get_complaint_cluster(
+        db: Session, cluster_id: int, limit: int = 200
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get one complaint cluster with its complaints
+
+        Args:
+            db: Database session
+            cluster_id: Cluster ID
+            limit: Maximum number of complaints listed
+
+        Returns:
+            Cluster with its complaints, oldest first, or None if not found
+        """
+        cluster = db.get(ComplaintCluster, cluster_id)
+        if cluster is None:
+            return None
+
+        statement = (
+            select(
+                Complaint.complaint_id,
+                Complaint.category,
+                Complaint.description,
+                Complaint.location,
+                Complaint.severity,
+                Complaint.status,
+                Complaint.created_at,
+                Complaint.cluster_id,
+            )
+            .where(Complaint.cluster_id == cluster_id)
+            .order_by(Complaint.created_at, Complaint.id)
+            .limit(limit)
+        )
+        item = DataService._cluster_item(cluster)
+        item["complaints"] = [
+            DataService._complaint_item(row) for row in db.execute(statement)
+        ]
+        return item
+
+    @staticmethod
+    def search_statement(
+        dialect: str, kind: str, text: str, category: Optional[str] = None
+    ):
+        """
+        Select of queries or complaints matching every word of `text`, best first
+
+        Uses the FTS5 table on SQLite and the tsvector index on Postgres
+        (see backend.app.models.search_index); elsewhere falls back to LIKE
+        without ranking. Rows carry a `score` where higher is more relevant.
+
+        Raises:
+            ValueError: If kind is unknown or text has no searchable words
+        """
+        if kind == "queries":
+            model, category_column = Query, Query.service_category
+            columns = [
+                Query.id,
+                Query.query_text,
+                Query.created_at,
+                Query.service_category,
+                Query.status,
+                Query.resolved,
+            ]
+        elif kind == "complaints":
+            model, category_column = Complaint, Complaint.category
+            columns = [
+                Complaint.complaint_id,
+                Complaint.category,
+                Complaint.description,
+                Complaint.location,
+                Complaint.severity,
+                Complaint.status,
+                Complaint.created_at,
+                Complaint.cluster_id,
+            ]
+        else:
+            raise ValueError(f"Unknown search kind: {kind}")
+
+        terms = search_terms(text)
+        if not terms:
+            raise ValueError("Search text has no searchable words")
+
+        table_name = model.__tablename__
+        text_column = getattr(model, SEARCH_COLUMNS[table_name])
+        if dialect == "sqlite":
+            fts = table(fts_table(table_name), column("rowid"))
+            # bm25() is lower for better matches
+            score = (-func.bm25(literal_column(fts.name))).label("score")
+            statement = (
+                select(*columns, score)
+                .select_from(model.__table__.join(fts, fts.c.rowid == model.id))
+                .where(literal_column(fts.name).op("MATCH")(fts5_match(terms)))
+            )
+        elif dialect == "postgresql":
+            vector = literal_column(tsvector_sql(f"{table_name}.{text_column.key}"))
+            query = cast(literal(tsquery(terms)), TSQUERY)
+            score = func.ts_rank(vector, query).label("score")
+            statement = select(*columns, score).where(vector.op("@@")(query))
+        else:
+            score = literal(0.0).label("score")
+            statement = select(*columns, score).where(
+                *(text_column.ilike(f"%{term}%") for term in terms)
+            )
+
+        if category:
+            statement = statement.where(category_column == category)
+        return statement.order_by(desc(score), desc(model.created_at), desc(model.id))
+
+    @staticmethod
+    def search(
+        db: Session,
+        text: str,
+        kind: str = "complaints",
+        category: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Full-text search over query or complaint text
+
+        Args:
+            db: Database session
+            text: Words to search for; every word must match
+            kind: "complaints" or "queries"
+            category: Only this category, if given
+            limit: Page size
+            offset: next_offset from the previous page, or 0 for the first
+
+        Returns:
+            Ranked items and the offset of the next page (None at the end)
+
+        Raises:
+            ValueError: If kind is unknown or text has no searchable words
+        """
+        statement = DataService.search_statement(
+            db.get_bind().dialect.name, kind, text, category
+        )
+        # Fetch one extra row to learn whether another page exists
+        rows = db.execute(statement.limit(limit + 1).offset(offset)).all()
+        next_offset = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_offset = offset + limit
+
+        item = DataService._history_item if kind == "queries" else DataService._complaint_item
+        results = []
+        for row in rows:
+            result = item(row)
+            result["score"] = round(float(row.score), 4)
+            results.append(result)
+        return results, next_offset
+
+    @staticmethod
+    def history_statement(user_id: str, cursor: Optional[str] = None):
+        """
+        Column-only select of a user's queries, newest first
+
+        Ordered by (created_at, id) to match ix_queries_user_created_id; a
+        cursor continues strictly after the row it was made from.
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        statement = select(
+            Query.id,
+            Query.query_text,
+            Query.created_at,
+            Query.service_category,
+            Query.status,
+            Query.resolved,
+        ).where(Query.user_id == user_id)
+        if cursor:
+            created_at, query_id = decode_cursor(cursor)
+            statement = statement.where(
+                tuple_(Query.created_at, Query.id) < tuple_(created_at, query_id)
+            )
+        return statement.order_by(desc(Query.created_at), desc(Query.id))
+
+    @staticmethod
+    def history_stream_statement(
+        user_id: str, cursor: Optional[str] = None, limit: Optional[int] = None
+    ):
+        """history_statement set up to be fetched in batches"""
+        statement = DataService.history_statement(user_id, cursor)
+        if limit is not None:
+            statement = statement.limit(limit)
+        return statement.execution_options(
+            stream_results=True, yield_per=HISTORY_STREAM_BATCH_SIZE
+        )
+
+    @staticmethod
+    def history_stream_item(row) -> Dict[str, Any]:
+        """History item plus the cursor that resumes right after it"""
+        item = DataService._history_item(row)
+        item["cursor"] = encode_cursor(row.created_at, row.id)
+        return item
+
+    @staticmethod
+    def _history_item(row) -> Dict[str, Any]:
+        return {
+            "id": row.id,
+            "query": row.query_text,
+            "date": row.created_at.strftime("%Y-%m-%d %H:%M"),
+            "service": row.service_category,
+            "status": row.status,
+            "resolution": "Resolved" if row.resolved else "Pending",
+        }
+
+    @staticmethod
+    def get_user_history_page(
+        db: Session, user_id: str, limit: int = 50, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get one page of user query history
+
+        Args:
+            db: Database session
+            user_id: User identifier
+            limit: Page size
+            cursor: next_cursor from the previous page, or None for the first
+
+        Returns:
+            History items and the cursor for the next page (None at the end)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        # Fetch one extra row to learn whether another page exists
+        statement = DataService.history_statement(user_id, cursor).limit(limit + 1)
+        rows = db.execute(statement).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        return [DataService._history_item(row) for row in rows], next_cursor
+
     @staticmethod
     def get_user_history(
         db: Session, user_id: str, limit: int = 50
     ) -> List[Dict[str, Any]]:
         """Get user query history"""
         try:
-            queries = (
-                db.query(Query)
-                .filter(Query.user_id == user_id)
-                .order_by(desc(Query.created_at))
-                .limit(limit)
-                .all()
-            )
-
-            return [
-                {
-                    "id": q.id,
-                    "query": q.query_text,
-                    "date": q.created_at.strftime("%Y-%m-%d %H:%M"),
-                    "service": q.service_category,
-                    "status": q.status,
-                    "resolution": "Resolved" if q.resolved else "Pending",
-                }
-                for q in queries
-            ]
+            return DataService.get_user_history_page(db, user_id, limit)[0]
         except Exception as e:
             logger.error(f"Error getting user history: {e}")
             return []
 
     @staticmethod
-    def get_dashboard_data(db: Session, days: int = 7) -> Dict[str, Any]:
-        """Get analytics data for dashboard"""
-        try:
-            start_date = datetime.now() - timedelta(days=days)
+    def iter_user_history(
+        db: Session,
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield user query history as rows are fetched
 
-            # Get total queries
-            total_queries = (
-                db.query(func.count(Query.id))
-                .filter(Query.created_at >= start_date)
-                .scalar()
-            )
+        Rows are read in batches of HISTORY_STREAM_BATCH_SIZE. Each item
+        carries the cursor that resumes right after it.
 
-            # Get total complaints
-            total_complaints = (
-                db.query(func.count(Complaint.id))
-                .filter(Complaint.created_at >= start_date)
-                .scalar()
-            )
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        statement = DataService.history_stream_statement(user_id, cursor, limit)
+        for row in db.execute(statement):
+            yield DataService.history_stream_item(row)
 
-            # Get resolved complaints
-            resolved_complaints = (
-                db.query(func.count(Complaint.id))
-                .filter(
-                    Complaint.created_at >= start_date, Complaint.status == "resolved"
-                )
-                .scalar()
-            )
+    @staticmethod
+    def summarize_counts(counts: Dict[Any, int]) -> Dict[str, Any]:
+        """
+        Shape (day, metric, category) counters into the dashboard payload
 
-            # Get complaints by category
-            complaints_by_category = (
-                db.query(Complaint.category, func.count(Complaint.id))
-                .filter(Complaint.created_at >= start_date)
-                .group_by(Complaint.category)
-                .all()
-            )
+        Args:
+            counts: Counters from rollups.read or rollups.aggregate
 
-            # Get queries by service
-            queries_by_service = (
-                db.query(Query.service_category, func.count(Query.id))
-                .filter(Query.created_at >= start_date)
-                .group_by(Query.service_category)
-                .all()
-            )
+        Returns:
+            Dashboard data dict
+        """
+        totals: Dict[str, int] = defaultdict(int)
+        by_category: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        daily_queries: Dict[Any, int] = defaultdict(int)
+        for (day, metric, category), count in counts.items():
+            totals[metric] += count
+            by_category[metric][category] += count
+            if metric == rollups.METRIC_QUERIES:
+                daily_queries[day] += count
 
-            # Get daily query trend
-            daily_queries = (
-                db.query(
-                    func.date(Query.created_at).label("date"),
-                    func.count(Query.id).label("count"),
-                )
-                .filter(Query.created_at >= start_date)
-                .group_by(func.date(Query.created_at))
-                .all()
-            )
+        total_queries = totals[rollups.METRIC_QUERIES]
+        total_complaints = totals[rollups.METRIC_COMPLAINTS]
+        resolved_complaints = totals[rollups.METRIC_RESOLVED]
 
-            # Calculate resolution rate
-            resolution_rate = (
-                (resolved_complaints / total_complaints * 100)
-                if total_complaints > 0
-                else 0
-            )
+        # Calculate resolution rate
+        resolution_rate = (
+            (resolved_complaints / total_complaints * 100)
+            if total_complaints > 0
+            else 0
+        )
 
-            return {
-                "total_queries": total_queries or 0,
-                "total_complaints": total_complaints or 0,
-                "resolved_complaints": resolved_complaints or 0,
-                "resolution_rate": round(resolution_rate, 2),
-                "complaints_by_category": [
-                    {"category": cat, "count": count}
-                    for cat, count in complaints_by_category
-                ],
-                "queries_by_service": [
-                    {"service": svc, "count": count}
-                    for svc, count in queries_by_service
-                ],
-                "daily_trend": [
-                    {"date": str(date), "count": count} for date, count in daily_queries
-                ],
-            }
+        return {
+            "total_queries": total_queries,
+            "total_complaints": total_complaints,
+            "resolved_complaints": resolved_complaints,
+            "resolution_rate": round(resolution_rate, 2),
+            "complaints_by_category": [
+                {"category": cat, "count": count}
+                for cat, count in sorted(by_category[rollups.METRIC_COMPLAINTS].items())
+            ],
+            "queries_by_service": [
+                {"service": svc, "count": count}
+                for svc, count in sorted(by_category[rollups.METRIC_QUERIES].items())
+            ],
+            "daily_trend": [
+                {"date": str(date), "count": count}
+                for date, count in sorted(daily_queries.items())
+            ],
+        }
+
+    @staticmethod
+    def compute_dashboard_data(db: Session, days: int = 7) -> Dict[str, Any]:
+        """
+        Compute analytics data for dashboard
+
+        Reads the daily rollups, so the window is whole (UTC) days starting
+        `days` days ago. Errors propagate; see get_dashboard_data for the
+        variant that falls back to zeros.
+        """
+        start_day = (datetime.utcnow() - timedelta(days=days)).date()
+        data = DataService.summarize_counts(rollups.read(db, start_day))
+
+        users = active_users.counts(db, start_day)
+        data["active_users"] = users.pop(ALL_DISTRICTS, 0)
+        data["active_users_by_district"] = [
+            {"district": district, "count": count}
+            for district, count in sorted(users.items())
+        ]
+        return data
+
+    @staticmethod
+    def get_dashboard_data(db: Session, days: int = 7) -> Dict[str, Any]:
+        """Get analytics data for dashboard, all zeros if it cannot be read"""
+        try:
+            return DataService.compute_dashboard_data(db, days)
         except Exception as e:
             logger.error(f"Error getting dashboard data: {e}")
             return {
@@ -198,6 +659,8 @@ class DataService:
                 "complaints_by_category": [],
                 "queries_by_service": [],
                 "daily_trend": [],
+                "active_users": 0,
+                "active_users_by_district": [],
             }
 
     @staticmethod
@@ -227,6 +690,8 @@ class DataService:
             demo_queries = [
                 {
                     "user_id": "demo_user_001",
+                    "village": "रामपुर",
+                    "district": "वाराणसी",
                     "query_text": "मेरी पेंशन कब आएगी?",
                     "language": "hi",
                     "detected_intent": "check_status",
@@ -238,6 +703,8 @@ class DataService:
                 },
                 {
                     "user_id": "demo_user_001",
+                    "village": "रामपुर",
+                    "district": "वाराणसी",
                     "query_text": "राशन कार्ड की जानकारी चाहिए",
                     "language": "hi",
                     "detected_intent": "information",
@@ -249,6 +716,8 @@ class DataService:
                 },
                 {
                     "user_id": "demo_user_001",
+                    "village": "रामपुर",
+                    "district": "वाराणसी",
                     "query_text": "हमारे गाँव में बिजली नहीं है",
                     "language": "hi",
                     "detected_intent": "complaint",
@@ -260,9 +729,17 @@ class DataService:
                 },
             ]
 
-            for q_data in demo_queries:
-                query = Query(**q_data)
-                db.add(query)
+            now = datetime.utcnow()
+            for query_id, q_data in zip(
+                query_id_allocator.allocate(len(demo_queries)), demo_queries
+            ):
+                q_data.update(
+                    id=query_id,
+                    sentiment_score=sentiment_scorer.score(q_data["query_text"]),
+                    created_at=now,
+                    updated_at=now,
+                )
+                db.add(Query(**q_data))
 
             # Create demo complaints
             demo_complaints = [
@@ -287,11 +764,35 @@ class DataService:
             ]
 
             for c_data in demo_complaints:
-                complaint = Complaint(**c_data)
-                db.add(complaint)
+                c_data.update(created_at=now, updated_at=now)
+                if complaint_clusterer is not None:
+                    c_data["cluster_id"] = complaint_clusterer.assign(db, c_data)
+                db.add(Complaint(**c_data))
+
+            rollups.record(
+                db,
+                rollups.METRIC_QUERIES,
+                [(now, q_data["service_category"]) for q_data in demo_queries],
+            )
+            rollups.record(
+                db,
+                rollups.METRIC_COMPLAINTS,
+                [(now, c_data["category"]) for c_data in demo_complaints],
+            )
+            rollups.record(
+                db,
+                rollups.METRIC_RESOLVED,
+                [
+                    (now, c_data["category"])
+                    for c_data in demo_complaints
+                    if c_data["status"] == "resolved"
+                ],
+            )
 
             db.commit()
             logger.info("Demo data seeded successfully")
+            events.publish(events.QUERIES_CREATED, demo_queries)
+            events.publish(events.COMPLAINTS_CREATED, demo_complaints)
 
         except Exception as e:
             logger.error(f"Error seeding demo data: {e}")
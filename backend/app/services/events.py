@@ -0,0 +1,50 @@
+"""
+In-process hooks for data changes
+Services publish an event after new rows are committed; caches and live
+analytics subscribe to it. Listeners run synchronously in the publishing
+thread, so they must be quick, and their errors are logged, never raised
+"""
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+from loguru import logger
+
+QUERIES_CREATED = "queries_created"
+COMPLAINTS_CREATED = "complaints_created"
+
+Listener = Callable[[List[Dict[str, Any]]], None]
+
+_listeners: Dict[str, List[Listener]] = defaultdict(list)
+_lock = threading.Lock()
+
+
+def subscribe(event: str, listener: Listener):
+    """
+    Register a listener for an event
+
+    Args:
+        event: QUERIES_CREATED or COMPLAINTS_CREATED
+        listener: Called with the committed rows as column dicts
+    """
+    with _lock:
+        _listeners[event].append(listener)
+
+
+def publish(event: str, rows: List[Dict[str, Any]]):
+    """
+    Notify listeners that rows were committed
+
+    Args:
+        event: Event name
+        rows: Column values of the new rows
+    """
+    if not rows:
+        return
+    with _lock:
+        listeners = list(_listeners[event])
+    for listener in listeners:
+        try:
+            listener(rows)
+        except Exception as e:
+            logger.error(f"Listener {listener!r} failed on {event}: {e}")
@@ -0,0 +1,171 @@
+"""
+Block-based ID allocation
+Each worker reserves a block of IDs from a row in the id_sequences table and
+hands them out from memory, so assigning an ID needs no database round trip
+and stays unique across processes
+"""
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config.settings import COMPLAINT_ID_BLOCK_SIZE, ID_BLOCK_SIZE
+from backend.app.models import SessionLocal
+from backend.app.models.database import IdSequence, Query
+
+
+class BlockAllocator:
+    """Hands out IDs from blocks reserved in a DB-backed sequence"""
+
+    def __init__(
+        self,
+        name: str,
+        block_size: int = ID_BLOCK_SIZE,
+        initial_value: Optional[Callable[[Session], int]] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        """
+        Args:
+            name: Sequence name (row key in id_sequences)
+            block_size: IDs reserved per round trip
+            initial_value: Computes the first value when the sequence row
+                does not exist yet (e.g. past the highest existing ID)
+            session_factory: Creates the session used to reserve blocks
+        """
+        self.name = name
+        self.block_size = block_size
+        self.initial_value = initial_value or (lambda db: 1)
+        self.session_factory = session_factory
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        """Allocate one ID"""
+        return self.allocate(1)[0]
+
+    def allocate(self, count: int) -> List[int]:
+        """
+        Allocate several IDs
+
+        Args:
+            count: Number of IDs needed
+
+        Returns:
+            Unique, increasing IDs (not necessarily contiguous)
+        """
+        ids: List[int] = []
+        with self._lock:
+            while len(ids) < count:
+                if self._next >= self._end:
+                    wanted = max(self.block_size, count - len(ids))
+                    self._next, self._end = self._reserve(wanted)
+                take = min(self._end - self._next, count - len(ids))
+                ids.extend(range(self._next, self._next + take))
+                self._next += take
+        return ids
+
+    def _reserve(self, size: int):
+        """Reserve [start, start + size) from the sequence row"""
+        db = self.session_factory()
+        try:
+            for _ in range(3):
+                # UPDATE first so the row is locked (Postgres) or the write
+                # lock is held (SQLite) before we read the new value back
+                result = db.execute(
+                    update(IdSequence)
+                    .where(IdSequence.name == self.name)
+                    .values(next_value=IdSequence.next_value + size)
+                )
+                if result.rowcount:
+                    end = (
+                        db.query(IdSequence.next_value)
+                        .filter(IdSequence.name == self.name)
+                        .scalar()
+                    )
+                    db.commit()
+                    logger.info(f"Reserved {self.name} IDs {end - size}..{end - 1}")
+                    return end - size, end
+
+                # First use of this sequence: create the row
+                db.rollback()
+                try:
+                    start = self.initial_value(db)
+                    db.add(IdSequence(name=self.name, next_value=start))
+                    db.commit()
+                except IntegrityError:
+                    # Another worker created it first; retry the update
+                    db.rollback()
+            raise RuntimeError(f"Could not reserve IDs from sequence {self.name}")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+class ComplaintIdAllocator:
+    """
+    Complaint IDs such as WAT-2026-000123
+
+    Numbers come from one BlockAllocator sequence per category prefix and
+    year, so they never collide and need no unique-index retries.
+    """
+
+    NUMBER_WIDTH = 6
+
+    def __init__(
+        self,
+        block_size: int = COMPLAINT_ID_BLOCK_SIZE,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.block_size = block_size
+        self.session_factory = session_factory
+        self._sequences: Dict[Tuple[str, int], BlockAllocator] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def prefix(category: str) -> str:
+        """Three-letter category prefix, e.g. water -> WAT"""
+        return category[:3].upper()
+
+    def next_id(self, category: str, year: Optional[int] = None) -> str:
+        """
+        Allocate a complaint ID
+
+        Args:
+            category: Service category
+            year: Year the complaint is filed in (defaults to the current one)
+
+        Returns:
+            Complaint ID string
+        """
+        prefix = self.prefix(category)
+        year = year or datetime.now().year
+        with self._lock:
+            allocator = self._sequences.get((prefix, year))
+            if allocator is None:
+                allocator = BlockAllocator(
+                    f"complaint:{prefix}:{year}",
+                    block_size=self.block_size,
+                    session_factory=self.session_factory,
+                )
+                self._sequences[(prefix, year)] = allocator
+        number = allocator.next_id()
+        return f"{prefix}-{year}-{number:0{self.NUMBER_WIDTH}d}"
+
+
+def _after_max_query_id(db: Session) -> int:
+    """Start past any query rows inserted before the sequence existed"""
+    return (db.query(func.max(Query.id)).scalar() or 0) + 1
+
+
+# Shared allocator for Query primary keys
+query_id_allocator = BlockAllocator("queries", initial_value=_after_max_query_id)
+
+# Shared allocator for public complaint IDs
+complaint_id_allocator = ComplaintIdAllocator()
@@ -0,0 +1,216 @@
+"""
+Asynchronous voice processing jobs
+Accepted audio is queued onto an in-process worker pool; clients poll the job
+status or receive a callback when it finishes. The queue interface (submit /
+get / start / stop) is kept small so an external broker can replace it
+"""
+import asyncio
+import time
+import uuid
+from typing import Any, BinaryIO, Dict, List, Optional
+
+import requests
+from loguru import logger
+
+from config.settings import (
+    JOB_WORKERS,
+    JOB_QUEUE_MAX_DEPTH,
+    JOB_RESULT_TTL,
+    JOB_CALLBACK_TIMEOUT,
+)
+from backend.app.models.async_session import AsyncSessionLocal
+from backend.app.services.pipeline import voice_pipeline
+from backend.app.utils.audio_stream import iter_file
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at its maximum depth"""
+
+
+class Job:
+    """State of one queued voice request"""
+
+    def __init__(
+        self,
+        audio_file: BinaryIO,
+        language: str,
+        user_id: str,
+        callback_url: Optional[str] = None,
+        village: Optional[str] = None,
+        district: Optional[str] = None,
+    ):
+        self.job_id = uuid.uuid4().hex
+        self.audio_file = audio_file
+        self.language = language
+        self.user_id = user_id
+        self.callback_url = callback_url
+        self.village = village
+        self.district = district
+        self.status = "queued"  # queued, running, completed, failed
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Public view of the job"""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class InProcessJobQueue:
+    """Bounded asyncio queue drained by a fixed number of worker tasks"""
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        max_depth: int = JOB_QUEUE_MAX_DEPTH,
+        result_ttl: int = JOB_RESULT_TTL,
+    ):
+        self.worker_count = workers
+        self.max_depth = max_depth
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self):
+        """Create the queue and start the workers on the running loop"""
+        self._queue = asyncio.Queue(maxsize=self.max_depth)
+        self._workers = [
+            asyncio.create_task(self._worker(index))
+            for index in range(self.worker_count)
+        ]
+        logger.info(
+            f"Job queue started with {self.worker_count} workers "
+            f"(max depth {self.max_depth})"
+        )
+
+    async def stop(self):
+        """Cancel the workers and fail the jobs that have not started"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        # Close the spooled uploads of queued jobs so their temp files are
+        # released instead of waiting for garbage collection
+        while self._queue and not self._queue.empty():
+            job = self._queue.get_nowait()
+            job.audio_file.close()
+            job.status = "failed"
+            job.error = "Server shut down before the job started"
+            job.finished_at = time.time()
+            self._queue.task_done()
+
+    def submit(
+        self,
+        audio_file: BinaryIO,
+        language: str,
+        user_id: str,
+        callback_url: Optional[str] = None,
+        village: Optional[str] = None,
+        district: Optional[str] = None,
+    ) -> Job:
+        """
+        Queue a voice request
+
+        Args:
+            audio_file: Spooled recording; the job closes it when done
+
+        Raises:
+            QueueFullError: If the queue is at max depth
+        """
+        self._prune()
+        job = Job(audio_file, language, user_id, callback_url, village, district)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Job queue is full ({self.max_depth} jobs)")
+        self.jobs[job.job_id] = job
+        logger.info(f"Queued job {job.job_id} for user {user_id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by ID"""
+        return self.jobs.get(job_id)
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs waiting for a worker"""
+        return self._queue.qsize() if self._queue else 0
+
+    def _prune(self):
+        """Forget finished jobs older than the result TTL"""
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job.finished_at and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    async def _worker(self, index: int):
+        """Process jobs until cancelled"""
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        """Run the voice pipeline for one job and notify the callback"""
+        job.status = "running"
+        db = AsyncSessionLocal()
+        try:
+            job.result = await voice_pipeline.process_stream(
+                iter_file(job.audio_file),
+                job.language,
+                job.user_id,
+                db,
+                job.village,
+                job.district,
+            )
+            job.status = "completed"
+            logger.info(f"Job {job.job_id} completed")
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"Job {job.job_id} failed: {e}")
+        finally:
+            await db.close()
+            job.audio_file.close()
+            job.finished_at = time.time()
+
+        if job.callback_url:
+            await self._notify(job)
+
+    async def _notify(self, job: Job):
+        """POST the finished job to its callback URL"""
+        loop = asyncio.get_running_loop()
+        try:
+            response = await loop.run_in_executor(
+                None,
+                lambda: requests.post(
+                    job.callback_url,
+                    json=job.to_dict(),
+                    timeout=JOB_CALLBACK_TIMEOUT,
+                ),
+            )
+            logger.info(
+                f"Callback for job {job.job_id} returned {response.status_code}"
+            )
+        except Exception as e:
+            logger.error(f"Callback for job {job.job_id} failed: {e}")
+
+
+# Singleton instance
+job_queue = InProcessJobQueue()
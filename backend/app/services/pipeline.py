@@ -0,0 +1,208 @@
+"""
+Voice processing pipeline
+Runs STT -> intent -> response, then overlaps TTS with the database writes.
+Writes go through the async data service, and the remaining blocking work
+(complaint ID reservation) runs on a bounded thread pool, so a slow commit
+never blocks the event loop
+"""
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.services.ai_service import SpeechRecognitionError, ai_service
+from backend.app.services.async_data_service import async_data_service
+from backend.app.services.id_allocator import complaint_id_allocator
+from backend.app.utils.audio_stream import new_spool
+from backend.app.utils.db_executor import run_blocking
+
+
+class VoicePipeline:
+    """Processes one voice request end to end"""
+
+    @staticmethod
+    async def _persist(
+        db: AsyncSession,
+        user_id: str,
+        query_text: str,
+        language: str,
+        intent: str,
+        category: str,
+        ai_response: str,
+        confidence: float,
+        complaint_id: Optional[str] = None,
+        village: Optional[str] = None,
+        district: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Store the query and, for complaints, the complaint record
+
+        Both writes share one session, so they run one after the other.
+        """
+        query = await async_data_service.create_query(
+            db=db,
+            user_id=user_id,
+            query_text=query_text,
+            language=language,
+            intent=intent,
+            category=category,
+            ai_response=ai_response,
+            confidence=confidence,
+            village=village,
+            district=district,
+        )
+
+        if complaint_id is not None:
+            await async_data_service.create_complaint(
+                db=db,
+                user_id=user_id,
+                category=category,
+                description=query_text,
+                location=village or "Demo Location",
+                severity="medium",
+                complaint_id=complaint_id,
+            )
+
+        return {
+            "query_id": query.id,
+            "confidence": query.confidence_score,
+            "complaint_id": complaint_id,
+        }
+
+    async def stream_events(
+        self,
+        chunks: AsyncIterator[bytes],
+        language: str,
+        user_id: str,
+        db: AsyncSession,
+        village: Optional[str] = None,
+        district: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the full voice pipeline over an audio chunk stream
+
+        Each chunk is spooled (to disk once the recording is large) and fed to
+        the STT backend as soon as it arrives, so partial transcripts are
+        available before the upload finishes.
+
+        Args:
+            chunks: Audio chunks in upload order
+            language: Language code
+            user_id: User identifier
+            db: Async database session
+            village: Caller's village, if known
+            district: Caller's district, if known
+
+        Yields:
+            {"type": "partial", "text": ...} events, then one
+            {"type": "result", ...} event with the API response payload
+        """
+        stt = ai_service.open_speech_stream(language)
+        with new_spool() as spool:
+            async for chunk in chunks:
+                spool.write(chunk)
+                partial = await stt.feed(chunk)
+                if partial is not None:
+                    yield {"type": "partial", "text": partial}
+            spool.seek(0)
+            stt_result = await stt.finish(spool)
+
+        if stt_result.get("error"):
+            raise SpeechRecognitionError(stt_result["error"])
+
+        logger.info(f"Transcribed {stt.bytes_received} bytes for user {user_id}")
+
+        result = await self.process_text(
+            stt_result["text"],
+            stt_result["confidence"],
+            language,
+            user_id,
+            db,
+            village,
+            district,
+        )
+        yield {"type": "result", **result}
+
+    async def process_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        language: str,
+        user_id: str,
+        db: AsyncSession,
+        village: Optional[str] = None,
+        district: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run the full voice pipeline and return only the final payload"""
+        async for event in self.stream_events(
+            chunks, language, user_id, db, village, district
+        ):
+            if event["type"] == "result":
+                result = dict(event)
+                del result["type"]
+                return result
+
+    async def process_text(
+        self,
+        query_text: str,
+        stt_confidence: float,
+        language: str,
+        user_id: str,
+        db: AsyncSession,
+        village: Optional[str] = None,
+        district: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run the stages that follow speech recognition"""
+        # Detect intent
+        intent_result = await ai_service.detect_intent(query_text, language)
+        intent = intent_result["intent"]
+        category = intent_result["category"]
+        intent_confidence = intent_result["confidence"]
+
+        # Allocate the complaint ID first so the response can quote it
+        complaint_id = None
+        slots = {}
+        if intent == "complaint":
+            complaint_id = await run_blocking(complaint_id_allocator.next_id, category)
+            slots["complaint_id"] = complaint_id
+
+        # Generate response
+        response_result = await ai_service.generate_response(
+            query_text, intent, category, language, slots=slots
+        )
+        ai_response = response_result["response"]
+
+        # TTS and the database writes only depend on the response text, so
+        # run them concurrently
+        tts_result, stored = await asyncio.gather(
+            ai_service.text_to_speech(ai_response, language),
+            self._persist(
+                db,
+                user_id,
+                query_text,
+                language,
+                intent,
+                category,
+                ai_response,
+                (stt_confidence + intent_confidence) / 2,
+                complaint_id,
+                village,
+                district,
+            ),
+        )
+
+        return {
+            "success": True,
+            "query_id": stored["query_id"],
+            "query_text": query_text,
+            "detected_intent": intent,
+            "service_category": category,
+            "ai_response": ai_response,
+            "audio_response_url": tts_result.get("audio_url"),
+            "confidence": stored["confidence"],
+            "complaint_id": stored["complaint_id"],
+        }
+
+
+# Singleton instance
+voice_pipeline = VoicePipeline()
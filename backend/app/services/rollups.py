@@ -0,0 +1,299 @@
+"""
+Incremental dashboard rollups
+Per-day, per-category counters in the daily_rollups table are bumped in the
+same transaction as the rows they count, so dashboard reads sum a handful of
+rollup rows instead of scanning queries and complaints. A periodic compactor
+re-derives recent days from the raw tables to absorb status changes
+"""
+import threading
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import case, func, literal_column, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from config.settings import ROLLUP_COMPACT_DAYS, ROLLUP_COMPACT_INTERVAL
+from backend.app.models import SessionLocal
+from backend.app.models.database import Complaint, DailyRollup, Query
+
+METRIC_QUERIES = "queries"
+METRIC_COMPLAINTS = "complaints"
+METRIC_RESOLVED = "resolved_complaints"
+
+# Rollup keys are part of the primary key, so missing categories need a value
+UNKNOWN_CATEGORY = "unknown"
+
+RollupKey = Tuple[date, str, str]
+
+
+def _day(value) -> date:
+    """Calendar day of a datetime, date or DATE() result string"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def _upsert(db: Session, counts: Dict[RollupKey, int], replace: bool = False):
+    """
+    Add counts to (or, with replace, overwrite) rollup rows
+
+    Rows are written in key order so concurrent transactions lock them in the
+    same order.
+    """
+    if not counts:
+        return
+    rows = [
+        {"day": day, "metric": metric, "category": category, "count": count}
+        for (day, metric, category), count in sorted(counts.items())
+    ]
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite_insert if dialect == "sqlite" else pg_insert
+        stmt = insert(DailyRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["day", "metric", "category"],
+            set_={
+                "count": stmt.excluded.count
+                if replace
+                else DailyRollup.count + stmt.excluded.count
+            },
+        )
+        db.execute(stmt, rows)
+        return
+
+    # Other databases: update, then insert the rows that were not there
+    for row in rows:
+        value = row["count"] if replace else DailyRollup.count + row["count"]
+        updated = (
+            db.query(DailyRollup)
+            .filter(
+                DailyRollup.day == row["day"],
+                DailyRollup.metric == row["metric"],
+                DailyRollup.category == row["category"],
+            )
+            .update({"count": value}, synchronize_session=False)
+        )
+        if not updated:
+            db.add(DailyRollup(**row))
+
+
+def record(
+    db: Session, metric: str, items: Iterable[Tuple[datetime, Optional[str]]]
+):
+    """
+    Count new rows in the rollups; the caller commits
+
+    Args:
+        db: Session holding the transaction that inserts the rows
+        metric: METRIC_QUERIES, METRIC_COMPLAINTS or METRIC_RESOLVED
+        items: (created_at, category) of each new row
+    """
+    counts = Counter(
+        (_day(created_at), metric, category or UNKNOWN_CATEGORY)
+        for created_at, category in items
+    )
+    _upsert(db, counts)
+
+
+def aggregate_statement(since: Optional[date] = None):
+    """
+    Single statement computing rollup counters from the raw tables
+
+    Each table is scanned once: a CTE per table groups by day and category,
+    complaints use conditional aggregation for the resolved count, and the
+    results are stacked with UNION ALL.
+
+    Args:
+        since: First day to count (None counts everything)
+
+    Returns:
+        Selectable yielding (day, metric, category, count) rows
+    """
+    start = datetime.combine(since, time.min) if since is not None else None
+
+    query_day = func.date(Query.created_at)
+    queries = select(
+        query_day.label("day"),
+        Query.service_category.label("category"),
+        func.count().label("total"),
+    ).group_by(query_day, Query.service_category)
+
+    complaint_day = func.date(Complaint.created_at)
+    complaints = select(
+        complaint_day.label("day"),
+        Complaint.category.label("category"),
+        func.count().label("total"),
+        func.sum(case((Complaint.status == "resolved", 1), else_=0)).label("resolved"),
+    ).group_by(complaint_day, Complaint.category)
+
+    if start is not None:
+        queries = queries.where(Query.created_at >= start)
+        complaints = complaints.where(Complaint.created_at >= start)
+    queries = queries.cte("query_counts")
+    complaints = complaints.cte("complaint_counts")
+
+    def metric(name: str):
+        # Inlined rather than bound so UNION column types resolve everywhere
+        return literal_column(f"'{name}'").label("metric")
+
+    return union_all(
+        select(queries.c.day, metric(METRIC_QUERIES), queries.c.category, queries.c.total),
+        select(
+            complaints.c.day,
+            metric(METRIC_COMPLAINTS),
+            complaints.c.category,
+            complaints.c.total,
+        ),
+        select(
+            complaints.c.day,
+            metric(METRIC_RESOLVED),
+            complaints.c.category,
+            complaints.c.resolved,
+        ).where(complaints.c.resolved > 0),
+    )
+
+
+def aggregate(db: Session, since: Optional[date] = None) -> Dict[RollupKey, int]:
+    """
+    Compute rollup counters straight from the raw tables in one statement
+
+    Args:
+        db: Database session
+        since: First day to count (None counts everything)
+
+    Returns:
+        (day, metric, category) -> count
+    """
+    counts: Dict[RollupKey, int] = Counter()
+    for day, metric_name, category, count in db.execute(aggregate_statement(since)):
+        counts[(_day(day), metric_name, category or UNKNOWN_CATEGORY)] += int(count)
+    return counts
+
+
+def rebuild(db: Session, since: Optional[date] = None) -> int:
+    """
+    Recompute rollups from the raw tables
+
+    Args:
+        db: Database session; committed on success
+        since: First day to recompute (None recomputes everything)
+
+    Returns:
+        Number of rollup rows written
+    """
+    try:
+        stale = db.query(DailyRollup)
+        if since is not None:
+            stale = stale.filter(DailyRollup.day >= since)
+        stale.delete(synchronize_session=False)
+
+        # Overwrite rather than add, so another compactor doing the same
+        # cannot double the counts. On SQLite the DELETE takes the write
+        # lock, so no insert can land between it and the commit and the
+        # result is exact. On Postgres an insert committed while this runs
+        # may be missed: if it is invisible to the aggregate but creates
+        # its rollup row first, the overwrite replaces its +1. The next
+        # compaction, within ROLLUP_COMPACT_INTERVAL, recounts those days.
+        # Days older than ROLLUP_COMPACT_DAYS are only rebuilt by a backfill
+        counts = aggregate(db, since)
+        _upsert(db, counts, replace=True)
+        db.commit()
+        return len(counts)
+    except Exception:
+        db.rollback()
+        raise
+
+
+def read(db: Session, since: date) -> Dict[RollupKey, int]:
+    """
+    Load every rollup counter from a day onwards
+
+    Returns:
+        (day, metric, category) -> count
+    """
+    rows = db.query(
+        DailyRollup.day, DailyRollup.metric, DailyRollup.category, DailyRollup.count
+    ).filter(DailyRollup.day >= since)
+    return {(_day(day), metric, category): count for day, metric, category, count in rows}
+
+
+class RollupCompactor:
+    """Background thread that periodically re-derives recent rollup days"""
+
+    def __init__(
+        self,
+        interval: int = ROLLUP_COMPACT_INTERVAL,
+        days: int = ROLLUP_COMPACT_DAYS,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.interval = interval
+        self.days = days
+        self.session_factory = session_factory
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the thread, which backfills an empty table before compacting"""
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="rollup-compactor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread"""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+
+    def backfill(self) -> int:
+        """
+        Rebuild every rollup day if the rollup table is empty
+
+        Returns:
+            Number of rollup rows written
+        """
+        db = self.session_factory()
+        try:
+            if db.query(DailyRollup.day).first() is not None:
+                return 0
+            return rebuild(db)
+        finally:
+            db.close()
+
+    def compact(self) -> int:
+        """Recompute the most recent days"""
+        since = datetime.utcnow().date() - timedelta(days=self.days)
+        db = self.session_factory()
+        try:
+            return rebuild(db, since)
+        finally:
+            db.close()
+
+    def _run(self):
+        # A full rebuild scans every raw row, so it runs here rather than
+        # holding up application startup
+        try:
+            written = self.backfill()
+            if written:
+                logger.info(f"Backfilled {written} rollup rows")
+        except Exception as e:
+            logger.error(f"Rollup backfill failed: {e}")
+
+        while not self._stopped.wait(self.interval):
+            try:
+                written = self.compact()
+                logger.info(f"Rollup compaction rewrote {written} rows")
+            except Exception as e:
+                logger.error(f"Rollup compaction failed: {e}")
+
+
+# Singleton instance
+rollup_compactor = RollupCompactor()
@@ -0,0 +1,216 @@
+"""
+Village Pulse sentiment series
+Queries are scored once when stored (nlu.sentiment); every committed query
+adds its score to the current day of a fixed ring of SENTIMENT_SERIES_DAYS
+daily slots for its village and for all villages. Reading a series walks
+the ring, so its cost does not depend on how many queries were scored.
+Series cover the queries written by this worker process
+"""
+import threading
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config.settings import SENTIMENT_SERIES_DAYS
+from backend.app.models import SessionLocal
+from backend.app.models.database import Query
+from backend.app.services import events
+from nlu import sentiment_scorer
+
+# Series key of every village together
+ALL_VILLAGES = "all"
+
+
+class DailyRing:
+    """Sum and count of scores per day for the last `size` days"""
+
+    __slots__ = ("size", "days", "sums", "counts")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.days = array("l", [-1]) * size  # date ordinal held by each slot
+        self.sums = array("d", [0.0]) * size
+        self.counts = array("l", [0]) * size
+
+    def add(self, day: int, score: float):
+        """Add a score to a day (by date ordinal); days older than the ring are ignored"""
+        slot = day % self.size
+        if self.days[slot] != day:
+            if self.days[slot] > day:
+                return
+            self.days[slot] = day
+            self.sums[slot] = 0.0
+            self.counts[slot] = 0
+        self.sums[slot] += score
+        self.counts[slot] += 1
+
+    def get(self, day: int):
+        """(sum, count) of a day, zeros when nothing was recorded"""
+        slot = day % self.size
+        if self.days[slot] != day:
+            return 0.0, 0
+        return self.sums[slot], self.counts[slot]
+
+
+class SentimentSeries:
+    """Per-village daily average sentiment over a ring of recent days"""
+
+    def __init__(self, days: int = SENTIMENT_SERIES_DAYS):
+        self.days = days
+        self._rings: Dict[str, DailyRing] = {}
+        self._lock = threading.Lock()
+        # Queries committed while warming, added once the scan is done
+        self._warming = False
+        self._held: List[Dict[str, Any]] = []
+
+    def observe(self, rows: List[Dict[str, Any]]):
+        """Event listener: add the scores of newly created queries"""
+        with self._lock:
+            if self._warming:
+                self._held.extend(rows)
+                return
+        self._add(rows)
+
+    def _add(self, rows: List[Dict[str, Any]]):
+        with self._lock:
+            for row in rows:
+                score = row.get("sentiment_score")
+                if score is None:
+                    continue
+                day = (row.get("created_at") or datetime.utcnow()).toordinal()
+                village = (row.get("village") or "").strip()
+                keys = [ALL_VILLAGES, village] if village else [ALL_VILLAGES]
+                for key in keys:
+                    ring = self._rings.get(key)
+                    if ring is None:
+                        ring = self._rings[key] = DailyRing(self.days)
+                    ring.add(day, score)
+
+    def series(self, village: Optional[str] = None, days: int = 14) -> Dict[str, Any]:
+        """
+        Daily average sentiment, oldest day first
+
+        Args:
+            village: Village name, or None for all villages
+            days: Number of days ending today (UTC)
+
+        Returns:
+            Village and one {date, score, count} per day; score is None on
+            days without queries
+
+        Raises:
+            ValueError: If more days are asked for than are kept
+        """
+        if not 1 <= days <= self.days:
+            raise ValueError(f"days must be between 1 and {self.days}")
+
+        today = datetime.utcnow().date().toordinal()
+        with self._lock:
+            ring = self._rings.get(village or ALL_VILLAGES)
+            points = [
+                (day, *(ring.get(day) if ring is not None else (0.0, 0)))
+                for day in range(today - days + 1, today + 1)
+            ]
+
+        return {
+            "village": village,
+            "series": [
+                {
+                    "date": str(date.fromordinal(day)),
+                    "score": round(total / count, 3) if count else None,
+                    "count": count,
+                }
+                for day, total, count in points
+            ],
+        }
+
+    def warm(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Fill the rings from queries already stored within them
+
+        Queries stored before scoring existed are scored here, in memory.
+        Only rows created before the call are read. Queries committed while
+        the scan runs are held until it is done, then added unless the scan
+        already read them.
+
+        Returns:
+            Number of queries read
+        """
+        with self._lock:
+            self._warming = True
+        scanned: Set[int] = set()
+        try:
+            return self._replay(session_factory, batch_size, scanned)
+        finally:
+            while True:
+                with self._lock:
+                    held, self._held = self._held, []
+                    if not held:
+                        self._warming = False
+                        break
+                self._add([row for row in held if row.get("id") not in scanned])
+
+    def _replay(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int,
+        scanned: Set[int],
+    ) -> int:
+        """Add the stored queries of the ring's days, recording their IDs"""
+        until = datetime.utcnow()
+        since = datetime.combine(
+            until.date() - timedelta(days=self.days - 1), datetime.min.time()
+        )
+        statement = (
+            select(
+                Query.id,
+                Query.village,
+                Query.query_text,
+                Query.sentiment_score,
+                Query.created_at,
+            )
+            .where(Query.created_at >= since)
+            .where(Query.created_at < until)
+            .execution_options(yield_per=batch_size)
+        )
+        read = 0
+        db = session_factory()
+        try:
+            for rows in db.execute(statement).partitions():
+                items = [row._asdict() for row in rows]
+                for item in items:
+                    scanned.add(item["id"])
+                    if item["sentiment_score"] is None:
+                        item["sentiment_score"] = sentiment_scorer.score(item["query_text"])
+                self._add(items)
+                read += len(rows)
+        finally:
+            db.close()
+        return read
+
+    def start(self):
+        """Warm the rings from the database in a background thread"""
+        # Hold live queries from now on, not only once the thread runs
+        with self._lock:
+            self._warming = True
+
+        def run():
+            try:
+                logger.info(f"Sentiment series warmed with {self.warm()} recent queries")
+            except Exception as e:
+                logger.error(f"Sentiment series warm-up failed: {e}")
+
+        threading.Thread(target=run, name="sentiment-series-warm", daemon=True).start()
+
+
+# Singleton instance, fed by every committed query
+village_sentiment = SentimentSeries()
+events.subscribe(events.QUERIES_CREATED, village_sentiment.observe)
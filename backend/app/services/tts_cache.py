@@ -0,0 +1,193 @@
+"""
+Content-addressed cache for synthesized speech
+Audio is stored on local disk under sha256(voice, language, text) and evicted
+least-recently-used once the cache grows past TTS_CACHE_MAX_BYTES
+
+Pre-synthesize the canned responses at deploy time with:
+    python -m backend.app.services.tts_cache
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from loguru import logger
+
+from config.settings import TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES, SUPPORTED_LANGUAGES
+from nlu import response_table
+
+
+class TTSCache:
+    """Size-bounded LRU cache of audio files keyed by content hash"""
+
+    def __init__(
+        self, cache_dir: Path = TTS_CACHE_DIR, max_bytes: int = TTS_CACHE_MAX_BYTES
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        # content key -> (filename, size), least recently used first
+        self._index: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(text: str, language: str, voice: str) -> str:
+        """Content hash identifying one synthesized utterance"""
+        digest = hashlib.sha256()
+        for part in (voice, language, text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def _load_index(self):
+        """Rebuild the LRU order from file mtimes (hits touch the file)"""
+        files = []
+        for path in self.cache_dir.iterdir():
+            if path.is_file() and not path.name.startswith("."):
+                stat = path.stat()
+                files.append((stat.st_mtime, path.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._index[name.split(".", 1)[0]] = (name, size)
+            self.total_bytes += size
+        logger.info(
+            f"TTS cache: {len(self._index)} files, "
+            f"{self.total_bytes} bytes in {self.cache_dir}"
+        )
+
+    def path_for(self, filename: str) -> Path:
+        """Absolute path of a cached file"""
+        return self.cache_dir / filename
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up cached audio
+
+        Args:
+            key: Content hash from make_key
+
+        Returns:
+            Cached filename, or None on a miss
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            filename, size = entry
+            path = self.path_for(filename)
+            if not path.exists():
+                # Evicted by another worker sharing the directory
+                del self._index[key]
+                self.total_bytes -= size
+                return None
+            self._index.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return filename
+
+    def put(self, key: str, data: bytes, extension: str) -> str:
+        """
+        Store synthesized audio
+
+        Args:
+            key: Content hash from make_key
+            data: Audio bytes
+            extension: File extension without the dot (e.g. "mp3")
+
+        Returns:
+            Cached filename
+        """
+        filename = f"{key}.{extension}"
+        path = self.path_for(filename)
+        # Write under a unique temp name and rename so readers never see a
+        # partial file, even with several workers sharing the directory
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.cache_dir, prefix=f".{filename}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            if key in self._index:
+                self.total_bytes -= self._index.pop(key)[1]
+            self._index[key] = (filename, len(data))
+            self.total_bytes += len(data)
+            self._evict()
+        return filename
+
+    def _evict(self):
+        """Drop least recently used files until under the size budget"""
+        while self.total_bytes > self.max_bytes and len(self._index) > 1:
+            _, (filename, size) = self._index.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                self.path_for(filename).unlink()
+            except FileNotFoundError:
+                pass
+            logger.info(f"TTS cache evicted {filename}")
+
+    def stats(self) -> Tuple[int, int]:
+        """Number of cached files and their total size in bytes"""
+        with self._lock:
+            return len(self._index), self.total_bytes
+
+
+# Singleton instance
+tts_cache = TTSCache()
+
+
+async def warm_cache() -> int:
+    """
+    Pre-synthesize every category x language response
+
+    Responses quoting per-request slots (e.g. a complaint ID) are skipped,
+    since their audio is different for every caller.
+
+    Returns:
+        Number of responses now cached
+    """
+    # Imported here because ai_service depends on this module
+    from backend.app.services.ai_service import ai_service
+
+    count = 0
+    for language in (lang["code"] for lang in SUPPORTED_LANGUAGES):
+        for category in response_table.categories:
+            entry = response_table.lookup(category, language)
+            if entry.per_request:
+                continue
+            text = entry.text
+            result = await ai_service.text_to_speech(text, language)
+            if result.get("error"):
+                logger.error(
+                    f"Warm-up failed for {category}/{language}: {result['error']}"
+                )
+                continue
+            count += 1
+    files, size = tts_cache.stats()
+    logger.info(f"TTS cache warmed: {count} responses, {files} files, {size} bytes")
+    return count
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    # Use the package module so the cache is the same instance ai_service uses
+    from backend.app.services import tts_cache as cache_module
+
+    asyncio.run(cache_module.warm_cache())
@@ -0,0 +1,281 @@
+"""
+Village Pulse trending topics
+Every committed query is broken into (category, keyword, village) topics,
+the keywords being the intent keywords found in its text, and counted over
+sliding windows. Each window is a ring of time slices holding a Space-Saving
+summary (which topics are heavy) and a count-min sketch (to tighten their
+overestimated counts), so memory stays fixed however many queries arrive.
+Counts cover the queries written by this worker process
+"""
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config.settings import (
+    TRENDING_CAPACITY,
+    TRENDING_SKETCH_DEPTH,
+    TRENDING_SKETCH_WIDTH,
+)
+from backend.app.models import SessionLocal
+from backend.app.models.database import Query
+from backend.app.services import events
+from backend.app.utils.sketches import CountMinSketch, SpaceSaving
+from nlu import intent_engine
+
+# Window name -> (span in seconds, number of slices)
+WINDOWS = {"1h": (3600, 12), "24h": (86400, 24)}
+
+UNKNOWN_VILLAGE = "unknown"
+EPOCH = datetime(1970, 1, 1)
+
+Topic = Tuple[str, str, str]
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    """Seconds since the epoch of a naive UTC datetime"""
+    return ((value or datetime.utcnow()) - EPOCH).total_seconds()
+
+
+class _Slice:
+    """Counts of one time slice"""
+
+    __slots__ = ("epoch", "summary", "sketch")
+
+    def __init__(self, epoch: int, capacity: int, width: int, depth: int):
+        self.epoch = epoch
+        self.summary = SpaceSaving(capacity)
+        self.sketch = CountMinSketch(width, depth)
+
+
+class SlidingHeavyHitters:
+    """Heavy hitters over the last `span` seconds, in `slices` steps"""
+
+    def __init__(
+        self,
+        span: int,
+        slices: int,
+        capacity: int = TRENDING_CAPACITY,
+        width: int = TRENDING_SKETCH_WIDTH,
+        depth: int = TRENDING_SKETCH_DEPTH,
+    ):
+        self.slice_seconds = span / slices
+        self.slices = slices
+        self.capacity = capacity
+        self.width = width
+        self.depth = depth
+        self._ring: List[Optional[_Slice]] = [None] * slices
+
+    def add(self, topic: Topic, timestamp: float, count: int = 1):
+        """Count a topic at a time; times older than the window are ignored"""
+        epoch = int(timestamp // self.slice_seconds)
+        position = epoch % self.slices
+        current = self._ring[position]
+        if current is None or current.epoch < epoch:
+            current = _Slice(epoch, self.capacity, self.width, self.depth)
+            self._ring[position] = current
+        elif current.epoch > epoch:
+            return
+        current.summary.add(topic, count)
+        current.sketch.add("\x1f".join(topic), count)
+
+    def top(
+        self,
+        now: float,
+        limit: int,
+        predicate: Optional[Callable[[Topic], bool]] = None,
+    ) -> Tuple[List[Tuple[Topic, int, int]], int]:
+        """
+        Heaviest topics of the window ending at `now`
+
+        Returns:
+            (topic, count, max_error) largest first, and the total count
+        """
+        oldest = int(now // self.slice_seconds) - self.slices + 1
+        live = [item for item in self._ring if item is not None and item.epoch >= oldest]
+
+        merged = SpaceSaving(self.capacity)
+        for item in live:
+            merged.merge(item.summary)
+
+        results = []
+        for topic, count, error in merged.top():
+            if predicate is not None and not predicate(topic):
+                continue
+            # Both structures only overcount, so the smaller count is closer
+            key = "\x1f".join(topic)
+            sketched = sum(item.sketch.estimate(key) for item in live)
+            best = min(count, sketched)
+            results.append((topic, best, min(error, best)))
+        results.sort(key=lambda result: result[1], reverse=True)
+        return results[:limit], merged.total
+
+
+class TrendingTopics:
+    """Trending (category, keyword, village) topics over sliding windows"""
+
+    def __init__(self, windows: Dict[str, Tuple[int, int]] = WINDOWS):
+        self.windows = {
+            name: SlidingHeavyHitters(span, slices)
+            for name, (span, slices) in windows.items()
+        }
+        self._lock = threading.Lock()
+        # Queries committed while warming, counted once the scan is done
+        self._warming = False
+        self._held: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def topics(row: Dict[str, Any]) -> List[Topic]:
+        """Topics of one query row: each intent keyword found in its text"""
+        village = (row.get("village") or "").strip() or UNKNOWN_VILLAGE
+        matches = intent_engine.classify(row.get("query_text") or "").matches
+        return sorted({(match.label, match.keyword, village) for match in matches})
+
+    def observe(self, rows: List[Dict[str, Any]]):
+        """Event listener: count the topics of newly created queries"""
+        with self._lock:
+            if self._warming:
+                self._held.extend(rows)
+                return
+        self._count(rows)
+
+    def _count(self, rows: List[Dict[str, Any]]):
+        counted = [
+            (topic, _timestamp(row.get("created_at")))
+            for row in rows
+            for topic in self.topics(row)
+        ]
+        with self._lock:
+            for window in self.windows.values():
+                for topic, timestamp in counted:
+                    window.add(topic, timestamp)
+
+    def trending(
+        self,
+        window: str = "24h",
+        limit: int = 10,
+        village: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Most frequent topics of a window
+
+        Filters apply to the tracked heavy hitters, so a village's own topics
+        show up once they are among the TRENDING_CAPACITY heaviest overall.
+
+        Args:
+            window: Window name (see WINDOWS)
+            limit: Maximum number of topics
+            village: Only this village, if given
+            category: Only this category, if given
+
+        Returns:
+            Window name, total topic count and the topics, most frequent first
+
+        Raises:
+            ValueError: If the window is unknown
+        """
+        if window not in self.windows:
+            raise ValueError(
+                f"Unknown window: {window} (expected one of {', '.join(self.windows)})"
+            )
+
+        def predicate(topic: Topic) -> bool:
+            return (category is None or topic[0] == category) and (
+                village is None or topic[2] == village
+            )
+
+        with self._lock:
+            top, total = self.windows[window].top(_timestamp(None), limit, predicate)
+
+        return {
+            "window": window,
+            "total": total,
+            "topics": [
+                {
+                    "category": topic[0],
+                    "keyword": topic[1],
+                    "village": topic[2],
+                    "count": count,
+                    "max_error": error,
+                }
+                for topic, count, error in top
+            ],
+        }
+
+    def warm(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Count queries already stored within the longest window
+
+        Only rows created before the call are read. Queries committed while
+        the scan runs are held until it is done, then counted unless the scan
+        already read them.
+
+        Returns:
+            Number of queries read
+        """
+        with self._lock:
+            self._warming = True
+        scanned: Set[int] = set()
+        try:
+            return self._replay(session_factory, batch_size, scanned)
+        finally:
+            while True:
+                with self._lock:
+                    held, self._held = self._held, []
+                    if not held:
+                        self._warming = False
+                        break
+                self._count([row for row in held if row.get("id") not in scanned])
+
+    def _replay(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int,
+        scanned: Set[int],
+    ) -> int:
+        """Count the stored queries of the longest window, recording their IDs"""
+        until = datetime.utcnow()
+        span = max(window.slice_seconds * window.slices for window in self.windows.values())
+        statement = (
+            select(Query.id, Query.query_text, Query.village, Query.created_at)
+            .where(Query.created_at >= until - timedelta(seconds=span))
+            .where(Query.created_at < until)
+            .execution_options(yield_per=batch_size)
+        )
+        read = 0
+        db = session_factory()
+        try:
+            for rows in db.execute(statement).partitions():
+                scanned.update(row.id for row in rows)
+                self._count([row._asdict() for row in rows])
+                read += len(rows)
+        finally:
+            db.close()
+        return read
+
+    def start(self):
+        """Warm the windows from the database in a background thread"""
+        # Hold live queries from now on, not only once the thread runs
+        with self._lock:
+            self._warming = True
+
+        def run():
+            try:
+                logger.info(f"Village Pulse warmed with {self.warm()} recent queries")
+            except Exception as e:
+                logger.error(f"Village Pulse warm-up failed: {e}")
+
+        threading.Thread(target=run, name="village-pulse-warm", daemon=True).start()
+
+
+# Singleton instance, fed by every committed query
+village_pulse = TrendingTopics()
+events.subscribe(events.QUERIES_CREATED, village_pulse.observe)
@@ -0,0 +1,312 @@
+"""
+Write-behind persistence for query records
+Rows are journaled locally and buffered in memory, then written with one
+bulk INSERT when the buffer reaches WRITE_BEHIND_MAX_ROWS or every
+WRITE_BEHIND_FLUSH_INTERVAL seconds. Journal segments are deleted only after
+their rows are committed, and are replayed on start-up after a crash.
+
+Durability: every appended row is written to the journal before append
+returns, so a crashed process loses nothing. The journal is fsynced when it is
+rotated for a flush (and on stop), so an OS crash or power loss can only lose
+rows appended since the last flush started, i.e. at most
+WRITE_BEHIND_FLUSH_INTERVAL seconds or WRITE_BEHIND_MAX_ROWS rows
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from loguru import logger
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config.settings import (
+    QUERY_WRITE_BEHIND,
+    WRITE_BEHIND_MAX_ROWS,
+    WRITE_BEHIND_FLUSH_INTERVAL,
+    WRITE_BEHIND_JOURNAL_DIR,
+)
+from backend.app.models import SessionLocal
+from backend.app.models.database import Query
+from backend.app.services import events, rollups
+
+DATETIME_FIELDS = ("created_at", "updated_at")
+
+
+def _encode(row: Dict[str, Any]) -> str:
+    """One journal line for a row"""
+    return json.dumps(
+        {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in row.items()
+        },
+        ensure_ascii=False,
+    )
+
+
+def _owner_alive(path: Path) -> bool:
+    """Whether the process that wrote a journal file is still running"""
+    try:
+        pid = int(path.name.split("-", 1)[1].split(".", 1)[0])
+    except (IndexError, ValueError):
+        return False
+    if pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _decode(line: str) -> Dict[str, Any]:
+    """Row from a journal line"""
+    row = json.loads(line)
+    for key in DATETIME_FIELDS:
+        if row.get(key):
+            row[key] = datetime.fromisoformat(row[key])
+    return row
+
+
+class QueryWriteBuffer:
+    """Journaled in-memory buffer flushed to the queries table in bulk"""
+
+    def __init__(
+        self,
+        journal_dir: Path = WRITE_BEHIND_JOURNAL_DIR,
+        max_rows: int = WRITE_BEHIND_MAX_ROWS,
+        flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.journal_dir = Path(journal_dir)
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+        self._rows: List[Dict[str, Any]] = []
+        # Rotated journal segments whose rows are not committed yet
+        self._pending: List[Tuple[Path, List[Dict[str, Any]]]] = []
+        self._segment = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._journal = None
+
+    @property
+    def active_journal_path(self) -> Path:
+        return self.journal_dir / f"queries-{os.getpid()}.jsonl"
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flusher is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _open_journal(self):
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self._journal = open(self.active_journal_path, "a", encoding="utf-8")
+
+    def _sync_journal(self):
+        """Force the journal to disk"""
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def start(self):
+        """Replay leftover journals, then start the background flusher"""
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self.replay()
+        with self._lock:
+            if self._journal is None:
+                self._open_journal()
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="query-write-behind", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Query write-behind enabled (max {self.max_rows} rows, "
+            f"every {self.flush_interval}s)"
+        )
+
+    def stop(self):
+        """Flush everything and stop the background flusher"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+        self.flush()
+        with self._lock:
+            if self._journal:
+                self._sync_journal()
+                self._journal.close()
+                self._journal = None
+                if not self._rows and not self._pending:
+                    self.active_journal_path.unlink(missing_ok=True)
+
+    def append(self, row: Dict[str, Any]):
+        """
+        Journal and buffer one row
+
+        The journal is opened on first use, so rows appended before start()
+        are kept too; they are written by the next flush.
+
+        Args:
+            row: Column values for a Query, including its pre-allocated id
+        """
+        with self._lock:
+            if self._journal is None:
+                self._open_journal()
+            self._journal.write(_encode(row) + "\n")
+            self._journal.flush()
+            self._rows.append(row)
+            full = len(self._rows) >= self.max_rows
+        if full:
+            self._wakeup.set()
+
+    def _run(self):
+        """Flush on the size trigger or the time interval"""
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Write-behind flush failed, will retry: {e}")
+
+    def _rotate(self):
+        """Move buffered rows and their journal segment to the pending list"""
+        with self._lock:
+            if not self._rows:
+                return
+            self._sync_journal()
+            self._journal.close()
+            self._segment += 1
+            segment = self.journal_dir / (
+                f"queries-{os.getpid()}.{self._segment}.flushing.jsonl"
+            )
+            os.replace(self.active_journal_path, segment)
+            self._journal = open(self.active_journal_path, "a", encoding="utf-8")
+            self._pending.append((segment, self._rows))
+            self._rows = []
+
+    def flush(self) -> int:
+        """
+        Bulk insert every buffered row
+
+        Returns:
+            Number of rows written
+        """
+        with self._flush_lock:
+            self._rotate()
+            if not self._pending:
+                return 0
+
+            rows = [row for _, batch in self._pending for row in batch]
+            db = self.session_factory()
+            try:
+                db.execute(Query.__table__.insert(), rows)
+                self._record_rollups(db, rows)
+                db.commit()
+            except IntegrityError:
+                # Part of an earlier attempt was committed after all
+                db.rollback()
+                self._insert_missing(db, rows)
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+            for segment, _ in self._pending:
+                segment.unlink(missing_ok=True)
+            self._pending = []
+            logger.info(f"Write-behind flushed {len(rows)} queries")
+            # The rows only become visible to readers now
+            events.publish(events.QUERIES_CREATED, rows)
+            return len(rows)
+
+    def replay(self) -> int:
+        """
+        Insert rows left in journals by a previous (crashed) process
+
+        Returns:
+            Number of rows recovered
+        """
+        # Journals of live workers are theirs to flush, and so are the ones
+        # this buffer still has rows for
+        with self._lock:
+            in_use = {segment for segment, _ in self._pending}
+            if self._journal is not None:
+                in_use.add(self.active_journal_path)
+        files = [
+            path
+            for path in sorted(self.journal_dir.glob("queries-*.jsonl"))
+            if path not in in_use and not _owner_alive(path)
+        ]
+        if not files:
+            return 0
+
+        rows: Dict[int, Dict[str, Any]] = {}
+        for path in files:
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        row = _decode(line)
+                    except ValueError:
+                        # Torn final line from a crash mid-write
+                        continue
+                    rows[row["id"]] = row
+
+        db = self.session_factory()
+        try:
+            recovered = self._insert_missing(db, list(rows.values()))
+        except IntegrityError:
+            # Another worker starting at the same time replayed them first
+            db.rollback()
+            logger.info("Write-behind journal already replayed by another worker")
+            return 0
+        finally:
+            db.close()
+
+        for path in files:
+            path.unlink(missing_ok=True)
+        logger.info(f"Replayed {recovered} queries from write-behind journal")
+        return recovered
+
+    @staticmethod
+    def _record_rollups(db: Session, rows: List[Dict[str, Any]]):
+        """Count inserted rows in the dashboard rollups (same transaction)"""
+        rollups.record(
+            db,
+            rollups.METRIC_QUERIES,
+            ((row["created_at"], row["service_category"]) for row in rows),
+        )
+
+    @staticmethod
+    def _insert_missing(db: Session, rows: List[Dict[str, Any]]) -> int:
+        """Insert the rows whose IDs are not in the table yet"""
+        try:
+            ids = [row["id"] for row in rows]
+            existing = set()
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                existing.update(
+                    id_ for (id_,) in db.query(Query.id).filter(Query.id.in_(chunk))
+                )
+            missing = [row for row in rows if row["id"] not in existing]
+            if missing:
+                db.execute(Query.__table__.insert(), missing)
+                QueryWriteBuffer._record_rollups(db, missing)
+            db.commit()
+            return len(missing)
+        except Exception:
+            db.rollback()
+            raise
+
+
+# Shared buffer; None unless QUERY_WRITE_BEHIND is enabled
+query_write_buffer = QueryWriteBuffer() if QUERY_WRITE_BEHIND else None
@@ -0,0 +1,66 @@
+"""
+Helpers for reading audio uploads in chunks
+Uploads are consumed incrementally and spooled to a temp file once they grow
+past AUDIO_SPOOL_MAX_MEMORY, so long recordings never sit fully in memory
+"""
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterator, BinaryIO
+
+from fastapi import UploadFile
+from fastapi.responses import StreamingResponse
+
+from config.settings import AUDIO_CHUNK_SIZE, AUDIO_SPOOL_MAX_MEMORY
+
+
+def new_spool() -> SpooledTemporaryFile:
+    """Temp file that stays in memory up to AUDIO_SPOOL_MAX_MEMORY bytes"""
+    return SpooledTemporaryFile(max_size=AUDIO_SPOOL_MAX_MEMORY)
+
+
+async def iter_upload(
+    upload: UploadFile, chunk_size: int = AUDIO_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Yield a multipart upload chunk by chunk"""
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def iter_file(
+    fileobj: BinaryIO, chunk_size: int = AUDIO_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Yield a (spooled) file from the start, chunk by chunk"""
+    fileobj.seek(0)
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def spool_chunks(chunks: AsyncIterator[bytes]) -> SpooledTemporaryFile:
+    """Copy a chunk stream into a new spool, rewound for reading"""
+    spool = new_spool()
+    async for chunk in chunks:
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body may keep reading the request body
+
+    On servers older than ASGI 2.4 StreamingResponse polls receive() for a
+    disconnect while streaming, which swallows the request body messages a
+    generator over request.stream() is waiting for. Here the generator owns
+    receive(); a client that goes away surfaces as ClientDisconnect from the
+    request stream instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,26 @@
+"""
+Bounded thread pool for blocking database work
+Shared by every request on this worker, so blocking SQLAlchemy calls never
+run on the event loop and cannot pile up an unlimited number of threads
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from config.settings import DB_EXECUTOR_WORKERS
+
+db_executor = ThreadPoolExecutor(
+    max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="gramavoice-db"
+)
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking callable on the DB thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, partial(func, *args, **kwargs))
+
+
+def shutdown_executor():
+    """Wait for in-flight DB work and stop the thread pool"""
+    db_executor.shutdown(wait=True)
@@ -0,0 +1,140 @@
+"""
+Serving immutable, content-addressed files over HTTP
+Files are memory-mapped and streamed straight from the page cache, with
+support for Range requests (resumable downloads) and ETag revalidation
+"""
+import mmap
+import os
+from pathlib import Path
+from typing import Iterator, Mapping, Optional, Tuple
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+from config.settings import AUDIO_CHUNK_SIZE
+
+# Content-addressed files never change, so clients may keep them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+MEDIA_TYPES = {
+    ".wav": "audio/wav",
+    ".mp3": "audio/mpeg",
+    ".ogg": "audio/ogg",
+}
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header does not overlap the file"""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range "bytes=" Range header
+
+    Args:
+        header: Range header value
+        size: File size in bytes
+
+    Returns:
+        Inclusive (start, end) byte positions, or None to serve the whole
+        file (no header, unsupported unit or multiple ranges)
+
+    Raises:
+        RangeNotSatisfiable: If the range lies outside the file
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first == "":
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable(header)
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or end < start:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against the file's ETag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _iter_mapped(path: Path, start: int, end: int) -> Iterator[bytes]:
+    """Yield [start, end] of a memory-mapped file in chunks"""
+    with open(path, "rb") as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position = start
+            while position <= end:
+                stop = min(position + AUDIO_CHUNK_SIZE, end + 1)
+                yield mapped[position:stop]
+                position = stop
+
+
+def serve_immutable_file(
+    path: Path, etag: str, headers: Mapping[str, str], method: str = "GET"
+) -> Response:
+    """
+    Build the response for a content-addressed file
+
+    Args:
+        path: File on disk
+        etag: Quoted strong ETag for the content
+        headers: Request headers
+        method: GET or HEAD
+
+    Returns:
+        200, 206, 304 or 416 response
+    """
+    size = os.path.getsize(path)
+    base_headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    media_type = MEDIA_TYPES.get(path.suffix, "application/octet-stream")
+
+    if etag_matches(headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=base_headers)
+
+    range_header = headers.get("range")
+    if_range = headers.get("if-range")
+    if if_range and if_range != etag:
+        # The client's partial copy is of something else; send it all
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        base_headers["Content-Range"] = f"bytes */{size}"
+        return Response(status_code=416, headers=base_headers)
+
+    if byte_range is None:
+        status_code, (start, end) = 200, (0, size - 1)
+    else:
+        status_code, (start, end) = 206, byte_range
+        base_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    base_headers["Content-Length"] = str(end - start + 1)
+
+    if method == "HEAD" or size == 0:
+        return Response(
+            status_code=status_code, headers=base_headers, media_type=media_type
+        )
+
+    return StreamingResponse(
+        _iter_mapped(path, start, end),
+        status_code=status_code,
+        headers=base_headers,
+        media_type=media_type,
+    )
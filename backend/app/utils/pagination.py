@@ -0,0 +1,31 @@
+"""
+Opaque cursors for keyset pagination
+A cursor encodes the (created_at, id) of the last row a client has seen, so
+the next page starts right after it without OFFSET scans
+"""
+import base64
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Cursor pointing just past a row"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor from encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, _, row_id = (
+            base64.urlsafe_b64decode(padded).decode("ascii").partition("|")
+        )
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
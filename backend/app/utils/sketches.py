@@ -0,0 +1,243 @@
+"""
+Probabilistic sketches over text and event streams
+MinHash signatures estimate the Jaccard similarity of two shingle sets from
+fixed-size signatures, so near-duplicate texts can be found without keeping
+or comparing the texts themselves. Count-min and Space-Saving summarize
+unbounded streams of keys in constant memory, and HyperLogLog counts their
+distinct values
+"""
+import hashlib
+import heapq
+import math
+import random
+import zlib
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from backend.app.utils.text import search_terms
+
+# Hashes are taken modulo a Mersenne prime and truncated to 32 bits
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def stable_hash(value: str) -> int:
+    """32-bit hash that, unlike hash(), is the same in every process"""
+    return int.from_bytes(
+        hashlib.blake2b(value.encode("utf-8"), digest_size=4).digest(), "little"
+    )
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """
+    Character shingles of normalized text
+
+    Character n-grams tolerate the spelling variation of transcribed speech
+    and work for any script.
+
+    Args:
+        text: Text to shingle
+        size: Characters per shingle
+
+    Returns:
+        Set of shingles (the whole text when it is shorter than size)
+    """
+    normalized = " ".join(search_terms(text or ""))
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+
+
+class MinHash:
+    """MinHash signatures from a fixed family of hash permutations"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        """
+        Args:
+            num_perm: Signature length; the similarity error is about 1/sqrt(num_perm)
+            seed: Seed of the permutations; signatures are only comparable
+                between instances with the same num_perm and seed
+        """
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, items: Iterable[str]) -> List[int]:
+        """Signature of a set of strings"""
+        hashes = [stable_hash(item) for item in set(items)]
+        if not hashes:
+            return [MAX_HASH] * self.num_perm
+        return [
+            min(((a * value + b) % MERSENNE_PRIME) & MAX_HASH for value in hashes)
+            for a, b in self.permutations
+        ]
+
+    @staticmethod
+    def similarity(first: List[int], second: List[int]) -> float:
+        """Estimated Jaccard similarity of the sets behind two signatures"""
+        if not first or len(first) != len(second):
+            return 0.0
+        return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+class CountMinSketch:
+    """
+    Frequency estimates for any key in width x depth counters
+
+    Estimates never undercount; they overcount by at most 2N/width with
+    probability 1 - 2^-depth, N being the total count added.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._rows = [array("q", bytes(8 * width)) for _ in range(depth)]
+
+    def _indexes(self, key: str) -> List[int]:
+        # Row hashes derived from one 64-bit hash (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        first = int.from_bytes(digest[:4], "little")
+        second = int.from_bytes(digest[4:], "little") | 1
+        return [(first + row * second) % self.width for row in range(self.depth)]
+
+    def add(self, key: str, count: int = 1):
+        self.total += count
+        for row, index in zip(self._rows, self._indexes(key)):
+            row[index] += count
+
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+
+class SpaceSaving:
+    """
+    Top-k heavy hitters of a stream in `capacity` counters
+
+    Every key occurring more than N/capacity times is kept. Counts overestimate
+    by at most the key's recorded error (the count of the key it replaced).
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        # (count, key) with one entry per monitored key; entries go stale as
+        # counts grow and are refreshed lazily when looking for the minimum
+        self._heap: List[Tuple[int, Hashable]] = []
+
+    def add(self, key: Hashable, count: int = 1):
+        self.total += count
+        if key in self._counts:
+            self._counts[key] += count
+            return
+        if len(self._counts) < self.capacity:
+            self._counts[key] = count
+            self._errors[key] = 0
+            heapq.heappush(self._heap, (count, key))
+            return
+
+        # Replace the key with the smallest count, inheriting it as error
+        while True:
+            smallest, evicted = self._heap[0]
+            current = self._counts[evicted]
+            if current == smallest:
+                break
+            heapq.heapreplace(self._heap, (current, evicted))
+        del self._counts[evicted]
+        del self._errors[evicted]
+        self._counts[key] = smallest + count
+        self._errors[key] = smallest
+        heapq.heapreplace(self._heap, (smallest + count, key))
+
+    def top(self, limit: int = None) -> List[Tuple[Hashable, int, int]]:
+        """(key, count, error) for the heaviest keys, largest count first"""
+        items = sorted(
+            ((key, count, self._errors[key]) for key, count in self._counts.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        return items[:limit] if limit is not None else items
+
+    def merge(self, other: "SpaceSaving"):
+        """Fold another summary into this one, keeping the heaviest keys"""
+        counts = dict(self._counts)
+        errors = dict(self._errors)
+        for key, count in other._counts.items():
+            counts[key] = counts.get(key, 0) + count
+            errors[key] = errors.get(key, 0) + other._errors[key]
+        kept = sorted(counts, key=counts.__getitem__, reverse=True)[: self.capacity]
+        self.total += other.total
+        self._counts = {key: counts[key] for key in kept}
+        self._errors = {key: errors[key] for key in kept}
+        self._heap = [(count, key) for key, count in self._counts.items()]
+        heapq.heapify(self._heap)
+
+
+class HyperLogLog:
+    """
+    Distinct-value estimates in 2^p one-byte registers
+
+    The standard error is 1.04 / sqrt(2^p): about 0.8% at the default p=14,
+    which takes 16 KiB. Sketches with the same p merge losslessly, so daily
+    sketches can be combined into any date range.
+    """
+
+    def __init__(self, p: int = 14, registers: Optional[np.ndarray] = None):
+        self.p = p
+        self.m = 1 << p
+        self.registers = (
+            registers if registers is not None else np.zeros(self.m, dtype=np.uint8)
+        )
+
+    def add(self, value: str):
+        """Count a value (repeats do not change the estimate)"""
+        hashed = int.from_bytes(
+            hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little"
+        )
+        index = hashed >> (64 - self.p)
+        rest = hashed & ((1 << (64 - self.p)) - 1)
+        # Position of the leftmost 1 bit in the remaining 64 - p bits
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        """Add another sketch's values into this one"""
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    @classmethod
+    def union(cls, sketches: Iterable["HyperLogLog"], p: int = 14) -> "HyperLogLog":
+        """New sketch counting the values of all the given sketches"""
+        merged = cls(p)
+        for sketch in sketches:
+            merged.merge(sketch)
+        return merged
+
+    def count(self) -> int:
+        """Estimated number of distinct values added"""
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / float(np.exp2(-self.registers.astype(np.float64)).sum())
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * self.m and zeros:
+            # Linear counting is more accurate while many registers are empty
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        """Compressed registers; sparse sketches shrink to a few hundred bytes"""
+        return zlib.compress(self.registers.tobytes(), 6)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        """Sketch from to_bytes() output (the precision follows from its size)"""
+        registers = np.frombuffer(zlib.decompress(data), dtype=np.uint8).copy()
+        return cls(int(registers.size).bit_length() - 1, registers)
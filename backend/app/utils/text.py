@@ -0,0 +1,17 @@
+"""
+Word splitting shared by search and text sketches
+Words are split on whitespace and punctuation only, so Devanagari, Bengali
+and Telugu words keep their vowel signs and viramas instead of being cut
+apart at them
+"""
+import re
+from typing import List
+
+# ASCII punctuation, dandas, general punctuation except ZWNJ/ZWJ. Also used
+# as a Postgres regex when building the full-text search lexemes
+SEPARATOR_PATTERN = r"[\s!-/:-@\[-`{-~\u0964\u0965\u2000-\u200b\u200e-\u206f]+"
+
+
+def search_terms(text: str) -> List[str]:
+    """Lowercased words of a text"""
+    return [term for term in re.split(SEPARATOR_PATTERN, text.lower()) if term]
@@ -0,0 +1,71 @@
+"""
+Village Pulse trending memory benchmark
+Feeds a skewed stream of (category, keyword, village) topics spread over
+several days into the sliding heavy-hitter windows and reports traced memory
+and throughput as the volume grows; memory levels off once the first day
+has filled every slice
+
+Usage:
+    python benchmarks/trending_memory.py
+    python benchmarks/trending_memory.py --topics 5000000 --villages 20000
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from backend.app.services.village_pulse import WINDOWS, SlidingHeavyHitters
+
+CATEGORIES = ["pension", "ration", "electricity", "water", "pmkisan", "general"]
+KEYWORDS = ["पेंशन", "राशन", "बिजली", "पानी", "किसान", "सड़क", "हैंडपंप", "ट्रांसफार्मर"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--topics", type=int, default=1000000)
+    parser.add_argument("--villages", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=3, help="Time span of the stream")
+    parser.add_argument("--checkpoints", type=int, default=6)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    villages = [f"village_{index}" for index in range(args.villages)]
+    span = 86400 * args.days
+    start = time.time() - span
+
+    tracemalloc.start()
+    windows = [SlidingHeavyHitters(length, slices) for length, slices in WINDOWS.values()]
+    step = args.topics // args.checkpoints
+
+    print(f"{'topics':>10} {'memory MB':>10} {'topics/s':>10}")
+    started = time.perf_counter()
+    for index in range(args.topics):
+        # Zipf-like skew: a few villages and keywords dominate
+        topic = (
+            rng.choice(CATEGORIES),
+            KEYWORDS[min(int(rng.paretovariate(1.2)) - 1, len(KEYWORDS) - 1)],
+            villages[min(int(rng.paretovariate(0.8)) - 1, len(villages) - 1)],
+        )
+        timestamp = start + span * index / args.topics
+        for window in windows:
+            window.add(topic, timestamp)
+
+        if (index + 1) % step == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            rate = (index + 1) / (time.perf_counter() - started)
+            print(f"{index + 1:>10} {current / 1e6:>10.1f} {rate:>10.0f}")
+
+    top, total = windows[-1].top(start + span, 5)
+    print(f"top of {total} in the last 24h:")
+    for topic, count, error in top:
+        print(f"  {count:>8} (+/-{error}) {' / '.join(topic)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,9 +9,107 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", 8000))
 API_RELOAD = os.getenv("API_RELOAD", "true").lower() == "true"
+ANALYZE_BATCH_MAX_SIZE = int(os.getenv("ANALYZE_BATCH_MAX_SIZE", 500))
+HISTORY_MAX_PAGE_SIZE = int(os.getenv("HISTORY_MAX_PAGE_SIZE", 200))
+HISTORY_STREAM_BATCH_SIZE = int(os.getenv("HISTORY_STREAM_BATCH_SIZE", 500))
 
 # Database Configuration
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR}/gramavoice.db")
+# Used by the async endpoints; derived from DATABASE_URL when empty
+# (sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "")
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", 8))
+ID_BLOCK_SIZE = int(os.getenv("ID_BLOCK_SIZE", 100))  # IDs reserved per round trip
+# Complaint numbers are shown to citizens, so keep gaps from unused blocks small
+COMPLAINT_ID_BLOCK_SIZE = int(os.getenv("COMPLAINT_ID_BLOCK_SIZE", 20))
+
+# Connection pool (server databases such as Postgres)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # seconds to wait for a connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds before reconnecting
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# SQLite connection pragmas
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", 65536))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 268435456))  # bytes
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+
+# Dashboard rollups: the compactor re-derives the most recent days from the
+# raw tables to pick up status changes made outside the API
+ROLLUP_COMPACT_INTERVAL = int(os.getenv("ROLLUP_COMPACT_INTERVAL", 900))  # seconds
+ROLLUP_COMPACT_DAYS = int(os.getenv("ROLLUP_COMPACT_DAYS", 30))
+
+# Dashboard response cache ("memory" per worker, or "redis" shared via REDIS_URL)
+DASHBOARD_CACHE_BACKEND = os.getenv("DASHBOARD_CACHE_BACKEND", "memory")
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", 30))  # seconds fresh
+DASHBOARD_CACHE_STALE_TTL = float(
+    os.getenv("DASHBOARD_CACHE_STALE_TTL", 300)
+)  # seconds a stale entry may still be served while refreshing
+DASHBOARD_CACHE_MAX_ENTRIES = int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", 64))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Near-duplicate complaint clustering: a new complaint joins an existing
+# cluster of the same category and location seen within the window when
+# their estimated text similarity reaches the threshold
+COMPLAINT_CLUSTERING = os.getenv("COMPLAINT_CLUSTERING", "true").lower() == "true"
+COMPLAINT_CLUSTER_WINDOW = int(os.getenv("COMPLAINT_CLUSTER_WINDOW", 6 * 3600))  # seconds
+COMPLAINT_CLUSTER_SIMILARITY = float(os.getenv("COMPLAINT_CLUSTER_SIMILARITY", 0.4))
+
+# Village Pulse trending topics (per-worker sketches; memory is fixed by
+# these sizes whatever the query volume)
+TRENDING_CAPACITY = int(os.getenv("TRENDING_CAPACITY", 500))  # topics tracked per slice
+TRENDING_SKETCH_WIDTH = int(os.getenv("TRENDING_SKETCH_WIDTH", 2048))
+TRENDING_SKETCH_DEPTH = int(os.getenv("TRENDING_SKETCH_DEPTH", 4))
+
+# Village Pulse sentiment: days of daily averages kept per village
+SENTIMENT_SERIES_DAYS = int(os.getenv("SENTIMENT_SERIES_DAYS", 30))
+
+# Complaint spike alerts: complaints are counted per (village, category) in
+# buckets of ALERT_BUCKET_SECONDS; a bucket ALERT_THRESHOLD standard deviations
+# above the EWMA of earlier buckets raises an alert
+ALERT_BUCKET_SECONDS = float(os.getenv("ALERT_BUCKET_SECONDS", 300))
+ALERT_EWMA_ALPHA = float(os.getenv("ALERT_EWMA_ALPHA", 0.1))
+ALERT_THRESHOLD = float(os.getenv("ALERT_THRESHOLD", 3.0))
+ALERT_MIN_COUNT = int(os.getenv("ALERT_MIN_COUNT", 3))
+ALERT_HISTORY_SIZE = int(os.getenv("ALERT_HISTORY_SIZE", 200))
+ALERT_STREAM_KEEPALIVE = float(os.getenv("ALERT_STREAM_KEEPALIVE", 15))
+
+# Active-user sketches: seconds between writes of this worker's HyperLogLog
+# updates to the database
+ACTIVE_USERS_FLUSH_INTERVAL = float(os.getenv("ACTIVE_USERS_FLUSH_INTERVAL", 30))
+
+# Write-behind for query records (rows are journaled, then bulk inserted)
+QUERY_WRITE_BEHIND = os.getenv("QUERY_WRITE_BEHIND", "false").lower() == "true"
+WRITE_BEHIND_MAX_ROWS = int(os.getenv("WRITE_BEHIND_MAX_ROWS", 500))
+WRITE_BEHIND_FLUSH_INTERVAL = float(
+    os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", 1.0)
+)  # in seconds
+WRITE_BEHIND_JOURNAL_DIR = Path(
+    os.getenv("WRITE_BEHIND_JOURNAL_DIR", BASE_DIR / "journal")
+)
+
+# Audio Upload Configuration
+AUDIO_CHUNK_SIZE = int(os.getenv("AUDIO_CHUNK_SIZE", 64 * 1024))  # in bytes
+AUDIO_SPOOL_MAX_MEMORY = int(
+    os.getenv("AUDIO_SPOOL_MAX_MEMORY", 1024 * 1024)
+)  # in bytes, larger uploads spill to a temp file
+
+# Text-to-Speech Cache
+TTS_VOICE = os.getenv("TTS_VOICE", "standard")
+TTS_CACHE_DIR = Path(os.getenv("TTS_CACHE_DIR", BASE_DIR / "cache" / "tts"))
+TTS_CACHE_MAX_BYTES = int(
+    os.getenv("TTS_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+)  # in bytes, least recently used files are evicted beyond this
+AUDIO_URL_PREFIX = "/api/audio"
+
+# Async Job Configuration
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 4))
+JOB_QUEUE_MAX_DEPTH = int(os.getenv("JOB_QUEUE_MAX_DEPTH", 100))
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", 3600))  # in seconds
+JOB_CALLBACK_TIMEOUT = float(os.getenv("JOB_CALLBACK_TIMEOUT", 10))  # in seconds
 
 # AI Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "demo-key")
@@ -78,6 +176,42 @@ SERVICE_CATEGORIES = [
     },
 ]
 
+# Intent Keywords
+# Checked in priority order: when a query mentions several services, the
+# earliest rule that has a keyword hit decides the category.
+INTENT_RULES = [
+    {
+        "category": "pension",
+        "intent": "check_status",
+        "keywords": ["पेंशन", "pension", "পেনশন", "పెన్షన్"],
+    },
+    {
+        "category": "ration",
+        "intent": "information",
+        "keywords": ["राशन", "ration", "রেশন", "రేషన్"],
+    },
+    {
+        "category": "electricity",
+        "intent": "complaint",
+        "keywords": ["बिजली", "electricity", "বিদ্যুত", "విద్యుత్"],
+    },
+    {
+        "category": "pmkisan",
+        "intent": "check_status",
+        "keywords": ["किसान", "kisan", "farmer", "কৃষক", "రైతు"],
+    },
+    {
+        "category": "water",
+        "intent": "complaint",
+        "keywords": ["पानी", "water", "জল", "నీరు", "paani"],
+    },
+    {
+        "category": "health",
+        "intent": "information",
+        "keywords": ["स्वास्थ्य", "health", "স্বাস্থ্য", "ఆరోగ్యం", "शिविर", "camp"],
+    },
+]
+
 # Logging Configuration
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_FILE = os.getenv("LOG_FILE", "gramavoice.log")
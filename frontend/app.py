@@ -23,6 +23,7 @@ from config.settings import (
     SUPPORTED_LANGUAGES,
     SERVICE_CATEGORIES,
 )
+from nlu import intent_engine, get_response
 
 # Page configuration
 st.set_page_config(
@@ -275,6 +276,18 @@ def get_history_data(user_id="demo_user_001", limit=50):
     return history
 
 
+# Display names for the categories returned by the shared intent engine
+CATEGORY_LABELS = {
+    "pension": "Pension",
+    "ration": "Ration Card",
+    "electricity": "Electricity",
+    "pmkisan": "PM-Kisan",
+    "water": "Water Supply",
+    "health": "Health Camp",
+    "general": "General",
+}
+
+
 def analyze_query(text, language="hi", user_id="demo_user_001"):
     """
     Analyze user query and generate AI response (simulated).
@@ -288,37 +301,10 @@ def analyze_query(text, language="hi", user_id="demo_user_001"):
     Returns:
         dict: Analysis result with intent, category, and response
     """
-    text_lower = text.lower()
-    
-    # Intent detection based on keywords
-    if any(word in text_lower for word in ["पेंशन", "pension", "পেনশন", "పెన్షన్"]):
-        category = "Pension"
-        intent = "check_status"
-        response = "आपकी पेंशन इस महीने की 5 तारीख को आ गई है। ₹1000 की राशि आपके खाते में जमा हो गई है। अगली पेंशन अगले महीने की 5 तारीख को आएगी।"
-    elif any(word in text_lower for word in ["राशन", "ration", "রেশন", "రేషన్"]):
-        category = "Ration Card"
-        intent = "information"
-        response = "आपका राशन कार्ड सक्रिय है। आप अपने नजदीकी राशन की दुकान से राशन ले सकते हैं। इस महीने का कोटा: 5 किलो चावल, 2 किलो गेहूं, 1 किलो चीनी।"
-    elif any(word in text_lower for word in ["बिजली", "electricity", "বিদ্যুত", "విద్యుత్"]):
-        category = "Electricity"
-        intent = "complaint"
-        response = "आपकी शिकायत दर्ज कर ली गई है। शिकायत संख्या: ELC-2024-00457. बिजली विभाग को सूचित किया गया है। 24 घंटे में समस्या हल हो जाएगी।"
-    elif any(word in text_lower for word in ["किसान", "kisan", "farmer", "কৃষক", "రైతు"]):
-        category = "PM-Kisan"
-        intent = "check_status"
-        response = "PM-Kisan की अगली किस्त 15 फरवरी 2024 को आएगी। ₹2000 सीधे आपके खाते में जमा होंगे। आपकी किस्त का स्टेटस: स्वीकृत।"
-    elif any(word in text_lower for word in ["पानी", "water", "জল", "నీరు", "paani"]):
-        category = "Water Supply"
-        intent = "complaint"
-        response = "पानी की सप्लाई की शिकायत दर्ज की गई है। शिकायत संख्या: WTR-2024-00823. जल विभाग को तुरंत सूचित किया गया है। 48 घंटे में समाधान होगा।"
-    elif any(word in text_lower for word in ["स्वास्थ्य", "health", "স্বাস্থ্য", "ఆరోగ్యం", "शिविर", "camp"]):
-        category = "Health Camp"
-        intent = "information"
-        response = "अगला स्वास्थ्य शिविर 15 फरवरी 2024 को आपके गाँव के प्राथमिक स्वास्थ्य केंद्र में लगेगा। समय: सुबह 10 बजे से शाम 4 बजे तक।"
-    else:
-        category = "General"
-        intent = "information"
-        response = "आपका प्रश्न दर्ज किया गया है। हमारी टीम जल्द ही आपसे संपर्क करेगी। अधिक जानकारी के लिए 1800-GRAMA-HELP पर कॉल करें।"
+    result = intent_engine.classify(text)
+    intent = result.intent
+    category = CATEGORY_LABELS[result.category]
+    response = get_response(result.category, "hi")
     
     confidence = random.uniform(0.82, 0.96)
     
@@ -0,0 +1,34 @@
+"""
+Shared intent and response engine
+Used by the FastAPI backend and both Streamlit apps; depends only on the
+standard library and config.settings
+"""
+from nlu.matcher import KeywordAutomaton, KeywordMatch
+from nlu.intent import IntentEngine, IntentResult, intent_engine
+from nlu.responses import (
+    ERROR_RESPONSE,
+    REQUEST_SLOTS,
+    ResponseEntry,
+    ResponseTable,
+    get_response,
+    render_response,
+    response_table,
+)
+from nlu.sentiment import SentimentScorer, sentiment_scorer
+
+__all__ = [
+    "KeywordAutomaton",
+    "KeywordMatch",
+    "IntentEngine",
+    "IntentResult",
+    "intent_engine",
+    "ERROR_RESPONSE",
+    "REQUEST_SLOTS",
+    "ResponseEntry",
+    "ResponseTable",
+    "get_response",
+    "render_response",
+    "response_table",
+    "SentimentScorer",
+    "sentiment_scorer",
+]
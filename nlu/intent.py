@@ -0,0 +1,106 @@
+"""
+Keyword-based intent engine shared by the backend and the Streamlit apps
+"""
+from bisect import bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Sequence
+
+from config.settings import INTENT_RULES
+from nlu.matcher import KeywordAutomaton, KeywordMatch
+
+DEFAULT_CATEGORY = "general"
+DEFAULT_INTENT = "information"
+
+# Joins batch texts for a single scan; never part of a keyword
+BATCH_SEPARATOR = "\x00"
+
+
+class IntentResult(NamedTuple):
+    """Outcome of classifying one piece of text"""
+
+    category: str
+    intent: str
+    matches: List[KeywordMatch]
+
+    def matches_as_dicts(self) -> List[Dict]:
+        """Keyword hits in a JSON-friendly shape"""
+        return [
+            {
+                "keyword": match.keyword,
+                "category": match.label,
+                "start": match.start,
+                "end": match.end,
+            }
+            for match in self.matches
+        ]
+
+
+class IntentEngine:
+    """
+    Classifies text into a service category and intent.
+
+    The keyword automaton is compiled once when the engine is created; each
+    call only walks the input text.
+    """
+
+    def __init__(self, rules: Iterable[Dict] = INTENT_RULES):
+        rules = list(rules)
+        self.matcher = KeywordAutomaton.from_rules(rules)
+        self.intent_by_category = {rule["category"]: rule["intent"] for rule in rules}
+        # Rule order is priority order
+        self.priority = {
+            category: rank for rank, category in enumerate(self.matcher.labels)
+        }
+
+    def classify(self, text: str) -> IntentResult:
+        """
+        Detect the category and intent of a query
+
+        Args:
+            text: User query text
+
+        Returns:
+            IntentResult with the winning category, its intent and all hits
+        """
+        return self._resolve(self.matcher.find_all(text))
+
+    def classify_batch(self, texts: Sequence[str]) -> List[IntentResult]:
+        """
+        Classify many texts with a single scan of the automaton
+
+        Args:
+            texts: Query texts
+
+        Returns:
+            One IntentResult per text, in input order; match offsets are
+            relative to each individual text
+        """
+        lowered = [text.lower().replace(BATCH_SEPARATOR, " ") for text in texts]
+        starts = []
+        offset = 0
+        for text in lowered:
+            starts.append(offset)
+            offset += len(text) + len(BATCH_SEPARATOR)
+
+        per_text: List[List[KeywordMatch]] = [[] for _ in lowered]
+        for match in self.matcher.find_all(BATCH_SEPARATOR.join(lowered)):
+            index = bisect_right(starts, match.start) - 1
+            base = starts[index]
+            per_text[index].append(
+                match._replace(start=match.start - base, end=match.end - base)
+            )
+
+        return [self._resolve(matches) for matches in per_text]
+
+    def _resolve(self, matches: List[KeywordMatch]) -> IntentResult:
+        """Pick the highest-priority category among keyword hits"""
+        if not matches:
+            return IntentResult(DEFAULT_CATEGORY, DEFAULT_INTENT, matches)
+
+        category = min(
+            {match.label for match in matches}, key=self.priority.__getitem__
+        )
+        return IntentResult(category, self.intent_by_category[category], matches)
+
+
+# Shared instance, built once per process
+intent_engine = IntentEngine()
@@ -0,0 +1,121 @@
+"""
+Multi-keyword matcher for intent detection
+Aho-Corasick automaton that finds every keyword of every category in one pass
+"""
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+
+class KeywordMatch(NamedTuple):
+    """A single keyword hit inside the scanned text"""
+
+    start: int
+    end: int
+    keyword: str
+    label: str
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton built once from a label -> keywords table.
+
+    Matching is case-insensitive and walks the text a single time no matter
+    how many keywords or labels are registered, so adding scheme keywords or
+    languages does not slow down detection.
+    """
+
+    def __init__(self, table: Iterable[Tuple[str, Iterable[str]]]):
+        """
+        Build the automaton
+
+        Args:
+            table: Pairs of (label, keywords); a keyword may appear under
+                several labels
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[Tuple[str, str], ...]] = [()]
+        self._labels: List[str] = []
+
+        pending: Dict[int, List[Tuple[str, str]]] = {}
+        for label, keywords in table:
+            if label not in self._labels:
+                self._labels.append(label)
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if not keyword:
+                    continue
+                state = 0
+                for char in keyword:
+                    next_state = self._goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto[state][char] = next_state
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._output.append(())
+                    state = next_state
+                pending.setdefault(state, []).append((keyword, label))
+
+        for state, hits in pending.items():
+            self._output[state] = tuple(dict.fromkeys(hits))
+
+        self._build_failure_links()
+
+    @classmethod
+    def from_rules(cls, rules: Iterable[Dict]) -> "KeywordAutomaton":
+        """Build from rule dicts with "category" and "keywords" keys"""
+        return cls((rule["category"], rule["keywords"]) for rule in rules)
+
+    @property
+    def labels(self) -> List[str]:
+        """Labels in registration order"""
+        return list(self._labels)
+
+    def _build_failure_links(self):
+        """Breadth-first pass linking every state to its longest proper suffix"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # Inherit the suffix state's hits so matching never has to
+                # walk the failure chain just to report outputs
+                if self._output[self._fail[child]]:
+                    self._output[child] = (
+                        self._output[child] + self._output[self._fail[child]]
+                    )
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """
+        Find every keyword occurrence, including overlapping ones
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Matches ordered by end offset; offsets index into text.lower()
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        matches: List[KeywordMatch] = []
+        state = 0
+
+        for index, char in enumerate(text.lower()):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword, label in output[state]:
+                end = index + 1
+                matches.append(KeywordMatch(end - len(keyword), end, keyword, label))
+
+        return matches
+
+    def matched_labels(self, text: str) -> Set[str]:
+        """Return the set of labels that have at least one keyword in text"""
+        return {match.label for match in self.find_all(text)}
@@ -0,0 +1,160 @@
+"""
+Canned service responses per category and language
+The table is loaded once from data/responses.json; every (category, language)
+pair, including fallbacks, is resolved up front so lookups are a dict hit
+"""
+import json
+from pathlib import Path
+from string import Template
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Tuple
+
+from config.settings import SUPPORTED_LANGUAGES
+
+RESPONSES_PATH = Path(__file__).resolve().parent / "data" / "responses.json"
+
+# Slots filled per request (never with their defaults) by the voice pipeline
+REQUEST_SLOTS = frozenset({"complaint_id"})
+
+ERROR_RESPONSE = "क्षमा करें, कुछ गड़बड़ हो गई। कृपया दोबारा कोशिश करें।"
+
+
+class ResponseEntry(NamedTuple):
+    """A resolved response template with its default slot values"""
+
+    category: str
+    language: str
+    template: Template
+    defaults: Mapping[str, str]
+    text: str
+
+    @property
+    def per_request(self) -> bool:
+        """Whether the template quotes a slot filled per request (REQUEST_SLOTS)"""
+        return not REQUEST_SLOTS.isdisjoint(self.template.get_identifiers())
+
+
+class ResponseTable:
+    """
+    Immutable category x language response lookup.
+
+    Templates use string.Template slots ($complaint_id, $date, $amount, ...).
+    Rendering with no slots returns the pre-rendered default text; rendering
+    with slots substitutes only into the one template that was looked up.
+    """
+
+    def __init__(self, document: Dict[str, Any], languages: Iterable[str] = ()):
+        """
+        Build the table
+
+        Args:
+            document: Parsed responses.json
+            languages: Extra language codes to precompute fallbacks for
+        """
+        fallback_languages = list(document["fallback_languages"])
+        self.default_category = document["default_category"]
+
+        entries: Dict[Tuple[str, str], ResponseEntry] = {}
+        fallbacks: Dict[str, ResponseEntry] = {}
+        for category, spec in document["categories"].items():
+            templates = spec["templates"]
+            localized = spec.get("localized_defaults", {})
+
+            def resolve(language: str) -> ResponseEntry:
+                for candidate in [language] + fallback_languages:
+                    if candidate in templates:
+                        break
+                template = Template(templates[candidate])
+                defaults = MappingProxyType(
+                    {**spec.get("defaults", {}), **localized.get(candidate, {})}
+                )
+                return ResponseEntry(
+                    category,
+                    candidate,
+                    template,
+                    defaults,
+                    template.safe_substitute(defaults),
+                )
+
+            for language in set(templates) | set(languages):
+                entries[(category, language)] = resolve(language)
+            # Used for languages nobody told us about
+            fallbacks[category] = resolve(fallback_languages[0])
+
+        self._entries = MappingProxyType(entries)
+        self._fallbacks = MappingProxyType(fallbacks)
+
+    @classmethod
+    def load(cls, path: Path = RESPONSES_PATH) -> "ResponseTable":
+        """Load the table from a JSON data file"""
+        with open(path, encoding="utf-8") as handle:
+            document = json.load(handle)
+        return cls(document, [language["code"] for language in SUPPORTED_LANGUAGES])
+
+    @property
+    def categories(self) -> List[str]:
+        """Categories in data-file order"""
+        return list(self._fallbacks)
+
+    def lookup(self, category: str, language: str = "hi") -> ResponseEntry:
+        """
+        Find the response entry for a category and language
+
+        Unknown categories use the default category; unknown languages fall
+        back to Hindi, then English.
+        """
+        if category not in self._fallbacks:
+            category = self.default_category
+        entry = self._entries.get((category, language))
+        if entry is None:
+            entry = self._fallbacks[category]
+        return entry
+
+    def render(self, category: str, language: str = "hi", **slots: Any) -> str:
+        """
+        Render the response text, filling template slots
+
+        Args:
+            category: Service category
+            language: Language code
+            **slots: Slot values overriding the defaults (e.g. complaint_id)
+
+        Returns:
+            Response text
+        """
+        entry = self.lookup(category, language)
+        if not slots:
+            return entry.text
+        return entry.template.safe_substitute(entry.defaults, **slots)
+
+    def entries(self) -> Iterable[ResponseEntry]:
+        """Every distinct resolved template, e.g. for pre-synthesizing audio"""
+        seen = set()
+        for entry in self._entries.values():
+            key = (entry.category, entry.language)
+            if key not in seen:
+                seen.add(key)
+                yield entry
+
+
+# Shared instance, loaded once per process
+response_table = ResponseTable.load()
+
+
+def get_response(category: str, language: str = "hi") -> str:
+    """
+    Look up the default response text for a category
+
+    Args:
+        category: Service category
+        language: Language code; falls back to Hindi, then English
+
+    Returns:
+        Response text
+    """
+    return response_table.render(category, language)
+
+
+def render_response(category: str, language: str = "hi", **slots: Any) -> str:
+    """Render a response, filling slots such as complaint_id, date or amount"""
+    return response_table.render(category, language, **slots)
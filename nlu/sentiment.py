@@ -0,0 +1,126 @@
+"""
+Lexicon-based sentiment scoring
+Words are looked up in a small per-language lexicon (data/sentiment.json),
+merged into one table since queries mix scripts freely. A negator flips the
+nearest sentiment word within its language's reach, an intensifier
+strengthens the word after it, and the sum is squashed into [-1, 1]. Scoring
+is a single pass over the words of the text
+"""
+import json
+import math
+import re
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+SENTIMENT_PATH = Path(__file__).resolve().parent / "data" / "sentiment.json"
+
+# Word offsets a negator reaches, nearest first. Indic negators follow an
+# adjective ("अच्छा नहीं है") but precede a verb ("नहीं मिली"); English ones
+# precede what they negate ("not good")
+NEGATION_SCOPES = {
+    "next": (1, 2),
+    "previous": (-1, -2),
+    "both": (-1, 1, -2, 2),
+}
+INTENSIFIER_BOOST = 1.5
+# Squashing constant: one word scores about 0.45, three about 0.83
+NORMALIZATION_ALPHA = 4.0
+
+# Whitespace, ASCII punctuation except the apostrophe, and the danda; only
+# splitting here keeps vowel signs inside their words
+_SEPARATORS = re.compile(r"[\s!-&(-/:-@\[-`{-~।॥]+")
+# Transcripts spell nukta letters with and without it (ख़राब, खराब)
+_NUKTA = "\u093c"
+
+
+class SentimentScorer:
+    """
+    Scores text from -1 (negative) to 1 (positive); 0 is neutral
+
+    In service requests a negator that qualifies no sentiment word mostly
+    reports something missing ("पानी नहीं आ रहा"), so on its own it counts as
+    mildly negative.
+    """
+
+    def __init__(self, document: Dict[str, Any]):
+        """
+        Build the lexicon
+
+        Args:
+            document: Parsed sentiment.json
+        """
+        self.weights: Dict[str, float] = {}
+        # Negator -> offsets of the words it may negate
+        self.negators: Dict[str, Tuple[int, ...]] = {}
+        self.intensifiers = set()
+        for lexicon in document["languages"].values():
+            for word in lexicon.get("positive", []):
+                self.weights[self._normalize(word)] = 1.0
+            for word in lexicon.get("negative", []):
+                self.weights[self._normalize(word)] = -1.0
+            scope = NEGATION_SCOPES[lexicon.get("negates", "next")]
+            for word in lexicon.get("negators", []):
+                self.negators.setdefault(self._normalize(word), scope)
+            self.intensifiers.update(
+                self._normalize(w) for w in lexicon.get("intensifiers", [])
+            )
+        self.negator_weight = float(document.get("negator_weight", 0.0))
+
+    @classmethod
+    def load(cls, path: Path = SENTIMENT_PATH) -> "SentimentScorer":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @staticmethod
+    def _normalize(word: str) -> str:
+        return unicodedata.normalize("NFC", word).replace(_NUKTA, "").lower()
+
+    def tokens(self, text: str) -> List[str]:
+        """Normalized words of a text"""
+        return [word for word in _SEPARATORS.split(self._normalize(text or "")) if word]
+
+    def score(self, text: str) -> float:
+        """
+        Sentiment of a text
+
+        Args:
+            text: Query text in any supported language
+
+        Returns:
+            Score in [-1, 1], rounded to 3 decimals
+        """
+        words = self.tokens(text)
+        values = [self.weights.get(word, 0.0) for word in words]
+
+        for index, word in enumerate(words):
+            if word in self.intensifiers and index + 1 < len(words):
+                values[index + 1] *= INTENSIFIER_BOOST
+
+        negated = set()
+        total = 0.0
+        for index, word in enumerate(words):
+            scope = self.negators.get(word)
+            if scope is None:
+                continue
+            nearby = [
+                position
+                for position in (index + offset for offset in scope)
+                if 0 <= position < len(words)
+                and values[position]
+                and position not in negated
+            ]
+            if nearby:
+                negated.add(nearby[0])
+                values[nearby[0]] = -values[nearby[0]]
+            else:
+                total += self.negator_weight
+
+        total += sum(values)
+        if not total:
+            return 0.0
+        return round(total / math.sqrt(total * total + NORMALIZATION_ALPHA), 3)
+
+
+# Shared instance, built once per process
+sentiment_scorer = SentimentScorer.load()
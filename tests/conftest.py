@@ -0,0 +1,89 @@
+"""
+Shared test setup
+Settings are read when config.settings is imported, so the database, caches
+and journal are pointed at a temporary directory before any app module loads
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+TEST_DIR = tempfile.mkdtemp(prefix="gramavoice-tests-")
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}")
+os.environ.setdefault("TTS_CACHE_DIR", os.path.join(TEST_DIR, "tts"))
+os.environ.setdefault("WRITE_BEHIND_JOURNAL_DIR", os.path.join(TEST_DIR, "journal"))
+os.environ.setdefault("QUERY_WRITE_BEHIND", "false")
+os.environ.setdefault("DASHBOARD_CACHE_BACKEND", "memory")
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client running the API's startup and shutdown hooks"""
+    from fastapi.testclient import TestClient
+
+    from backend.app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db():
+    """Sync session on the test database"""
+    from backend.app.models import SessionLocal, init_db
+
+    init_db()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine on a fresh SQLite database with the full schema"""
+    from sqlalchemy import create_engine
+
+    from backend.app.models.database import Base
+    from backend.app.models.engine_config import configure_engine, engine_options
+
+    url = f"sqlite:///{tmp_path / 'isolated.db'}"
+    isolated = configure_engine(create_engine(url, **engine_options(url)))
+    Base.metadata.create_all(bind=isolated)
+    yield isolated
+    isolated.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """Session factory for the isolated database"""
+    from sqlalchemy.orm import sessionmaker
+
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def session(session_factory):
+    """Sync session on the isolated database"""
+    isolated = session_factory()
+    try:
+        yield isolated
+    finally:
+        isolated.close()
+
+
+@pytest.fixture
+def instant_tts(monkeypatch):
+    """Skip speech synthesis in the voice pipeline"""
+    from backend.app.services.ai_service import ai_service
+
+    async def text_to_speech(text, language):
+        return {"audio_url": None}
+
+    monkeypatch.setattr(ai_service, "text_to_speech", text_to_speech)
@@ -0,0 +1,126 @@
+"""
+HyperLogLog active-user counter tests
+"""
+import threading
+from datetime import date, datetime
+
+import pytest
+
+from backend.app.models.database import DailyUserSketch, Query
+from backend.app.services.active_users import ALL_DISTRICTS, ActiveUserCounter
+
+DAY = datetime(2026, 4, 2, 11, 0)
+NEXT_DAY = datetime(2026, 4, 3, 11, 0)
+
+
+def about(count):
+    """HyperLogLog estimates are within about 1% at the default precision"""
+    return pytest.approx(count, rel=0.03)
+
+
+def rows(users, created_at=DAY, district="Varanasi"):
+    return [
+        {"user_id": f"user{n}", "district": district, "created_at": created_at}
+        for n in users
+    ]
+
+
+def test_counts_include_pending_and_stored_sketches(session_factory, session):
+    counter = ActiveUserCounter(session_factory=session_factory)
+    counter.observe(rows(range(100)))
+    counter.observe(rows(range(50, 150), district="Prayagraj"))
+    counter.observe([{"user_id": None, "created_at": DAY}])
+
+    before = counter.counts(session, DAY.date())
+    assert counter.flush() == 3
+    assert counter.counts(session, DAY.date()) == before
+    assert before == {
+        ALL_DISTRICTS: about(150),
+        "Varanasi": about(100),
+        "Prayagraj": about(100),
+    }
+
+
+def test_repeated_users_and_flushes_count_once(session_factory, session):
+    counter = ActiveUserCounter(session_factory=session_factory)
+    counter.observe(rows(range(200)))
+    counter.flush()
+    counter.observe(rows(range(200)))
+    counter.flush()
+    assert counter.flush() == 0
+
+    assert session.query(DailyUserSketch).count() == 2
+    assert counter.counts(session, DAY.date())[ALL_DISTRICTS] == about(200)
+
+
+def test_counts_cover_the_requested_days(session_factory, session):
+    counter = ActiveUserCounter(session_factory=session_factory)
+    counter.observe(rows(range(10)))
+    counter.observe(rows(range(5, 30), created_at=NEXT_DAY))
+    counter.flush()
+
+    first_day = counter.counts(session, DAY.date(), DAY.date())
+    assert first_day[ALL_DISTRICTS] == about(10)
+    assert counter.counts(session, NEXT_DAY.date())[ALL_DISTRICTS] == about(25)
+    assert counter.counts(session, DAY.date())[ALL_DISTRICTS] == about(30)
+    assert counter.counts(session, date(2026, 5, 1)) == {}
+
+
+def test_failed_flush_keeps_sketches_for_the_next_one(session_factory, session):
+    def failing_session():
+        db = session_factory()
+        db.commit = fail
+        return db
+
+    def fail():
+        raise RuntimeError("database is down")
+
+    counter = ActiveUserCounter(session_factory=failing_session)
+    counter.observe(rows(range(40)))
+    with pytest.raises(RuntimeError):
+        counter.flush()
+    counter.observe(rows(range(30, 60)))
+
+    counter.session_factory = session_factory
+    assert counter.flush() == 2
+    assert counter.counts(session, DAY.date())[ALL_DISTRICTS] == about(60)
+
+
+def test_backfill_is_idempotent(session_factory, session):
+    session.add_all(
+        Query(user_id=f"user{n % 25}", district="Varanasi", created_at=DAY)
+        for n in range(100)
+    )
+    session.commit()
+
+    counter = ActiveUserCounter(session_factory=session_factory)
+    assert counter.backfill() == 100
+    counter.backfill()
+    assert ActiveUserCounter(session_factory=session_factory).backfill() == 100
+    assert counter.counts(session, DAY.date()) == {
+        ALL_DISTRICTS: about(25),
+        "Varanasi": about(25),
+    }
+
+
+def test_start_backfills_on_the_flush_thread(session_factory, session):
+    session.add(Query(user_id="user1", district="Varanasi", created_at=DAY))
+    session.commit()
+    threads = []
+
+    def recording_session():
+        threads.append(threading.current_thread())
+        return session_factory()
+
+    counter = ActiveUserCounter(interval=3600, session_factory=recording_session)
+    counter.start()
+    counter.stop()
+
+    assert threads and threading.current_thread() not in threads
+    assert counter.counts(session, DAY.date()) == {ALL_DISTRICTS: 1, "Varanasi": 1}
+
+
+def test_dashboard_reports_active_users(client):
+    data = client.post("/api/dashboard-data", json={"days": 7}).json()["data"]
+    assert isinstance(data["active_users"], int)
+    assert isinstance(data["active_users_by_district"], list)
@@ -0,0 +1,42 @@
+"""
+Batch text analysis endpoint tests
+"""
+from backend.app.models.database import Query
+from config.settings import ANALYZE_BATCH_MAX_SIZE
+
+
+def test_batch_results_keep_input_order_with_per_item_errors(client, db):
+    items = [
+        {"text": "मेरी पेंशन कब आएगी?", "user_id": "batch_user"},
+        {"text": "   ", "user_id": "batch_user"},
+        {"text": "पानी नहीं आ रहा", "user_id": "batch_user", "village": "रामपुर"},
+    ]
+    body = client.post("/api/analyze/batch", json={"items": items}).json()
+
+    assert body["success"] and body["count"] == 3
+    first, empty, last = body["results"]
+    assert [first["index"], empty["index"], last["index"]] == [0, 1, 2]
+    assert first["success"] and first["service_category"] == "pension"
+    assert not empty["success"] and empty["error"] == "Empty text"
+    assert last["success"] and last["service_category"] == "water"
+
+    stored = {
+        row.id: row
+        for row in db.query(Query).filter(
+            Query.id.in_([first["query_id"], last["query_id"]])
+        )
+    }
+    assert stored[first["query_id"]].query_text == items[0]["text"]
+    assert stored[last["query_id"]].village == "रामपुर"
+    assert stored[last["query_id"]].ai_response == last["ai_response"]
+
+
+def test_batch_over_the_limit_is_rejected(client):
+    items = [{"text": "pension"}] * (ANALYZE_BATCH_MAX_SIZE + 1)
+    response = client.post("/api/analyze/batch", json={"items": items})
+    assert response.status_code == 413
+
+
+def test_empty_batch(client):
+    body = client.post("/api/analyze/batch", json={"items": []}).json()
+    assert body == {"success": True, "count": 0, "results": []}
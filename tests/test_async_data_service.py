@@ -0,0 +1,142 @@
+"""
+Async engine and data service tests
+"""
+import asyncio
+import threading
+
+import pytest
+
+from backend.app.models.async_session import AsyncSessionLocal, async_url
+from backend.app.models.database import Complaint, Query
+from backend.app.services.async_data_service import async_data_service
+from backend.app.services.data_service import DataService
+from backend.app.services.id_allocator import (
+    complaint_id_allocator,
+    query_id_allocator,
+)
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("sqlite:///./gramavoice.db", "sqlite+aiosqlite:///./gramavoice.db"),
+        (
+            "postgresql://user:secret@db/gramavoice",
+            "postgresql+asyncpg://user:secret@db/gramavoice",
+        ),
+        (
+            "postgresql+psycopg2://user@db/gramavoice",
+            "postgresql+asyncpg://user@db/gramavoice",
+        ),
+    ],
+)
+def test_async_url_swaps_the_driver(url, expected):
+    assert async_url(url) == expected
+
+
+def test_async_url_rejects_unknown_backends():
+    with pytest.raises(ValueError):
+        async_url("mysql://user@db/gramavoice")
+
+
+@pytest.fixture
+def allocation_threads(monkeypatch):
+    """Threads the ID allocators were called on"""
+    threads = []
+
+    def recorded(method):
+        def wrapper(*args):
+            threads.append(threading.current_thread())
+            return method(*args)
+
+        return wrapper
+
+    for allocator, name in (
+        (query_id_allocator, "next_id"),
+        (query_id_allocator, "allocate"),
+        (complaint_id_allocator, "next_id"),
+    ):
+        monkeypatch.setattr(allocator, name, recorded(getattr(allocator, name)))
+    return threads
+
+
+def test_writes_allocate_ids_on_the_db_thread_pool(db, allocation_threads):
+    async def run():
+        async with AsyncSessionLocal() as session:
+            query = await async_data_service.create_query(
+                session,
+                user_id="async_user",
+                query_text="pension",
+                language="en",
+                intent="check_status",
+                category="pension",
+                ai_response="ok",
+            )
+            complaint = await async_data_service.create_complaint(
+                session,
+                user_id="async_user",
+                category="water",
+                description="no water",
+                location="Rampur",
+            )
+            bulk = await async_data_service.create_queries_bulk(
+                session,
+                [
+                    {
+                        "user_id": "async_user",
+                        "query_text": text,
+                        "language": "en",
+                        "intent": "information",
+                        "category": "general",
+                        "ai_response": "ok",
+                    }
+                    for text in ("one", "two")
+                ],
+            )
+        return threading.current_thread(), query.id, complaint.complaint_id, bulk
+
+    loop_thread, query_id, complaint_id, bulk_ids = asyncio.run(run())
+
+    assert allocation_threads
+    assert loop_thread not in allocation_threads
+    # Allocation shares the bounded DB pool with the rest of the blocking work
+    assert all(
+        thread.name.startswith("gramavoice-db") for thread in allocation_threads
+    )
+    assert db.get(Query, query_id).query_text == "pension"
+    assert db.query(Complaint).filter_by(complaint_id=complaint_id).one()
+    assert [db.get(Query, query_id).query_text for query_id in bulk_ids] == [
+        "one",
+        "two",
+    ]
+
+
+def test_given_ids_are_not_reallocated(db, allocation_threads):
+    query_id = query_id_allocator.allocate(1)[0]
+    allocation_threads.clear()
+
+    async def run():
+        async with AsyncSessionLocal() as session:
+            return await async_data_service.create_query(
+                session,
+                query_id=query_id,
+                user_id="async_user",
+                query_text="given id",
+                language="en",
+                intent="information",
+                category="general",
+                ai_response="ok",
+            )
+
+    assert asyncio.run(run()).id == query_id
+    assert allocation_threads == []
+
+
+def test_history_page_matches_the_sync_service(db):
+    async def run():
+        async with AsyncSessionLocal() as session:
+            return await async_data_service.get_user_history_page(
+                session, "async_user", 3
+            )
+
+    assert asyncio.run(run()) == DataService.get_user_history_page(db, "async_user", 3)
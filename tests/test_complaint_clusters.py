@@ -0,0 +1,90 @@
+"""
+Near-duplicate complaint clustering tests
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.models.database import ComplaintCluster
+from backend.app.services.complaint_clusters import ComplaintClusterer
+from backend.app.services.data_service import DataService
+
+NOW = datetime(2026, 5, 1, 10, 0)
+
+
+@pytest.fixture
+def assign(session):
+    clusterer = ComplaintClusterer(window=3600, threshold=0.4)
+    numbers = iter(range(1000))
+
+    def assign(description, category="electricity", location="Rampur", at=NOW):
+        return clusterer.assign(
+            session,
+            {
+                "complaint_id": f"CLU-{next(numbers)}",
+                "category": category,
+                "location": location,
+                "description": description,
+                "created_at": at,
+            },
+        )
+
+    return assign
+
+
+def test_near_duplicates_join_one_cluster(session, assign):
+    first = assign("ट्रांसफार्मर जल गया है, बिजली नहीं है")
+    second = assign("ट्रांसफार्मर जल गया, रात से बिजली नहीं")
+    third = assign("सड़क पर बहुत गड्ढे हैं")
+
+    assert first == second != third
+    cluster = session.get(ComplaintCluster, first)
+    assert cluster.size == 2
+    assert cluster.representative_id == "CLU-0"
+
+
+def test_clusters_are_per_category_and_location(assign):
+    description = "ट्रांसफार्मर जल गया है"
+    clusters = {
+        assign(description),
+        assign(description, category="water"),
+        assign(description, location="Sitapur"),
+    }
+    assert len(clusters) == 3
+
+
+def test_clusters_close_after_the_window(session, assign):
+    description = "हैंडपंप खराब है"
+    first = assign(description)
+    # Each complaint extends the window
+    assert assign(description, at=NOW + timedelta(minutes=50)) == first
+    assert assign(description, at=NOW + timedelta(minutes=100)) == first
+    assert assign(description, at=NOW + timedelta(minutes=170)) != first
+    assert session.get(ComplaintCluster, first).size == 3
+
+
+def test_created_complaints_are_listed_by_cluster(client, db):
+    location = f"Cluster test {datetime.utcnow().timestamp()}"
+    complaints = [
+        DataService.create_complaint(
+            db=db,
+            user_id="cluster_user",
+            category="water",
+            description=description,
+            location=location,
+        )
+        for description in ("नल से गंदा पानी आ रहा है", "नल से गंदा पानी आ रहा")
+    ]
+    assert complaints[0].cluster_id == complaints[1].cluster_id is not None
+
+    response = client.post(
+        "/api/complaints/clusters", json={"location": location, "min_size": 2}
+    )
+    [cluster] = response.json()["clusters"]
+    assert cluster["size"] == 2
+
+    detail = client.get(f"/api/complaints/clusters/{cluster['cluster_id']}").json()
+    assert [item["complaint_id"] for item in detail["cluster"]["complaints"]] == [
+        complaint.complaint_id for complaint in complaints
+    ]
+    assert client.get("/api/complaints/clusters/999999999").status_code == 404
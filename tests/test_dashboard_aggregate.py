@@ -0,0 +1,120 @@
+"""
+Single-pass dashboard aggregate tests
+"""
+import random
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models.database import Base, Complaint, Query
+from backend.app.models.engine_config import configure_engine, engine_options
+from backend.app.services import rollups
+from backend.app.services.data_service import DataService
+
+START = datetime(2026, 2, 1, 6, 0)
+CATEGORIES = ["pension", "water", "electricity", None]
+STATUSES = ["open", "in_progress", "resolved", "closed"]
+
+
+@pytest.fixture(scope="module")
+def session():
+    """Database with a random spread of queries and complaints"""
+    url = "sqlite://"
+    engine = configure_engine(create_engine(url, **engine_options(url)))
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    rng = random.Random(13)
+    for _ in range(300):
+        session.add(
+            Query(
+                user_id="u",
+                service_category=rng.choice(CATEGORIES),
+                created_at=START + timedelta(hours=rng.randrange(24 * 10)),
+            )
+        )
+    for number in range(200):
+        session.add(
+            Complaint(
+                complaint_id=f"AGG-{number}",
+                user_id="u",
+                category=rng.choice(CATEGORIES),
+                status=rng.choice(STATUSES),
+                created_at=START + timedelta(hours=rng.randrange(24 * 10)),
+            )
+        )
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def brute_force(session, since=None):
+    """Count the raw tables row by row"""
+    counts = Counter()
+    for query in session.query(Query):
+        if since is None or query.created_at.date() >= since:
+            key = query.service_category or rollups.UNKNOWN_CATEGORY
+            counts[(query.created_at.date(), rollups.METRIC_QUERIES, key)] += 1
+    for complaint in session.query(Complaint):
+        if since is None or complaint.created_at.date() >= since:
+            day = complaint.created_at.date()
+            key = complaint.category or rollups.UNKNOWN_CATEGORY
+            counts[(day, rollups.METRIC_COMPLAINTS, key)] += 1
+            if complaint.status == "resolved":
+                counts[(day, rollups.METRIC_RESOLVED, key)] += 1
+    return counts
+
+
+@pytest.mark.parametrize("since", [None, date(2026, 2, 6)])
+def test_aggregate_matches_a_row_by_row_count(session, since):
+    assert rollups.aggregate(session, since) == brute_force(session, since)
+
+
+def test_aggregate_is_a_single_statement(session):
+    statements = []
+
+    def count(*args):
+        statements.append(args)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        rollups.aggregate(session)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert len(statements) == 1
+
+
+def test_summarize_counts_shapes_the_dashboard_payload():
+    day, next_day = date(2026, 2, 1), date(2026, 2, 2)
+    data = DataService.summarize_counts(
+        {
+            (day, rollups.METRIC_QUERIES, "water"): 3,
+            (next_day, rollups.METRIC_QUERIES, "pension"): 2,
+            (day, rollups.METRIC_COMPLAINTS, "water"): 4,
+            (day, rollups.METRIC_RESOLVED, "water"): 1,
+        }
+    )
+    assert data == {
+        "total_queries": 5,
+        "total_complaints": 4,
+        "resolved_complaints": 1,
+        "resolution_rate": 25.0,
+        "complaints_by_category": [{"category": "water", "count": 4}],
+        "queries_by_service": [
+            {"service": "pension", "count": 2},
+            {"service": "water", "count": 3},
+        ],
+        "daily_trend": [
+            {"date": "2026-02-01", "count": 3},
+            {"date": "2026-02-02", "count": 2},
+        ],
+    }
+
+
+def test_summarize_counts_without_complaints_has_no_resolution_rate():
+    assert DataService.summarize_counts({})["resolution_rate"] == 0
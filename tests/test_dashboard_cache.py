@@ -0,0 +1,132 @@
+"""
+Dashboard response cache tests
+"""
+import asyncio
+import threading
+
+import pytest
+
+from backend.app.services.async_data_service import async_data_service
+from backend.app.services.dashboard_cache import (
+    CacheEntry,
+    DashboardCache,
+    MemoryBackend,
+)
+
+
+@pytest.fixture
+def computed(monkeypatch):
+    """Days windows recomputed, in order; each result is the call number"""
+    calls = []
+
+    async def compute_dashboard_data(db, days):
+        calls.append(days)
+        await asyncio.sleep(0.01)
+        return {"call": len(calls)}
+
+    monkeypatch.setattr(
+        async_data_service, "compute_dashboard_data", compute_dashboard_data
+    )
+    return calls
+
+
+def test_fresh_entries_are_served_without_recomputing(computed):
+    async def run():
+        cache = DashboardCache(MemoryBackend(), ttl=60)
+        # Concurrent misses share one recomputation
+        first = await asyncio.gather(*(cache.get(7) for _ in range(5)))
+        return first, await cache.get(7), await cache.get(30)
+
+    first, cached, other = asyncio.run(run())
+    assert first == [{"call": 1}] * 5
+    assert cached == {"call": 1}
+    assert other == {"call": 2}
+    assert computed == [7, 30]
+
+
+def test_stale_entries_are_served_while_they_refresh(computed):
+    async def run():
+        cache = DashboardCache(MemoryBackend(), ttl=0, stale_ttl=60)
+        await cache.get(7)
+        stale = await cache.get(7)
+        await asyncio.sleep(0.05)
+        return stale, await cache.get(7)
+
+    stale, refreshed = asyncio.run(run())
+    assert stale == {"call": 1}
+    assert refreshed == {"call": 2}
+
+
+def test_entries_past_the_stale_ttl_are_recomputed_before_returning(computed):
+    async def run():
+        backend = MemoryBackend()
+        cache = DashboardCache(backend, ttl=1, stale_ttl=1)
+        await backend.set("days:7", CacheEntry({"call": 0}, 0.0, 0), 1)
+        return await cache.get(7)
+
+    assert asyncio.run(run()) == {"call": 1}
+
+
+def test_failed_reads_are_raised_and_not_cached(monkeypatch):
+    async def compute_dashboard_data(db, days):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(
+        async_data_service, "compute_dashboard_data", compute_dashboard_data
+    )
+
+    async def run():
+        cache = DashboardCache(MemoryBackend(), ttl=60)
+        with pytest.raises(RuntimeError):
+            await cache.get(7)
+        return await cache.backend.get("days:7")
+
+    assert asyncio.run(run()) is None
+
+
+def test_invalidation_from_another_thread_makes_entries_stale(computed):
+    async def run():
+        cache = DashboardCache(MemoryBackend(), ttl=60, stale_ttl=60)
+        cache.start()
+        await cache.get(7)
+
+        # Rows committed on a worker thread
+        thread = threading.Thread(target=cache.invalidate, args=([{"id": 1}],))
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0.01)
+
+        stale = await cache.get(7)
+        await asyncio.sleep(0.05)
+        return stale, await cache.get(7)
+
+    stale, refreshed = asyncio.run(run())
+    assert stale == {"call": 1}
+    assert refreshed == {"call": 2}
+
+
+def test_invalidate_before_start_is_ignored():
+    cache = DashboardCache(MemoryBackend())
+    cache.invalidate([{"id": 1}])
+    assert asyncio.run(cache.backend.generation()) == 0
+
+
+def test_memory_backend_evicts_least_recently_used_entries():
+    async def run():
+        backend = MemoryBackend(max_entries=2)
+        for key in ("a", "b"):
+            await backend.set(key, CacheEntry({key: 1}, 0.0, 0), 60)
+        await backend.get("a")
+        await backend.set("c", CacheEntry({"c": 1}, 0.0, 0), 60)
+        return [await backend.get(key) for key in ("a", "b", "c")]
+
+    a, b, c = asyncio.run(run())
+    assert a.value == {"a": 1} and b is None and c.value == {"c": 1}
+
+
+def test_dashboard_endpoint_is_served_from_the_cache(client, computed):
+    first = client.post("/api/dashboard-data", json={"days": 4242})
+    second = client.post("/api/dashboard-data", json={"days": 4242})
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert computed == [4242]
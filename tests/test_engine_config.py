@@ -0,0 +1,55 @@
+"""
+Engine configuration tests
+"""
+import threading
+
+from backend.app.models.engine_config import engine_options, sqlite_pragmas
+from config.settings import DB_POOL_SIZE, SQLITE_BUSY_TIMEOUT_MS
+
+
+def pragma(connection, name):
+    return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_server_databases_get_pool_settings():
+    options = engine_options("postgresql://user@db/gramavoice")
+    assert options["pool_size"] == DB_POOL_SIZE
+    assert "connect_args" not in options
+
+
+def test_sqlite_connections_can_be_shared_with_threads():
+    assert engine_options("sqlite:///x.db") == {
+        "connect_args": {"check_same_thread": False}
+    }
+    assert engine_options("sqlite+aiosqlite:///x.db", is_async=True) == {}
+
+
+def test_in_memory_databases_skip_journal_mode():
+    assert "journal_mode" not in sqlite_pragmas("sqlite://")
+    assert list(sqlite_pragmas("sqlite:///x.db"))[0] == "journal_mode"
+
+
+def test_pragmas_are_applied_to_every_connection(engine):
+    results = []
+
+    def check():
+        with engine.connect() as connection:
+            results.append(
+                (
+                    pragma(connection, "journal_mode"),
+                    pragma(connection, "busy_timeout"),
+                    pragma(connection, "synchronous"),
+                )
+            )
+
+    # The pool hands other threads their own connections
+    threads = [threading.Thread(target=check) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    check()
+
+    # synchronous=NORMAL is 1
+    assert results == [("wal", SQLITE_BUSY_TIMEOUT_MS, 1)] * 4
+
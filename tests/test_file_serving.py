@@ -0,0 +1,111 @@
+"""
+Range and ETag audio serving tests
+"""
+import pytest
+
+from backend.app.services.tts_cache import TTSCache, tts_cache
+from backend.app.utils.file_serving import (
+    IMMUTABLE_CACHE_CONTROL,
+    RangeNotSatisfiable,
+    etag_matches,
+    parse_range,
+)
+
+AUDIO = bytes(range(256)) * 40
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes= 10-20", (10, 20)),
+        ("items=0-10", None),
+        ("bytes=0-10,20-30", None),
+        ("bytes=a-b", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=50-10", "bytes=-0"])
+def test_parse_range_outside_the_file(header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, 1000)
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        (None, False),
+        ('"abc"', True),
+        ('"xyz", "abc"', True),
+        ('W/"abc"', True),
+        ("*", True),
+        ('"abcd"', False),
+    ],
+)
+def test_etag_matches(header, matches):
+    assert etag_matches(header, '"abc"') is matches
+
+
+@pytest.fixture(scope="module")
+def audio_file():
+    key = TTSCache.make_key("file serving test", "hi", "test")
+    return key, tts_cache.put(key, AUDIO, "wav")
+
+
+def test_full_download(client, audio_file):
+    key, filename = audio_file
+    response = client.get(f"/api/audio/{filename}")
+    assert response.status_code == 200
+    assert response.content == AUDIO
+    assert response.headers["etag"] == f'"{key}"'
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["content-type"] == "audio/wav"
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+def test_range_download(client, audio_file):
+    _, filename = audio_file
+    response = client.get(f"/api/audio/{filename}", headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.content == AUDIO[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(AUDIO)}"
+    assert response.headers["content-length"] == "100"
+
+
+def test_revalidation_and_if_range(client, audio_file):
+    key, filename = audio_file
+    url = f"/api/audio/{filename}"
+    assert client.get(url, headers={"If-None-Match": f'"{key}"'}).status_code == 304
+
+    stale = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+    assert stale.status_code == 200 and stale.content == AUDIO
+
+
+def test_unsatisfiable_range(client, audio_file):
+    _, filename = audio_file
+    response = client.get(
+        f"/api/audio/{filename}", headers={"Range": f"bytes={len(AUDIO)}-"}
+    )
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(AUDIO)}"
+
+
+def test_head_sends_headers_only(client, audio_file):
+    _, filename = audio_file
+    response = client.head(f"/api/audio/{filename}")
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(AUDIO))
+    assert response.content == b""
+
+
+@pytest.mark.parametrize("filename", ["../etc/passwd", "abc.wav", "0" * 64 + ".wav"])
+def test_unknown_or_invalid_names_are_not_found(client, filename):
+    assert client.get(f"/api/audio/{filename}").status_code == 404
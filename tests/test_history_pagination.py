@@ -0,0 +1,84 @@
+"""
+Keyset-paginated and streamed history tests
+"""
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.models.database import Query
+from backend.app.services.id_allocator import query_id_allocator
+from backend.app.utils.pagination import decode_cursor, encode_cursor
+
+START = datetime(2026, 1, 5, 8, 0, 0, 123456)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(START, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (START, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "!!!", "bm90IGEgY3Vyc29y", "w4k"])
+def test_malformed_cursors_raise_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.fixture
+def history(db):
+    """A user with 7 queries, three of them sharing a timestamp; newest first"""
+    user_id = f"history_{uuid.uuid4().hex}"
+    times = [START + timedelta(minutes=n) for n in range(4)] + [START] * 3
+    ids = query_id_allocator.allocate(len(times))
+    db.add_all(
+        Query(id=query_id, user_id=user_id, query_text=str(query_id), created_at=at)
+        for query_id, at in zip(ids, times)
+    )
+    db.commit()
+    newest_first = sorted(zip(times, ids), reverse=True)
+    return user_id, [query_id for _, query_id in newest_first]
+
+
+def test_pages_cover_every_row_once_in_order(client, history):
+    user_id, expected = history
+    seen, cursor, pages = [], None, 0
+    while True:
+        response = client.post(
+            "/api/history", json={"user_id": user_id, "limit": 3, "cursor": cursor}
+        )
+        assert response.status_code == 200
+        body = response.json()
+        seen += [item["id"] for item in body["history"]]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == expected
+    assert pages == 3
+
+
+def test_stream_resumes_after_any_line(client, history):
+    user_id, expected = history
+    with client.stream(
+        "POST", "/api/history/stream", json={"user_id": user_id}
+    ) as response:
+        items = [json.loads(line) for line in response.iter_lines() if line]
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [item["id"] for item in items] == expected
+
+    with client.stream(
+        "POST",
+        "/api/history/stream",
+        json={"user_id": user_id, "cursor": items[3]["cursor"], "limit": 2},
+    ) as response:
+        resumed = [json.loads(line) for line in response.iter_lines() if line]
+    assert [item["id"] for item in resumed] == expected[4:6]
+
+
+@pytest.mark.parametrize("path", ["/api/history", "/api/history/stream"])
+def test_malformed_cursor_is_a_bad_request(client, path):
+    response = client.post(path, json={"user_id": "u", "cursor": "!!!"})
+    assert response.status_code == 400
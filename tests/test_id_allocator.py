@@ -0,0 +1,83 @@
+"""
+Block ID allocator tests
+"""
+import re
+import threading
+
+from backend.app.models.database import IdSequence
+from backend.app.services.id_allocator import BlockAllocator, ComplaintIdAllocator
+
+
+def test_ids_are_unique_and_increasing_across_blocks(session_factory):
+    allocator = BlockAllocator("test", block_size=3, session_factory=session_factory)
+    ids = [allocator.next_id() for _ in range(7)] + allocator.allocate(5)
+    assert ids == sorted(set(ids))
+    assert ids[0] == 1
+
+
+def test_workers_sharing_a_sequence_never_collide(session_factory):
+    # Two allocators stand in for two worker processes
+    workers = [
+        BlockAllocator("shared", block_size=4, session_factory=session_factory)
+        for _ in range(2)
+    ]
+    ids = []
+    lock = threading.Lock()
+
+    def allocate(allocator):
+        for _ in range(25):
+            allocated = allocator.next_id()
+            with lock:
+                ids.append(allocated)
+
+    threads = [
+        threading.Thread(target=allocate, args=(allocator,))
+        for allocator in workers
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(ids) == len(set(ids)) == 150
+
+
+def test_large_requests_reserve_a_large_enough_block(session_factory):
+    allocator = BlockAllocator("bulk", block_size=2, session_factory=session_factory)
+    assert allocator.allocate(10) == list(range(1, 11))
+    db = session_factory()
+    try:
+        assert db.get(IdSequence, "bulk").next_value == 11
+    finally:
+        db.close()
+
+
+def test_initial_value_starts_a_new_sequence(session_factory):
+    allocator = BlockAllocator(
+        "offset", initial_value=lambda db: 500, session_factory=session_factory
+    )
+    assert allocator.next_id() == 500
+
+
+def test_complaint_ids_number_each_prefix_and_year_separately(session_factory):
+    allocator = ComplaintIdAllocator(block_size=2, session_factory=session_factory)
+    ids = [
+        allocator.next_id("water", 2026),
+        allocator.next_id("water", 2026),
+        allocator.next_id("water", 2026),
+        allocator.next_id("electricity", 2026),
+        allocator.next_id("water", 2027),
+    ]
+    assert ids == [
+        "WAT-2026-000001",
+        "WAT-2026-000002",
+        "WAT-2026-000003",
+        "ELE-2026-000001",
+        "WAT-2027-000001",
+    ]
+
+
+def test_complaint_id_defaults_to_the_current_year(session_factory):
+    complaint_id = ComplaintIdAllocator(session_factory=session_factory).next_id("road")
+    assert re.fullmatch(r"ROA-\d{4}-\d{6}", complaint_id)
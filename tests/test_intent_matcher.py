@@ -0,0 +1,106 @@
+"""
+Keyword automaton and intent engine tests
+"""
+import pytest
+
+from nlu.intent import DEFAULT_CATEGORY, DEFAULT_INTENT, IntentEngine
+from nlu.matcher import KeywordAutomaton, KeywordMatch
+
+RULES = [
+    {"category": "pension", "intent": "check_status", "keywords": ["पेंशन", "pension"]},
+    {"category": "water", "intent": "complaint", "keywords": ["पानी", "water"]},
+    {"category": "health", "intent": "information", "keywords": ["camp", "health camp"]},
+]
+
+
+def brute_force(table, text):
+    """Every (start, end, keyword, label) found by plain substring search"""
+    lowered = text.lower()
+    found = set()
+    for label, keywords in table:
+        for keyword in keywords:
+            keyword = keyword.lower()
+            start = lowered.find(keyword)
+            while start != -1:
+                found.add((start, start + len(keyword), keyword, label))
+                start = lowered.find(keyword, start + 1)
+    return found
+
+
+def test_find_all_reports_offsets_into_the_text():
+    automaton = KeywordAutomaton([("water", ["पानी"])])
+    text = "गाँव में पानी नहीं"
+    [match] = automaton.find_all(text)
+    assert match == KeywordMatch(9, 13, "पानी", "water")
+    assert text[match.start:match.end] == "पानी"
+
+
+def test_find_all_is_case_insensitive():
+    automaton = KeywordAutomaton([("pension", ["Pension"])])
+    assert [m.keyword for m in automaton.find_all("PENSION pension")] == [
+        "pension",
+        "pension",
+    ]
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["she sells his hers", "ushers", "aaaa", "health camp camp", "no keywords here"],
+)
+def test_find_all_matches_overlapping_keywords_like_substring_search(text):
+    table = [
+        ("pronouns", ["he", "she", "his", "hers"]),
+        ("letters", ["a", "aa"]),
+        ("health", ["camp", "health camp"]),
+    ]
+    automaton = KeywordAutomaton(table)
+    matches = automaton.find_all(text)
+    assert {tuple(match) for match in matches} == brute_force(table, text)
+    assert [match.end for match in matches] == sorted(match.end for match in matches)
+
+
+def test_keyword_shared_by_two_labels_is_reported_for_both():
+    automaton = KeywordAutomaton([("a", ["camp"]), ("b", ["camp"])])
+    assert automaton.matched_labels("camp") == {"a", "b"}
+    assert automaton.labels == ["a", "b"]
+
+
+def test_empty_keywords_are_ignored():
+    automaton = KeywordAutomaton([("a", ["", "x"])])
+    assert automaton.find_all("xy") == [KeywordMatch(0, 1, "x", "a")]
+
+
+def test_classify_picks_the_highest_priority_category():
+    engine = IntentEngine(RULES)
+    result = engine.classify("water and pension")
+    assert (result.category, result.intent) == ("pension", "check_status")
+    assert {match.label for match in result.matches} == {"pension", "water"}
+
+
+def test_classify_without_keywords_uses_defaults():
+    result = IntentEngine(RULES).classify("नमस्ते")
+    assert (result.category, result.intent, result.matches) == (
+        DEFAULT_CATEGORY,
+        DEFAULT_INTENT,
+        [],
+    )
+
+
+def test_classify_batch_matches_classify_per_text():
+    engine = IntentEngine(RULES)
+    texts = ["पानी नहीं आ रहा", "", "health camp kab hai", "pension\x00water", "hello"]
+    batch = engine.classify_batch(texts)
+    assert len(batch) == len(texts)
+    for text, result in zip(texts, batch):
+        single = engine.classify(text.replace("\x00", " "))
+        assert (result.category, result.intent) == (single.category, single.intent)
+        assert [(m.start, m.end, m.keyword) for m in result.matches] == [
+            (m.start, m.end, m.keyword) for m in single.matches
+        ]
+
+
+def test_matches_as_dicts():
+    result = IntentEngine(RULES).classify("water")
+    assert result.matches_as_dicts() == [
+        {"keyword": "water", "category": "water", "start": 0, "end": 5}
+    ]
@@ -0,0 +1,114 @@
+"""
+Asynchronous voice job tests
+"""
+import asyncio
+import io
+import time
+
+import pytest
+
+from backend.app.services import job_service
+from backend.app.services.job_service import InProcessJobQueue, QueueFullError
+
+
+def audio():
+    return io.BytesIO(b"\x00" * 4096)
+
+
+def test_submit_beyond_max_depth_raises():
+    async def run():
+        queue = InProcessJobQueue(workers=0, max_depth=1)
+        await queue.start()
+        queue.submit(audio(), "hi", "queue_user")
+        with pytest.raises(QueueFullError):
+            queue.submit(audio(), "hi", "queue_user")
+        assert queue.depth == 1
+        await queue.stop()
+
+    asyncio.run(run())
+
+
+def test_stop_fails_queued_jobs_and_closes_their_uploads():
+    async def run():
+        queue = InProcessJobQueue(workers=0, max_depth=4)
+        await queue.start()
+        jobs = [queue.submit(audio(), "hi", "queue_user") for _ in range(2)]
+        await queue.stop()
+        return queue, jobs
+
+    queue, jobs = asyncio.run(run())
+    assert queue.depth == 0
+    for job in jobs:
+        assert job.status == "failed" and job.finished_at
+        assert job.audio_file.closed
+
+
+def test_job_completes_and_posts_its_callback(db, instant_tts, monkeypatch):
+    posted = []
+
+    def post(url, json, timeout):
+        posted.append((url, json))
+        return type("Response", (), {"status_code": 204})()
+
+    monkeypatch.setattr(job_service.requests, "post", post)
+
+    async def run():
+        queue = InProcessJobQueue(workers=1, max_depth=4)
+        await queue.start()
+        job = queue.submit(
+            audio(), "hi", "job_user", callback_url="https://example.org/hook"
+        )
+        await queue._queue.join()
+        await queue.stop()
+        return job
+
+    job = asyncio.run(run())
+
+    assert job.status == "completed"
+    assert job.result["success"] and job.result["query_id"]
+    assert job.audio_file.closed
+    assert posted == [("https://example.org/hook", job.to_dict())]
+
+
+def test_finished_jobs_are_forgotten_after_the_result_ttl():
+    async def run():
+        queue = InProcessJobQueue(workers=0, max_depth=4, result_ttl=60)
+        await queue.start()
+        old = queue.submit(audio(), "hi", "ttl_user")
+        old.finished_at = time.time() - 61
+        queue.submit(audio(), "hi", "ttl_user")
+        await queue.stop()
+        return queue, old
+
+    queue, old = asyncio.run(run())
+    assert queue.get(old.job_id) is None
+
+
+def test_job_endpoints(client, instant_tts):
+    response = client.post(
+        "/api/voice-input/async",
+        params={"user_id": "async_user"},
+        files={"audio_file": ("a.wav", b"\x00" * 4096)},
+    )
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    deadline = time.time() + 10
+    while True:
+        job = client.get(f"/api/jobs/{job_id}").json()["job"]
+        if job["status"] in ("completed", "failed") or time.time() > deadline:
+            break
+        time.sleep(0.05)
+    assert job["status"] == "completed"
+    assert job["result"]["query_id"]
+
+    assert client.get("/api/jobs/unknown").status_code == 404
+
+
+def test_callback_url_must_be_http(client):
+    response = client.post(
+        "/api/voice-input/async",
+        params={"callback_url": "file:///etc/passwd"},
+        files={"audio_file": ("a.wav", b"\x00")},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,74 @@
+"""
+Streamlit Lottie loading tests
+Runs app.py under Streamlit's AppTest harness with the network replaced, so
+they need streamlit and streamlit-lottie installed
+"""
+import json
+import os
+
+import pytest
+import requests
+
+pytest.importorskip("streamlit_lottie")
+st = pytest.importorskip("streamlit")
+AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+
+APP_PATH = os.path.join(os.path.dirname(__file__), "..", "app.py")
+VOICE_URL = "https://assets5.lottiefiles.com/packages/lf20_eroqjb7w.json"
+AI_URL = "https://assets9.lottiefiles.com/packages/lf20_fittoow1.json"
+ANIMATION = {"v": "5.7.4", "layers": []}
+
+
+class FakeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return ANIMATION
+
+
+@pytest.fixture
+def downloads(tmp_path, monkeypatch):
+    """URLs fetched by the app; every download fails unless replaced"""
+    fetched = []
+
+    def get(url, timeout=None):
+        fetched.append(url)
+        raise requests.ConnectionError("offline")
+
+    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setenv("LOTTIE_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("GRAMAVOICE_API_URL", raising=False)
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    yield fetched
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def run_app():
+    app = AppTest.from_file(APP_PATH, default_timeout=60)
+    app.run()
+    assert not app.exception
+    return app
+
+
+def test_cached_animations_are_served_without_the_network(tmp_path, downloads):
+    for name in ("lf20_eroqjb7w.json", "lf20_fittoow1.json"):
+        (tmp_path / name).write_text(json.dumps(ANIMATION), encoding="utf-8")
+    run_app()
+    assert downloads == []
+
+
+def test_failed_downloads_are_not_retried_on_every_rerun(downloads):
+    app = run_app()
+    app.run()
+    assert sorted(downloads) == sorted([VOICE_URL, AI_URL])
+
+
+def test_downloads_are_written_to_the_cache(tmp_path, downloads, monkeypatch):
+    monkeypatch.setattr(requests, "get", lambda url, timeout=None: FakeResponse())
+    run_app()
+    cached = tmp_path / "lf20_eroqjb7w.json"
+    assert json.loads(cached.read_text(encoding="utf-8")) == ANIMATION
+    assert not list(tmp_path.glob("*.part"))
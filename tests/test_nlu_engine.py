@@ -0,0 +1,52 @@
+"""
+Shared intent/response engine tests
+"""
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from backend.app.services.ai_service import ai_service
+from nlu import get_response, intent_engine, render_response
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_nlu_imports_without_backend_dependencies():
+    # Both Streamlit apps import nlu, so it must not pull in the backend
+    code = (
+        "import sys, nlu; "
+        "heavy = [m for m in sys.modules if m.split('.')[0] in "
+        "('backend', 'sqlalchemy', 'fastapi', 'streamlit', 'numpy')]; "
+        "print(heavy)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert output.strip() == "[]"
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["मेरी पेंशन कब आएगी?", "पानी की सप्लाई बंद है", "electricity gone", "नमस्ते"],
+)
+def test_backend_detect_intent_uses_the_shared_engine(text):
+    detected = asyncio.run(ai_service.detect_intent(text, "hi"))
+    expected = intent_engine.classify(text)
+    assert detected["category"] == expected.category
+    assert detected["intent"] == expected.intent
+    assert detected["matches"] == expected.matches_as_dicts()
+
+
+def test_backend_generate_response_uses_the_shared_table():
+    generated = asyncio.run(
+        ai_service.generate_response("pension", "check_status", "pension", "en")
+    )
+    assert generated["response"] == get_response("pension", "en")
+    assert generated["response"] == render_response("pension", "en")
@@ -0,0 +1,101 @@
+"""
+Query plan regression tests
+Runs EXPLAIN on the hot dashboard, history and complaint queries and fails
+if the planner stops using the index each one was tuned for. The SQLite
+variant runs against a temporary database; set GRAMAVOICE_TEST_POSTGRES_URL
+to also check Postgres, where sequential scans are disabled so small tables
+still show whether an index is usable
+"""
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection
+
+from backend.app.models import ensure_columns, ensure_indexes
+from backend.app.models.database import Base
+from backend.app.models.search_index import ensure_search_index, fts_table
+from backend.app.services import rollups
+from backend.app.services.data_service import DataService
+from backend.app.utils.pagination import encode_cursor
+
+POSTGRES_URL = os.getenv("GRAMAVOICE_TEST_POSTGRES_URL")
+
+
+def explain(connection: Connection, statement) -> str:
+    """Plan of a statement as text, with its parameters rendered inline"""
+    dialect = connection.dialect
+    sql = statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    if dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(row[-1] for row in rows)
+    rows = connection.exec_driver_sql(f"EXPLAIN {sql}")
+    return "\n".join(row[0] for row in rows)
+
+
+@pytest.fixture(
+    scope="module",
+    params=[
+        "sqlite",
+        pytest.param(
+            "postgresql",
+            marks=pytest.mark.skipif(
+                not POSTGRES_URL, reason="GRAMAVOICE_TEST_POSTGRES_URL not set"
+            ),
+        ),
+    ],
+)
+def connection(request, tmp_path_factory):
+    if request.param == "sqlite":
+        url = f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}"
+    else:
+        url = POSTGRES_URL
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    ensure_columns(engine)
+    ensure_indexes(engine)
+    ensure_search_index(engine)
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            connection.exec_driver_sql("SET enable_seqscan = off")
+        yield connection
+    engine.dispose()
+
+
+def test_history_page_uses_user_created_index(connection):
+    cursor = encode_cursor(datetime.utcnow(), 1000)
+    plan = explain(connection, DataService.history_statement("demo_user", cursor).limit(51))
+    assert "ix_queries_user_created_id" in plan
+
+
+def test_dashboard_aggregate_uses_created_indexes(connection):
+    since = (datetime.utcnow() - timedelta(days=30)).date()
+    plan = explain(connection, rollups.aggregate_statement(since))
+    assert "ix_queries_created_category" in plan
+    assert "ix_complaints_created_status" in plan
+
+
+@pytest.mark.parametrize("category", [None, "water"])
+def test_open_complaints_use_partial_index(connection, category):
+    plan = explain(connection, DataService.open_complaints_statement(category).limit(50))
+    assert "ix_complaints_open_created" in plan
+
+
+def test_complaint_search_uses_text_index(connection):
+    dialect = connection.dialect.name
+    statement = DataService.search_statement(dialect, "complaints", "हैंडपंप").limit(21)
+    expected = fts_table("complaints") if dialect == "sqlite" else "ix_complaints_text_search"
+    assert expected in explain(connection, statement)
+
+
+def test_ensure_indexes_adds_indexes_missing_from_existing_tables(engine):
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_queries_user_created_id")
+        connection.exec_driver_sql("DROP INDEX ix_complaints_open_created")
+
+    assert sorted(ensure_indexes(engine)) == [
+        "ix_complaints_open_created",
+        "ix_queries_user_created_id",
+    ]
+    assert ensure_indexes(engine) == []
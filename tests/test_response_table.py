@@ -0,0 +1,80 @@
+"""
+Precomputed response table tests
+"""
+import pytest
+
+from nlu import response_table
+from nlu.responses import ResponseTable
+
+DOCUMENT = {
+    "fallback_languages": ["hi", "en"],
+    "default_category": "general",
+    "categories": {
+        "pension": {
+            "defaults": {"amount": "₹1000"},
+            "localized_defaults": {"en": {"amount": "Rs 1000"}},
+            "templates": {"hi": "राशि $amount", "en": "Amount $amount"},
+        },
+        "water": {
+            "defaults": {"complaint_id": "WAT-0000"},
+            "templates": {"en": "Complaint $complaint_id, $unknown slot"},
+        },
+        "general": {"defaults": {}, "templates": {"hi": "नमस्ते", "en": "Hello"}},
+    },
+}
+
+
+@pytest.fixture
+def table():
+    return ResponseTable(DOCUMENT, languages=["hi", "en", "ta"])
+
+
+def test_render_without_slots_returns_the_prerendered_default(table):
+    assert table.render("pension", "hi") == "राशि ₹1000"
+    assert table.render("pension", "en") == "Amount Rs 1000"
+    assert table.lookup("pension", "en").text == "Amount Rs 1000"
+
+
+def test_slots_override_defaults_and_unknown_slots_stay_literal(table):
+    assert table.render("pension", "en", amount="Rs 2000") == "Amount Rs 2000"
+    assert (
+        table.render("water", "en", complaint_id="WAT-2026-000001")
+        == "Complaint WAT-2026-000001, $unknown slot"
+    )
+
+
+def test_languages_fall_back_in_order(table):
+    # Tamil has no template: Hindi first, then English
+    assert table.lookup("pension", "ta").language == "hi"
+    assert table.lookup("water", "ta").language == "en"
+    # Languages nobody registered use the first fallback that exists
+    assert table.lookup("general", "xx").language == "hi"
+
+
+def test_unknown_category_uses_the_default_category(table):
+    assert table.render("nonexistent", "en") == "Hello"
+
+
+def test_entries_are_distinct_templates(table):
+    keys = [(entry.category, entry.language) for entry in table.entries()]
+    assert len(keys) == len(set(keys))
+    assert set(keys) == {
+        ("pension", "hi"),
+        ("pension", "en"),
+        ("water", "en"),
+        ("general", "hi"),
+        ("general", "en"),
+    }
+
+
+def test_defaults_are_read_only(table):
+    with pytest.raises(TypeError):
+        table.lookup("pension", "hi").defaults["amount"] = "₹0"
+
+
+def test_shipped_table_covers_every_category_in_hindi_and_english():
+    for category in {entry.category for entry in response_table.entries()}:
+        for language in ("hi", "en"):
+            entry = response_table.lookup(category, language)
+            assert entry.category == category and entry.language == language
+            assert "$" not in entry.text
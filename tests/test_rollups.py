@@ -0,0 +1,133 @@
+"""
+Incremental dashboard rollup tests
+"""
+import threading
+from datetime import date, datetime, timedelta
+
+from backend.app.models.database import Complaint, DailyRollup, Query
+from backend.app.services import rollups
+from backend.app.services.data_service import DataService
+
+DAY = datetime(2026, 3, 14, 9, 30)
+NEXT_DAY = DAY + timedelta(days=1)
+
+
+def add_complaint(session, number, category, created_at, status="open"):
+    session.add(
+        Complaint(
+            complaint_id=f"TST-{number}",
+            user_id="rollup_user",
+            category=category,
+            description="no water",
+            location="Rampur",
+            status=status,
+            created_at=created_at,
+        )
+    )
+
+
+def test_record_adds_to_existing_counters(session):
+    queries = rollups.METRIC_QUERIES
+    rollups.record(session, queries, [(DAY, "pension"), (DAY, "pension")])
+    rollups.record(session, queries, [(DAY, "pension"), (NEXT_DAY, None)])
+    session.commit()
+
+    assert rollups.read(session, DAY.date()) == {
+        (DAY.date(), rollups.METRIC_QUERIES, "pension"): 3,
+        (NEXT_DAY.date(), rollups.METRIC_QUERIES, rollups.UNKNOWN_CATEGORY): 1,
+    }
+    assert rollups.read(session, NEXT_DAY.date()) == {
+        (NEXT_DAY.date(), rollups.METRIC_QUERIES, rollups.UNKNOWN_CATEGORY): 1,
+    }
+
+
+def test_create_calls_count_in_the_same_transaction(db):
+    today = datetime.utcnow().date()
+    before = rollups.read(db, today)
+    DataService.create_query(
+        db=db,
+        user_id="rollup_user",
+        query_text="pension",
+        language="en",
+        intent="check_status",
+        category="pension",
+        ai_response="ok",
+    )
+    DataService.create_complaint(
+        db=db,
+        user_id="rollup_user",
+        category="water",
+        description="no water",
+        location="Rampur",
+    )
+
+    after = rollups.read(db, today)
+    for key in (
+        (today, rollups.METRIC_QUERIES, "pension"),
+        (today, rollups.METRIC_COMPLAINTS, "water"),
+    ):
+        assert after[key] == before.get(key, 0) + 1
+
+
+def test_rebuild_picks_up_status_changes(session):
+    add_complaint(session, 1, "water", DAY)
+    add_complaint(session, 2, "water", DAY)
+    rollups.record(session, rollups.METRIC_COMPLAINTS, [(DAY, "water")] * 2)
+    session.commit()
+
+    session.query(Complaint).filter(Complaint.complaint_id == "TST-1").update(
+        {"status": "resolved"}
+    )
+    session.commit()
+    assert rollups.rebuild(session) == 2
+    assert rollups.read(session, DAY.date()) == {
+        (DAY.date(), rollups.METRIC_COMPLAINTS, "water"): 2,
+        (DAY.date(), rollups.METRIC_RESOLVED, "water"): 1,
+    }
+
+
+def test_rebuild_overwrites_rather_than_adds(session):
+    session.add(Query(user_id="u", service_category="ration", created_at=DAY))
+    session.commit()
+    rollups.rebuild(session)
+    rollups.rebuild(session)
+    assert rollups.read(session, DAY.date()) == {
+        (DAY.date(), rollups.METRIC_QUERIES, "ration"): 1,
+    }
+
+
+def test_rebuild_since_leaves_older_days_alone(session):
+    session.add(Query(user_id="u", service_category="ration", created_at=DAY))
+    session.add(Query(user_id="u", service_category="ration", created_at=NEXT_DAY))
+    # A stale counter on the older day must survive a partial rebuild
+    rollups.record(session, rollups.METRIC_QUERIES, [(DAY, "ration")] * 5)
+    session.commit()
+
+    assert rollups.rebuild(session, since=NEXT_DAY.date()) == 1
+    counts = rollups.read(session, date.min)
+    assert counts[(DAY.date(), rollups.METRIC_QUERIES, "ration")] == 5
+    assert counts[(NEXT_DAY.date(), rollups.METRIC_QUERIES, "ration")] == 1
+
+
+def test_compactor_backfills_an_empty_table(session_factory, session):
+    session.add(Query(user_id="u", service_category="pension", created_at=DAY))
+    session.commit()
+
+    threads = []
+
+    def recording_session():
+        threads.append(threading.current_thread())
+        return session_factory()
+
+    compactor = rollups.RollupCompactor(
+        interval=3600, session_factory=recording_session
+    )
+    compactor.start()
+    compactor.stop()
+
+    # The full rebuild runs on the compactor thread, not the caller's
+    assert threads and threading.current_thread() not in threads
+    assert session.query(DailyRollup).count() == 1
+    assert rollups.read(session, DAY.date()) == {
+        (DAY.date(), rollups.METRIC_QUERIES, "pension"): 1,
+    }
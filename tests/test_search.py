@@ -0,0 +1,100 @@
+"""
+Full-text search tests
+"""
+import pytest
+
+from backend.app.models.database import Complaint
+from backend.app.models.search_index import ensure_search_index, fts5_match, tsquery
+from backend.app.services.data_service import DataService
+from backend.app.utils.text import search_terms
+
+
+@pytest.mark.parametrize(
+    "text, terms",
+    [
+        ("Hand-pump BROKEN, again!", ["hand", "pump", "broken", "again"]),
+        # Vowel signs, anusvara and virama stay inside the word
+        ("हैंडपंप खराब है।", ["हैंडपंप", "खराब", "है"]),
+        ("বিদ্যুৎ নেই", ["বিদ্যুৎ", "নেই"]),
+        # ZWJ and ZWNJ shape conjuncts rather than separate words
+        ("क्‍ष", ["क्‍ष"]),
+        ("  ...  ", []),
+    ],
+)
+def test_search_terms(text, terms):
+    assert search_terms(text) == terms
+
+
+def test_match_expressions_quote_every_term():
+    assert fts5_match(["पानी", 'say"s']) == '"पानी" "say""s"'
+    assert tsquery(["पानी", "it's"]) == "'पानी' & 'it''s'"
+
+
+@pytest.fixture
+def session(engine, session):
+    """Isolated session with the text index and a few complaints"""
+    ensure_search_index(engine)
+    descriptions = [
+        ("water", "हैंडपंप खराब है"),
+        ("water", "हैंडपंप खराब है, हैंडपंप से पानी नहीं आता, हैंडपंप टूटा"),
+        ("water", "नल से पानी नहीं आता"),
+        ("electricity", "खंभे का तार टूटा, हैंडपंप के पास"),
+    ]
+    for number, (category, description) in enumerate(descriptions):
+        session.add(
+            Complaint(
+                complaint_id=f"SRC-{number}",
+                category=category,
+                description=description,
+                location="Rampur",
+            )
+        )
+    session.commit()
+    return session
+    engine.dispose()
+
+
+def found(session, text, **kwargs):
+    results, _ = DataService.search(session, text, **kwargs)
+    return [result["complaint_id"] for result in results]
+
+
+def test_every_word_must_match_and_best_matches_come_first(session):
+    assert found(session, "हैंडपंप") == ["SRC-1", "SRC-0", "SRC-3"]
+    assert sorted(found(session, "पानी नहीं")) == ["SRC-1", "SRC-2"]
+    assert found(session, "हैंडपंप नल") == []
+
+
+def test_category_filter_and_paging(session):
+    assert found(session, "हैंडपंप", category="electricity") == ["SRC-3"]
+    first, next_offset = DataService.search(session, "हैंडपंप", limit=2)
+    rest, end = DataService.search(session, "हैंडपंप", limit=2, offset=next_offset)
+    assert [r["complaint_id"] for r in first + rest] == found(session, "हैंडपंप")
+    assert next_offset == 2 and end is None
+    scores = [result["score"] for result in first + rest]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_index_follows_updates_and_deletes(session):
+    complaint = session.query(Complaint).filter_by(complaint_id="SRC-2").one()
+    complaint.description = "नल का पाइप फटा"
+    session.commit()
+    assert found(session, "पानी") == ["SRC-1"]
+    assert found(session, "पाइप") == ["SRC-2"]
+
+    session.delete(complaint)
+    session.commit()
+    assert found(session, "पाइप") == []
+
+
+@pytest.mark.parametrize("body", [{"text": "!!!"}, {"text": "water", "kind": "users"}])
+def test_search_endpoint_rejects_unsearchable_requests(client, body):
+    assert client.post("/api/search", json=body).status_code == 400
+
+
+def test_search_endpoint_returns_ranked_results(client):
+    response = client.post(
+        "/api/search", json={"text": "pension", "kind": "queries", "limit": 1}
+    )
+    assert response.status_code == 200
+    assert set(response.json()) == {"success", "results", "next_offset"}
@@ -0,0 +1,163 @@
+"""
+Sentiment scoring and daily series tests
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.models import SessionLocal
+from backend.app.models.database import Query
+from backend.app.services.data_service import DataService
+from backend.app.services.id_allocator import query_id_allocator
+from backend.app.services.sentiment_series import DailyRing, SentimentSeries
+from nlu import sentiment_scorer
+
+
+@pytest.mark.parametrize(
+    "text, sign",
+    [
+        ("धन्यवाद, पेंशन मिल गई", 1),
+        ("thanks, the pump is fixed", 1),
+        ("सड़क बहुत खराब है", -1),
+        ("the road is broken", -1),
+        ("মেরি পেনশন", 0),
+        ("मेरी पेंशन कब आएगी", 0),
+        ("", 0),
+    ],
+)
+def test_score_sign(text, sign):
+    score = sentiment_scorer.score(text)
+    assert -1 <= score <= 1
+    assert (score > 0) - (score < 0) == sign
+
+
+def test_negators_flip_the_nearest_sentiment_word():
+    # Hindi negators follow adjectives, English ones precede them
+    assert sentiment_scorer.score("अच्छा नहीं है") == -sentiment_scorer.score("अच्छा")
+    assert sentiment_scorer.score("not good") == -sentiment_scorer.score("good")
+    assert sentiment_scorer.score("नहीं मिली") < 0
+
+
+def test_a_negator_alone_reports_something_missing():
+    assert -0.5 < sentiment_scorer.score("पानी नहीं आ रहा") < 0
+
+
+def test_intensifiers_strengthen_the_next_word():
+    assert sentiment_scorer.score("बहुत अच्छा") > sentiment_scorer.score("अच्छा")
+    assert sentiment_scorer.score("very bad") < sentiment_scorer.score("bad")
+
+
+def test_nukta_spellings_score_alike():
+    assert sentiment_scorer.score("सड़क ख़राब है") == sentiment_scorer.score("सड़क खराब है")
+
+
+def test_daily_ring_reuses_slots_and_ignores_old_days():
+    ring = DailyRing(3)
+    ring.add(10, 0.5)
+    ring.add(10, -0.1)
+    assert ring.get(10) == pytest.approx((0.4, 2))
+
+    # Day 13 takes day 10's slot
+    ring.add(13, 1.0)
+    assert ring.get(10) == (0.0, 0)
+    assert ring.get(13) == (1.0, 1)
+    ring.add(10, 0.5)
+    assert ring.get(13) == (1.0, 1)
+
+
+def test_series_averages_each_day_per_village():
+    series = SentimentSeries(days=7)
+    today = datetime.utcnow()
+    series.observe(
+        [
+            {"village": "Rampur", "sentiment_score": 0.5, "created_at": today},
+            {"village": "Rampur", "sentiment_score": -0.1, "created_at": today},
+            {"village": "Sitapur", "sentiment_score": -0.6, "created_at": today},
+            {
+                "village": "Rampur",
+                "sentiment_score": 0.9,
+                "created_at": today - timedelta(days=2),
+            },
+            {"village": "Rampur", "sentiment_score": None, "created_at": today},
+        ]
+    )
+
+    rampur = series.series("Rampur", days=3)
+    assert rampur["village"] == "Rampur"
+    assert [(point["score"], point["count"]) for point in rampur["series"]] == [
+        (0.9, 1),
+        (None, 0),
+        (0.2, 2),
+    ]
+    assert rampur["series"][-1]["date"] == str(today.date())
+    assert series.series(days=1)["series"][0] == {
+        "date": str(today.date()),
+        "score": round(-0.2 / 3, 3),
+        "count": 3,
+    }
+    assert [point["count"] for point in series.series("Nowhere", 2)["series"]] == [0, 0]
+    with pytest.raises(ValueError):
+        series.series(days=8)
+
+
+def test_created_queries_are_scored_and_warm_fills_the_series(db):
+    village = f"Sentiment village {datetime.utcnow().timestamp()}"
+    query = DataService.create_query(
+        db=db,
+        user_id="sentiment_user",
+        query_text="बहुत अच्छा काम, धन्यवाद",
+        language="hi",
+        intent="information",
+        category="general",
+        ai_response="ok",
+        village=village,
+    )
+    assert query.sentiment_score > 0
+
+    # Rows stored before scoring existed are scored while warming
+    db.query(Query).filter(Query.id == query.id).update({"sentiment_score": None})
+    db.commit()
+
+    series = SentimentSeries()
+    assert series.warm() >= 1
+    [today] = series.series(village, days=1)["series"]
+    assert today["count"] == 1
+    assert today["score"] == sentiment_scorer.score("बहुत अच्छा काम, धन्यवाद")
+    assert series.series(days=1)["series"][0]["count"] >= 1
+
+
+def test_queries_committed_while_warming_are_added_once(db):
+    village = f"Held village {datetime.utcnow().timestamp()}"
+    stored_id, live_id = query_id_allocator.allocate(2)
+    stored = {
+        "id": stored_id,
+        "user_id": "sentiment_user",
+        "village": village,
+        "query_text": "सड़क खराब है",
+        "sentiment_score": -0.5,
+        "created_at": datetime.utcnow() - timedelta(minutes=5),
+    }
+    db.add(Query(**stored))
+    db.commit()
+
+    series = SentimentSeries()
+    live = {**stored, "id": live_id, "created_at": datetime.utcnow()}
+
+    def opening_session():
+        # The stored query's event arrives during the scan, which also reads
+        # it; the live one is committed after the scan's cut-off
+        series.observe([stored, live])
+        return SessionLocal()
+
+    series.warm(session_factory=opening_session)
+    [today] = series.series(village, days=1)["series"]
+    assert today == {"date": str(datetime.utcnow().date()), "score": -0.5, "count": 2}
+    assert not series._warming and series._held == []
+
+
+def test_sentiment_endpoint(client):
+    response = client.post("/api/village-pulse/sentiment", json={"days": 3})
+    assert response.status_code == 200
+    assert len(response.json()["series"]) == 3
+    response = client.post("/api/village-pulse/sentiment", json={"days": 0})
+    assert response.status_code == 400
@@ -0,0 +1,163 @@
+"""
+Probabilistic sketch tests
+"""
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from backend.app.utils.sketches import (
+    CountMinSketch,
+    HyperLogLog,
+    MinHash,
+    SpaceSaving,
+    shingles,
+)
+
+
+def jaccard(first, second):
+    return len(first & second) / len(first | second)
+
+
+def test_shingles_normalize_case_and_punctuation():
+    assert shingles("Pump, BROKEN!") == shingles("pump broken")
+    assert shingles("नल") == {"नल"}
+    assert shingles(" ... ") == set()
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("हैंडपंप खराब है पानी नहीं आ रहा", "हैंडपंप खराब है, पानी नहीं आता"),
+        ("transformer burnt no light since night", "transformer burned, no light"),
+        ("road is broken near school", "ration card not received"),
+    ],
+)
+def test_minhash_estimates_jaccard_similarity(first, second):
+    minhash = MinHash(num_perm=256)
+    first_set, second_set = shingles(first), shingles(second)
+    estimate = MinHash.similarity(
+        minhash.signature(first_set), minhash.signature(second_set)
+    )
+    # Standard error is about 1/sqrt(256)
+    assert estimate == pytest.approx(jaccard(first_set, second_set), abs=0.15)
+
+
+def test_minhash_signatures_are_stable_and_seeded():
+    items = {f"item{n}" for n in range(50)}
+    assert MinHash(seed=3).signature(items) == MinHash(seed=3).signature(items)
+    assert MinHash(seed=3).signature(items) != MinHash(seed=4).signature(items)
+    assert MinHash.similarity(MinHash().signature(items), MinHash().signature(items)) == 1
+
+
+def test_minhash_of_unrelated_sets_is_near_zero():
+    rng = random.Random(20)
+    minhash = MinHash(num_perm=128)
+    first = {str(rng.random()) for _ in range(100)}
+    second = {str(rng.random()) for _ in range(100)}
+    assert MinHash.similarity(minhash.signature(first), minhash.signature(second)) < 0.1
+
+
+def test_signatures_of_different_lengths_are_not_similar():
+    assert MinHash.similarity([1, 2, 3], [1, 2]) == 0.0
+    assert MinHash.similarity([], []) == 0.0
+
+
+def zipf_stream(length, keys, seed):
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, keys + 1)]
+    return rng.choices([f"k{n}" for n in range(keys)], weights, k=length)
+
+
+def test_count_min_never_undercounts_and_rarely_exceeds_its_bound():
+    stream = zipf_stream(20000, 2000, seed=21)
+    sketch = CountMinSketch(width=512, depth=4)
+    for key in stream:
+        sketch.add(key)
+    exact = Counter(stream)
+
+    bound = 2 * len(stream) / sketch.width
+    errors = [sketch.estimate(key) - count for key, count in exact.items()]
+    assert min(errors) >= 0
+    # Each estimate is within the bound with probability 1 - 2^-depth
+    assert sum(error > bound for error in errors) <= len(errors) / 2**sketch.depth
+    assert sketch.total == len(stream)
+
+
+def test_space_saving_keeps_every_heavy_hitter():
+    stream = zipf_stream(20000, 2000, seed=22)
+    summary = SpaceSaving(capacity=50)
+    for key in stream:
+        summary.add(key)
+    exact = Counter(stream)
+
+    tracked = {key: (count, error) for key, count, error in summary.top()}
+    assert len(tracked) == 50
+    for key, count in exact.items():
+        if count > len(stream) / summary.capacity:
+            assert key in tracked
+    for key, (count, error) in tracked.items():
+        assert count - error <= exact[key] <= count
+    assert [key for key, _, _ in summary.top(3)] == ["k0", "k1", "k2"]
+
+
+def test_space_saving_merge_adds_counts_and_keeps_the_heaviest():
+    first, second = SpaceSaving(capacity=3), SpaceSaving(capacity=3)
+    for key, count in (("a", 5), ("b", 3), ("c", 1)):
+        first.add(key, count)
+    for key, count in (("b", 4), ("d", 2), ("e", 1)):
+        second.add(key, count)
+    first.merge(second)
+
+    assert [(key, count) for key, count, _ in first.top()] == [
+        ("b", 7),
+        ("a", 5),
+        ("d", 2),
+    ]
+    assert first.total == 16
+    # The merged summary keeps accepting keys
+    first.add("f", 10)
+    assert first.top(1)[0][:2] == ("f", 12)
+
+
+@pytest.mark.parametrize("distinct", [10, 1000, 50000])
+def test_hyperloglog_count_is_within_three_standard_errors(distinct):
+    sketch = HyperLogLog()
+    for n in range(distinct):
+        sketch.add(f"user{n}")
+        # Repeats do not count
+        sketch.add(f"user{n}")
+    standard_error = 1.04 / math.sqrt(sketch.m)
+    assert sketch.count() == pytest.approx(distinct, rel=3 * standard_error, abs=1)
+
+
+def test_hyperloglog_merge_counts_the_union():
+    first, second = HyperLogLog(p=12), HyperLogLog(p=12)
+    for n in range(3000):
+        first.add(f"user{n}")
+    for n in range(2000, 6000):
+        second.add(f"user{n}")
+
+    union = HyperLogLog.union([first, second], p=12)
+    first.merge(second)
+    assert first.count() == union.count()
+    assert union.count() == pytest.approx(6000, rel=3 * 1.04 / 64)
+
+    with pytest.raises(ValueError):
+        first.merge(HyperLogLog(p=10))
+
+
+def test_hyperloglog_bytes_round_trip():
+    sketch = HyperLogLog()
+    for n in range(100):
+        sketch.add(f"user{n}")
+    data = sketch.to_bytes()
+    # Mostly empty registers compress well below their 16 KiB
+    assert len(data) < 1024
+
+    restored = HyperLogLog.from_bytes(data)
+    assert restored.p == 14
+    assert restored.count() == sketch.count()
+    restored.add("one more")
+    assert sketch.count() == HyperLogLog.from_bytes(data).count()
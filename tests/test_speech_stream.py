@@ -0,0 +1,73 @@
+"""
+Streaming upload and incremental STT tests
+"""
+import asyncio
+import io
+import json
+
+import pytest
+
+from backend.app.services.ai_service import (
+    SpeechRecognitionError,
+    SpeechStream,
+    ai_service,
+)
+
+
+def test_demo_stream_reveals_one_word_per_chunk():
+    async def run():
+        stream = SpeechStream(demo_mode=True, language="hi")
+        words = stream._words
+        partials = [await stream.feed(b"\x00" * 10) for _ in range(len(words) + 1)]
+        return stream, words, partials, await stream.finish(io.BytesIO())
+
+    stream, words, partials, result = asyncio.run(run())
+
+    assert partials[:-1] == [" ".join(words[:n]) for n in range(1, len(words) + 1)]
+    # Once the transcript is complete, further audio changes nothing
+    assert partials[-1] is None
+    assert result["text"] == " ".join(words)
+    assert stream.bytes_received == 10 * (len(words) + 1)
+
+
+def test_finish_without_audio_reports_an_error():
+    result = asyncio.run(SpeechStream(demo_mode=True, language="hi").finish())
+    assert result["text"] == "" and result["error"] == "No audio received"
+
+
+def test_feed_without_a_recognizer_raises_speech_recognition_error():
+    with pytest.raises(SpeechRecognitionError):
+        asyncio.run(SpeechStream(demo_mode=False, language="hi").feed(b"\x00"))
+
+
+def test_stream_endpoint_sends_partials_then_the_result(client, instant_tts):
+    chunks = [b"\x00" * 1024] * 3
+    with client.stream(
+        "POST",
+        "/api/voice-input/stream",
+        params={"user_id": "stream_user"},
+        content=iter(chunks),
+    ) as response:
+        events = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    *partials, result = events
+    assert partials and all(event["type"] == "partial" for event in partials)
+    assert result["type"] == "result"
+    assert result["query_text"].startswith(partials[-1]["text"])
+    assert result["query_id"]
+
+
+def test_voice_input_returns_400_when_recognition_fails(client, monkeypatch):
+    monkeypatch.setattr(ai_service, "demo_mode", False)
+    response = client.post(
+        "/api/voice-input", files={"audio_file": ("a.wav", b"\x00" * 1024)}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Speech recognition failed"
+
+    with client.stream(
+        "POST", "/api/voice-input/stream", content=b"\x00" * 1024
+    ) as response:
+        events = [json.loads(line) for line in response.iter_lines() if line]
+    assert events == [{"type": "error", "detail": "Speech recognition failed"}]
@@ -0,0 +1,104 @@
+"""
+Content-addressed TTS cache tests
+"""
+import asyncio
+import os
+
+from backend.app.services import tts_cache as cache_module
+from backend.app.services.ai_service import ai_service
+from backend.app.services.tts_cache import TTSCache
+from nlu import response_table
+
+
+def test_key_depends_on_voice_language_and_text():
+    keys = {
+        TTSCache.make_key("नमस्ते", "hi", "Aditi"),
+        TTSCache.make_key("नमस्ते", "mr", "Aditi"),
+        TTSCache.make_key("नमस्ते", "hi", "Kajal"),
+        TTSCache.make_key("नमस्ते!", "hi", "Aditi"),
+        # Parts are delimited, so shifting text between them changes the key
+        TTSCache.make_key("hi", "", "Aditi"),
+        TTSCache.make_key("", "hi", "Aditi"),
+    }
+    assert len(keys) == 6
+
+
+def test_put_then_get(tmp_path):
+    cache = TTSCache(tmp_path, max_bytes=1000)
+    key = TTSCache.make_key("a", "hi", "v")
+    assert cache.get(key) is None
+    filename = cache.put(key, b"audio", "wav")
+    assert cache.get(key) == filename == f"{key}.wav"
+    assert cache.path_for(filename).read_bytes() == b"audio"
+    assert cache.stats() == (1, 5)
+    # The temp file is renamed into place
+    assert sorted(os.listdir(tmp_path)) == [filename]
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    cache = TTSCache(tmp_path, max_bytes=250)
+    keys = [TTSCache.make_key(str(n), "hi", "v") for n in range(3)]
+    cache.put(keys[0], b"0" * 100, "wav")
+    cache.put(keys[1], b"1" * 100, "wav")
+    cache.get(keys[0])
+    cache.put(keys[2], b"2" * 100, "wav")
+
+    assert cache.get(keys[1]) is None
+    assert not (tmp_path / f"{keys[1]}.wav").exists()
+    assert cache.get(keys[0]) and cache.get(keys[2])
+    assert cache.stats() == (2, 200)
+
+
+def test_index_is_rebuilt_from_disk_in_mtime_order(tmp_path):
+    for n, mtime in ((0, 300), (1, 100), (2, 200)):
+        path = tmp_path / f"{n}.wav"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (mtime, mtime))
+    (tmp_path / ".partial.tmp").write_bytes(b"ignored")
+
+    cache = TTSCache(tmp_path, max_bytes=250)
+    assert cache.stats() == (3, 300)
+    cache.put("3", b"x" * 50, "wav")
+    # The oldest file by mtime goes first
+    assert cache.get("1") is None
+    assert cache.get("0") and cache.get("2")
+
+
+def test_file_removed_by_another_worker_is_a_miss(tmp_path):
+    cache = TTSCache(tmp_path)
+    filename = cache.put("k", b"audio", "wav")
+    cache.path_for(filename).unlink()
+    assert cache.get("k") is None
+    assert cache.stats() == (0, 0)
+
+
+def test_text_to_speech_is_served_from_the_cache():
+    async def run():
+        first = await ai_service.text_to_speech("cache me once", "en")
+        second = await ai_service.text_to_speech("cache me once", "en")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert second["cached"]
+    assert first["audio_url"] == second["audio_url"]
+
+
+def test_warm_cache_skips_responses_with_per_request_slots(monkeypatch):
+    spoken = []
+
+    async def text_to_speech(text, language):
+        spoken.append(text)
+        return {"audio_url": "/api/audio/x.wav"}
+
+    monkeypatch.setattr(ai_service, "text_to_speech", text_to_speech)
+    count = asyncio.run(cache_module.warm_cache())
+
+    assert count == len(spoken) > 0
+    placeholders = {
+        entry.defaults["complaint_id"]
+        for entry in response_table.entries()
+        if entry.per_request
+    }
+    assert placeholders
+    assert not [text for text in spoken if any(p in text for p in placeholders)]
+    assert response_table.render("pension", "hi") in spoken
@@ -0,0 +1,147 @@
+"""
+Village Pulse trending topic tests
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.models import SessionLocal
+from backend.app.models.database import Query
+from backend.app.services.id_allocator import query_id_allocator
+from backend.app.services.village_pulse import (
+    UNKNOWN_VILLAGE,
+    SlidingHeavyHitters,
+    TrendingTopics,
+)
+
+PENSION = ("pension", "पेंशन", "Rampur")
+POWER = ("electricity", "बिजली", "Rampur")
+
+
+def test_topics_are_the_intent_keywords_of_a_query():
+    row = {"query_text": "मेरी पेंशन कब आएगी", "village": "Rampur"}
+    assert TrendingTopics.topics(row) == [PENSION]
+    assert TrendingTopics.topics({"query_text": "बिजली नहीं है"}) == [
+        ("electricity", "बिजली", UNKNOWN_VILLAGE)
+    ]
+    assert TrendingTopics.topics({"query_text": "नमस्ते"}) == []
+
+
+def test_slices_older_than_the_window_drop_out():
+    window = SlidingHeavyHitters(span=60, slices=6, capacity=10)
+    for _ in range(3):
+        window.add(PENSION, 5)
+    window.add(POWER, 35)
+    window.add(POWER, 45)
+
+    top, total = window.top(now=59, limit=5)
+    assert [(topic, count) for topic, count, _ in top] == [(PENSION, 3), (POWER, 2)]
+    assert total == 5
+
+    # At 65 the slice holding the pension queries has left the window
+    top, total = window.top(now=65, limit=5)
+    assert [(topic, count) for topic, count, _ in top] == [(POWER, 2)]
+    assert total == 2
+
+
+def test_late_events_for_a_recycled_slice_are_ignored():
+    window = SlidingHeavyHitters(span=60, slices=6, capacity=10)
+    window.add(POWER, 65)
+    # Same ring position, one lap earlier
+    window.add(PENSION, 5)
+    top, _ = window.top(now=65, limit=5)
+    assert [topic for topic, _, _ in top] == [POWER]
+
+
+def test_trending_filters_and_rejects_unknown_windows():
+    pulse = TrendingTopics()
+    now = datetime.utcnow()
+    pulse.observe(
+        [
+            {"query_text": "पेंशन नहीं आई", "village": "Rampur", "created_at": now},
+            {"query_text": "पेंशन कब आएगी", "village": "Sitapur", "created_at": now},
+            {"query_text": "बिजली नहीं है", "village": "Rampur", "created_at": now},
+            # Outside the 1h window but inside the 24h one
+            {
+                "query_text": "बिजली गई",
+                "village": "Rampur",
+                "created_at": now - timedelta(hours=3),
+            },
+        ]
+    )
+
+    day = pulse.trending("24h")
+    assert day["total"] == 4
+    assert day["topics"][0] == {
+        "category": "electricity",
+        "keyword": "बिजली",
+        "village": "Rampur",
+        "count": 2,
+        "max_error": 0,
+    }
+    assert pulse.trending("1h")["total"] == 3
+    pension = pulse.trending(category="pension")["topics"]
+    assert sorted(t["village"] for t in pension) == ["Rampur", "Sitapur"]
+    assert {t["category"] for t in pulse.trending(village="Sitapur")["topics"]} == {
+        "pension"
+    }
+    with pytest.raises(ValueError):
+        pulse.trending("7d")
+
+
+def test_warm_counts_recent_stored_queries(db):
+    village = f"Warm village {datetime.utcnow().timestamp()}"
+    now = datetime.utcnow()
+    times = (now - timedelta(hours=1), now - timedelta(days=3))
+    for query_id, created_at in zip(query_id_allocator.allocate(2), times):
+        db.add(
+            Query(
+                id=query_id,
+                user_id="pulse_user",
+                village=village,
+                query_text="पेंशन नहीं आई",
+                created_at=created_at,
+            )
+        )
+    db.commit()
+
+    pulse = TrendingTopics()
+    assert pulse.warm() >= 1
+    topics = pulse.trending("24h", village=village)["topics"]
+    assert [(t["keyword"], t["count"]) for t in topics] == [("पेंशन", 1)]
+
+
+def test_queries_committed_while_warming_are_counted_once(db):
+    village = f"Held village {datetime.utcnow().timestamp()}"
+    stored_id, live_id = query_id_allocator.allocate(2)
+    stored = {
+        "id": stored_id,
+        "user_id": "pulse_user",
+        "village": village,
+        "query_text": "पेंशन नहीं आई",
+        "created_at": datetime.utcnow() - timedelta(minutes=5),
+    }
+    db.add(Query(**stored))
+    db.commit()
+
+    pulse = TrendingTopics()
+    live = {**stored, "id": live_id, "created_at": datetime.utcnow()}
+
+    def opening_session():
+        # The stored query's event arrives during the scan, which also reads
+        # it; the live one is committed after the scan's cut-off
+        pulse.observe([stored, live])
+        return SessionLocal()
+
+    pulse.warm(session_factory=opening_session)
+    topics = pulse.trending("1h", village=village)["topics"]
+    assert [(t["keyword"], t["count"]) for t in topics] == [("पेंशन", 2)]
+    assert not pulse._warming and pulse._held == []
+
+
+def test_trending_endpoint(client):
+    response = client.post("/api/village-pulse/trending", json={"window": "1h"})
+    assert response.status_code == 200
+    assert response.json()["window"] == "1h"
+    response = client.post("/api/village-pulse/trending", json={"window": "7d"})
+    assert response.status_code == 400
@@ -0,0 +1,72 @@
+"""
+Voice pipeline tests
+"""
+import asyncio
+
+from backend.app.models.async_session import AsyncSessionLocal
+from backend.app.models.database import Complaint, Query
+from backend.app.services import pipeline
+from backend.app.services.async_data_service import async_data_service
+
+
+def process_text(text, user_id, village=None):
+    async def run():
+        async with AsyncSessionLocal() as session:
+            return await pipeline.voice_pipeline.process_text(
+                text, 0.9, "hi", user_id, session, village
+            )
+
+    return asyncio.run(run())
+
+
+def test_tts_overlaps_the_database_writes(monkeypatch, db):
+    events = []
+    started = {}
+
+    async def tts(text, language):
+        events.append("tts started")
+        # Only finishes once the write has started, so running the stages
+        # one after the other times out
+        await asyncio.wait_for(started["write"].wait(), timeout=2)
+        events.append("tts finished")
+        return {"audio_url": "/api/audio/test.wav"}
+
+    create_query = async_data_service.create_query
+
+    async def tracked_create_query(db, **kwargs):
+        events.append("write started")
+        started["write"].set()
+        return await create_query(db, **kwargs)
+
+    async def run():
+        started["write"] = asyncio.Event()
+        async with AsyncSessionLocal() as session:
+            return await pipeline.voice_pipeline.process_text(
+                "मेरी पेंशन कब आएगी?", 0.9, "hi", "overlap_user", session
+            )
+
+    monkeypatch.setattr(pipeline.ai_service, "text_to_speech", tts)
+    monkeypatch.setattr(async_data_service, "create_query", tracked_create_query)
+    result = asyncio.run(run())
+
+    assert events == ["tts started", "write started", "tts finished"]
+    assert result["audio_response_url"] == "/api/audio/test.wav"
+    assert db.get(Query, result["query_id"]).user_id == "overlap_user"
+
+
+def test_complaint_id_is_quoted_and_stored(instant_tts, db):
+    result = process_text("पानी की सप्लाई बंद है", "complaint_user", "रामपुर")
+
+    assert result["detected_intent"] == "complaint"
+    assert result["complaint_id"].startswith("WAT-")
+    assert result["complaint_id"] in result["ai_response"]
+    complaint = (
+        db.query(Complaint).filter(Complaint.complaint_id == result["complaint_id"]).one()
+    )
+    assert (complaint.user_id, complaint.location) == ("complaint_user", "रामपुर")
+
+
+def test_information_queries_create_no_complaint(instant_tts, db):
+    result = process_text("स्वास्थ्य शिविर कब होगा?", "info_user")
+    assert result["complaint_id"] is None
+    assert db.query(Complaint).filter(Complaint.user_id == "info_user").count() == 0
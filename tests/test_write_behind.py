@@ -0,0 +1,132 @@
+"""
+Write-behind query buffer tests
+"""
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+import pytest
+
+from backend.app.models.database import Query
+from backend.app.services import data_service as data_service_module
+from backend.app.services import events
+from backend.app.services.data_service import DataService
+from backend.app.services.id_allocator import query_id_allocator
+from backend.app.services.write_behind import QueryWriteBuffer, _encode
+
+
+def make_row(text="journaled"):
+    now = datetime.utcnow()
+    return {
+        "id": query_id_allocator.next_id(),
+        "user_id": "journal_user",
+        "village": None,
+        "district": None,
+        "query_text": text,
+        "language": "hi",
+        "detected_intent": "information",
+        "service_category": "general",
+        "ai_response": "ok",
+        "confidence_score": 0.9,
+        "sentiment_score": 0.0,
+        "status": "completed",
+        "resolved": False,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def dead_pid() -> int:
+    """PID of a process that has exited"""
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+@pytest.fixture
+def buffer(tmp_path, db):
+    buffer = QueryWriteBuffer(journal_dir=tmp_path, max_rows=1000, flush_interval=60)
+    yield buffer
+    buffer.stop()
+
+
+@pytest.fixture
+def published(monkeypatch):
+    received = []
+    listeners = defaultdict(list, {events.QUERIES_CREATED: [received.extend]})
+    monkeypatch.setattr(events, "_listeners", listeners)
+    return received
+
+
+def test_rows_are_journaled_until_flushed(buffer, db, published):
+    buffer.start()
+    rows = [make_row(), make_row()]
+    for row in rows:
+        buffer.append(row)
+
+    journal = buffer.active_journal_path.read_text(encoding="utf-8").splitlines()
+    assert journal == [_encode(row) for row in rows]
+    assert db.get(Query, rows[0]["id"]) is None
+
+    assert buffer.flush() == 2
+    assert db.get(Query, rows[1]["id"]).query_text == "journaled"
+    assert published == rows
+    assert list(buffer.journal_dir.glob("*.flushing.jsonl")) == []
+
+
+def test_append_before_start_opens_the_journal(buffer, db):
+    row = make_row()
+    buffer.append(row)
+    assert not buffer.running
+    assert buffer.active_journal_path.exists()
+
+    # Starting must not replay (and delete) the journal this buffer still holds
+    buffer.start()
+    assert buffer.running
+    assert buffer.flush() == 1
+    assert db.get(Query, row["id"]) is not None
+
+
+def test_replay_recovers_rows_of_a_crashed_process(buffer, db):
+    rows = [make_row("first"), make_row("second"), make_row("already stored")]
+    db.add(Query(**rows[2]))
+    db.commit()
+
+    journal = buffer.journal_dir / f"queries-{dead_pid()}.jsonl"
+    lines = [_encode(row) for row in rows] + [_encode(rows[0]), '{"id": 1, "tor']
+    journal.write_text("\n".join(lines), encoding="utf-8")
+
+    assert buffer.replay() == 2
+    assert not journal.exists()
+    assert db.get(Query, rows[0]["id"]).query_text == "first"
+    assert db.get(Query, rows[1]["id"]).query_text == "second"
+
+
+def test_journals_of_live_processes_are_left_alone(buffer):
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        journal = buffer.journal_dir / f"queries-{process.pid}.jsonl"
+        journal.write_text(_encode(make_row()) + "\n", encoding="utf-8")
+        assert buffer.replay() == 0
+        assert journal.exists()
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_create_query_inserts_directly_while_the_buffer_is_stopped(
+    buffer, db, monkeypatch
+):
+    monkeypatch.setattr(data_service_module, "query_write_buffer", buffer)
+    query = DataService.create_query(
+        db=db,
+        user_id="direct_user",
+        query_text="pension",
+        language="en",
+        intent="check_status",
+        category="pension",
+        ai_response="ok",
+    )
+    assert db.get(Query, query.id) is not None
+    assert not buffer.active_journal_path.exists()